@@ -7,4 +7,12 @@ except ImportError:
 # Details in CONTRIBUTING.md
 __version__ = "2.0.1"
 
-from ._dock_widget import napari_experimental_provide_dock_widget  # noqa # pylint: disable=unused-import
+
+def __getattr__(name: str):
+    # the dock widget imports napari and Qt, so it is only imported when asked for. The napari plugin entry point is
+    # napari_allencell_annotator._dock_widget, and importing the package, e.g. for its core, stays free of both.
+    if name == "napari_experimental_provide_dock_widget":
+        from ._dock_widget import napari_experimental_provide_dock_widget
+
+        return napari_experimental_provide_dock_widget
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
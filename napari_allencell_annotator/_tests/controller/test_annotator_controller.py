@@ -1,8 +1,22 @@
+import shutil
+from functools import partial
+from pathlib import Path
+
+import napari_allencell_annotator
+
 from napari_allencell_annotator._tests.fakes.fake_viewer import FakeViewer
+from napari_allencell_annotator.model.annotation_model import AnnotatorModel
+from napari_allencell_annotator.model.key import Key
+from napari_allencell_annotator.util.csv_utils import CSVUtils
+from napari_allencell_annotator.util.parquet_utils import ParquetUtils
+from napari_allencell_annotator.util.points_store import PointsReference, PointsStore
+from napari_allencell_annotator.util.sqlite_store import SQLiteAnnotationStore
 from napari_allencell_annotator.view.annotator_view import AnnotatorViewMode
 from napari_allencell_annotator.controller.annotator_controller import AnnotatorController
+from napari_allencell_annotator.view import main_view
 from napari_allencell_annotator.view.main_view import MainView
 
+import numpy as np
 import pytest
 from pytestqt import qtbot
 
@@ -18,3 +32,357 @@ def test_start_annotating(qtbot) -> None:
 
     # ASSERT
     assert annotator_controller.view.mode == AnnotatorViewMode.ANNOTATE
+
+
+def test_setup_annotating_resume_order(qtbot, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    # ARRANGE
+    # use the fake viewer directly instead of wrapping it like a napari viewer
+    monkeypatch.setattr(main_view, "Viewer", lambda viewer: viewer)
+    main_view_simulated: MainView = MainView(FakeViewer())
+    qtbot.add_widget(main_view_simulated)
+    model: AnnotatorModel = main_view_simulated._annotator_model
+    images: list[Path] = [tmp_path / f"img{idx}.tiff" for idx in range(6)]
+    for image in images:
+        shutil.copy(
+            Path(napari_allencell_annotator.__file__).parent / "_tests" / "assets" / "image_types" / "img.ome.tiff",
+            image,
+        )
+    model.set_annotation_keys({"text": Key("string", ""), "number": Key("number", 0)})
+    model.set_all_images(list(images))
+    model.set_annotations(
+        {
+            images[4]: ["a", 1],
+            images[2]: [],
+            images[1]: ["b", 2],
+            tmp_path / "removed.tiff": ["c", 3],
+            images[5]: ["d"],
+        }
+    )
+
+    # ACT
+    main_view_simulated._setup_annotating()
+
+    # ASSERT
+    assert model.get_all_images() == [images[4], images[1], images[2], images[5], images[0], images[3]]
+    assert model.get_first_incomplete_index() == 2
+    assert model.get_curr_img_index() == 2
+
+
+def test_next_and_previous_incomplete_image(qtbot, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    # ARRANGE
+    monkeypatch.setattr(main_view, "Viewer", lambda viewer: viewer)
+    main_view_simulated: MainView = MainView(FakeViewer())
+    qtbot.add_widget(main_view_simulated)
+    model: AnnotatorModel = main_view_simulated._annotator_model
+    images: list[Path] = [tmp_path / f"img{idx}.tiff" for idx in range(4)]
+    for image in images:
+        shutil.copy(
+            Path(napari_allencell_annotator.__file__).parent / "_tests" / "assets" / "image_types" / "img.ome.tiff",
+            image,
+        )
+    model.set_annotation_keys({"text": Key("string", "")})
+    model.set_all_images(list(images))
+    model.set_annotations({images[0]: ["a"], images[1]: ["b"], images[3]: ["c"]})
+    main_view_simulated.annots.start_viewing()
+    main_view_simulated._setup_annotating()
+
+    # ACT
+    main_view_simulated._prev_incomplete_image_clicked()
+
+    # ASSERT
+    # images are reordered on resume, [img0, img1, img3, img2], and annotating starts at img2
+    assert model.get_curr_img() == images[2]
+    assert main_view_simulated._viewer.alerts[-1] == "All images before this one are annotated"
+
+    # ACT
+    main_view_simulated._prev_image_clicked()
+    main_view_simulated._prev_image_clicked()
+    main_view_simulated._next_incomplete_image_clicked()
+
+    # ASSERT
+    assert model.get_curr_img() == images[2]
+
+
+@pytest.mark.parametrize("shuffled", [False, True])
+def test_csv_import(qtbot, monkeypatch: pytest.MonkeyPatch, tmp_path: Path, shuffled: bool) -> None:
+    # ARRANGE
+    monkeypatch.setattr(main_view, "Viewer", lambda viewer: viewer)
+    monkeypatch.setattr(main_view.Popup, "make_popup", lambda text: True)
+    monkeypatch.setattr(main_view.CSVUtils, "iter_csv_rows", partial(CSVUtils.iter_csv_rows, batch_size=2))
+    main_view_simulated: MainView = MainView(FakeViewer())
+    qtbot.add_widget(main_view_simulated)
+    model: AnnotatorModel = main_view_simulated._annotator_model
+    csv_path: Path = tmp_path / "annotations.csv"
+    images: list[Path] = [Path(f"img{idx}.tiff") for idx in range(5)]
+    CSVUtils.write_csv(
+        csv_path,
+        shuffled,
+        {"text": Key("string", ""), "points": Key("point", None)},
+        ["text", "points"],
+        {images[0]: ["a", np.array([[1, 2]])], images[1]: ["b", ""], images[2]: [], images[3]: ["d", ""]},
+    )
+    # annotations saved to the journal after the csv file was written
+    CSVUtils.append_journal(CSVUtils.get_journal_path(csv_path), {images[1]: ["e", ""], images[4]: ["f", ""]})
+
+    # ACT
+    main_view_simulated._csv_json_import_selected_evt(csv_path)
+    qtbot.waitUntil(lambda: main_view_simulated._csv_import_worker is None)
+
+    # ASSERT
+    # the images of a shuffled csv file are listed in a new shuffled order
+    assert sorted(model.get_all_images()) == images
+    if not shuffled:
+        assert model.get_all_images() == images
+    assert model.is_images_shuffled() == shuffled
+    annotations: dict[Path, list] = model.get_annotations()
+    assert annotations[images[0]][0] == "a"
+    np.testing.assert_array_equal(annotations[images[0]][1], np.array([[1, 2]], dtype=np.float32))
+    assert annotations[images[1]] == ["e", ""]
+    assert annotations[images[4]] == ["f", ""]
+    assert main_view_simulated.annots.view.start_btn.isEnabled()
+
+
+def test_parquet_import(qtbot, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    # ARRANGE
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(main_view, "Viewer", lambda viewer: viewer)
+    monkeypatch.setattr(main_view.Popup, "make_popup", lambda text: True)
+    main_view_simulated: MainView = MainView(FakeViewer())
+    qtbot.add_widget(main_view_simulated)
+    model: AnnotatorModel = main_view_simulated._annotator_model
+    parquet_path: Path = tmp_path / "annotations.parquet"
+    images: list[Path] = [Path("img1.tiff"), Path("img2.tiff")]
+    ParquetUtils.write_parquet(
+        parquet_path,
+        False,
+        {"number": Key("number", 0), "points": Key("point", None)},
+        ["number", "points"],
+        {images[0]: [3, np.array([[1, 2]])], images[1]: []},
+    )
+
+    # ACT
+    main_view_simulated._csv_json_import_selected_evt(parquet_path)
+
+    # ASSERT
+    assert model.get_all_images() == images
+    assert list(model.get_annotation_keys()) == ["number", "points"]
+    annotations: dict[Path, list] = model.get_annotations()
+    assert annotations[images[0]][0] == 3
+    np.testing.assert_array_equal(annotations[images[0]][1], np.array([[1, 2]], dtype=np.float32))
+    assert annotations[images[1]] == []
+    assert model.get_dirty_annotations() == {}
+
+
+def test_sqlite_save_and_import(qtbot, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    # ARRANGE
+    monkeypatch.setattr(main_view, "Viewer", lambda viewer: viewer)
+    monkeypatch.setattr(main_view.Popup, "make_popup", lambda text: True)
+    main_view_simulated: MainView = MainView(FakeViewer())
+    qtbot.add_widget(main_view_simulated)
+    model: AnnotatorModel = main_view_simulated._annotator_model
+    db_path: Path = tmp_path / "annotations.db"
+    images: list[Path] = [Path("img1.tiff"), Path("img2.tiff")]
+    model.set_annotation_keys({"number": Key("number", 0)})
+    model.set_all_images(list(images))
+    model.set_annotations({images[0]: [3]})
+    main_view_simulated.annots.view.annots_order = ["number"]
+
+    # ACT
+    main_view_simulated._use_annotation_store(db_path)
+    model.set_csv_save_path(db_path)
+    model.add_annotation(images[1], [4])
+    main_view_simulated.annots.write_csv()
+
+    # ASSERT
+    assert isinstance(model.get_annotations(), SQLiteAnnotationStore)
+    assert model.get_dirty_annotations() == {}
+
+    # ACT
+    model.set_annotations({})
+    model.set_all_images([])
+    main_view_simulated._csv_json_import_selected_evt(db_path)
+
+    # ASSERT
+    assert model.get_all_images() == images
+    assert list(model.get_annotation_keys()) == ["number"]
+    assert isinstance(model.get_annotations(), SQLiteAnnotationStore)
+    assert dict(model.get_annotations()) == {images[0]: [3], images[1]: [4]}
+
+
+@pytest.fixture
+def saving_controller(tmp_path: Path, qtbot) -> AnnotatorController:
+    model: AnnotatorModel = AnnotatorModel()
+    model.set_annotation_keys({"text": Key("string", "")})
+    model.set_all_images([Path("img1.tiff"), Path("img2.tiff"), Path("img3.tiff")])
+    model.set_annotations({})
+    model.set_csv_save_path(tmp_path / "annotations.csv")
+    controller: AnnotatorController = AnnotatorController(model, FakeViewer())
+    controller.view.annots_order = ["text"]
+    return controller
+
+
+def test_annotations_rendered_once_image_displayed(saving_controller: AnnotatorController) -> None:
+    # ARRANGE
+    model: AnnotatorModel = saving_controller._annotation_model
+    saving_controller.start_viewing()
+    model.add_annotation(Path("img1.tiff"), ["a"])
+    model.set_annotation_started(True)
+    model.set_curr_img_index(0)
+    model.set_image_displayed(False)
+
+    # ACT
+    saving_controller.set_curr_img()
+    saving_controller.save_annotations()
+
+    # ASSERT
+    # the image is still being opened, its annotations are neither rendered nor overwritten by the widgets
+    assert not saving_controller.view.annot_list.isEnabled()
+    assert saving_controller.view.get_curr_annots() == [""]
+    assert model.get_annotations()[Path("img1.tiff")] == ["a"]
+
+    # ACT
+    model.set_image_displayed(True)
+
+    # ASSERT
+    assert saving_controller.view.annot_list.isEnabled()
+    assert saving_controller.view.get_curr_annots() == ["a"]
+
+
+def test_save_annotations_journal(saving_controller: AnnotatorController, tmp_path: Path) -> None:
+    # ARRANGE
+    model: AnnotatorModel = saving_controller._annotation_model
+    csv_path: Path = tmp_path / "annotations.csv"
+    journal_path: Path = tmp_path / "annotations.csv.journal"
+    model.add_annotation(Path("img1.tiff"), ["a"])
+    model.add_annotation(Path("img2.tiff"), ["b"])
+
+    # ACT
+    saving_controller.save_annotations()
+
+    # ASSERT
+    assert csv_path.exists()
+    assert not journal_path.exists()
+    csv_contents: str = csv_path.read_text()
+
+    # ACT
+    model.add_annotation(Path("img2.tiff"), ["c"])
+    saving_controller.save_annotations()
+
+    # ASSERT
+    assert csv_path.read_text() == csv_contents
+    assert CSVUtils.read_journal(journal_path) == ({Path("img2.tiff"): ["c"]}, 0)
+
+    # ACT
+    saving_controller.save_annotations()
+
+    # ASSERT
+    assert CSVUtils.read_journal(journal_path) == ({Path("img2.tiff"): ["c"]}, 0)
+
+
+def test_save_annotations_parquet(saving_controller: AnnotatorController, tmp_path: Path) -> None:
+    # ARRANGE
+    pytest.importorskip("pyarrow")
+    model: AnnotatorModel = saving_controller._annotation_model
+    parquet_path: Path = tmp_path / "annotations.parquet"
+    model.set_csv_save_path(parquet_path)
+    model.add_annotation(Path("img1.tiff"), ["a"])
+    saving_controller.save_annotations()
+
+    # ACT
+    model.add_annotation(Path("img2.tiff"), ["b"])
+    saving_controller.save_annotations()
+
+    # ASSERT
+    # parquet files have no journal, every save writes the file in full
+    assert not CSVUtils.get_journal_path(parquet_path).exists()
+    assert ParquetUtils.read_parquet(parquet_path)[2] == [(Path("img1.tiff"), ["a"]), (Path("img2.tiff"), ["b"])]
+
+
+def test_save_annotations_compacts(saving_controller: AnnotatorController, tmp_path: Path) -> None:
+    # ARRANGE
+    model: AnnotatorModel = saving_controller._annotation_model
+    journal_path: Path = tmp_path / "annotations.csv.journal"
+    model.add_annotation(Path("img1.tiff"), ["a"])
+    model.add_annotation(Path("img2.tiff"), ["b"])
+    saving_controller.save_annotations()
+    model.add_annotation(Path("img1.tiff"), ["c"])
+    saving_controller.save_annotations()
+    model.add_annotation(Path("img2.tiff"), ["d"])
+    saving_controller.save_annotations()
+    assert journal_path.exists()
+
+    # ACT
+    model.add_annotation(Path("img1.tiff"), ["e"])
+    saving_controller.save_annotations()
+
+    # ASSERT
+    assert not journal_path.exists()
+    assert "img1.tiff,e" in (tmp_path / "annotations.csv").read_text()
+
+
+def test_autosave(saving_controller: AnnotatorController, tmp_path: Path, qtbot) -> None:
+    # ARRANGE
+    model: AnnotatorModel = saving_controller._annotation_model
+    model.set_annotation_started(True)
+    model.add_annotation(Path("img1.tiff"), ["a"])
+    saving_controller.write_csv()
+    model.add_annotation(Path("img2.tiff"), ["b"])
+
+    # ACT
+    saving_controller.autosave()
+
+    # ASSERT
+    qtbot.waitUntil(lambda: saving_controller._autosave_worker is None)
+    assert CSVUtils.read_journal(tmp_path / "annotations.csv.journal") == ({Path("img2.tiff"): ["b"]}, 0)
+    assert model.get_dirty_annotations() == {}
+
+
+def test_autosave_failed(saving_controller: AnnotatorController, tmp_path: Path, qtbot) -> None:
+    # ARRANGE
+    model: AnnotatorModel = saving_controller._annotation_model
+    model.set_annotation_started(True)
+    model.set_csv_save_path(tmp_path / "missing_dir" / "annotations.csv")
+    model.add_annotation(Path("img1.tiff"), ["a"])
+
+    # ACT
+    saving_controller.autosave()
+
+    # ASSERT
+    qtbot.waitUntil(lambda: saving_controller._autosave_worker is None)
+    assert len(saving_controller._viewer.alerts) == 1
+    assert saving_controller._viewer.alerts[0].startswith("Autosave failed")
+    assert model.get_dirty_annotations() == {Path("img1.tiff"): ["a"]}
+
+
+def test_save_points_to_sidecar(tmp_path: Path, qtbot) -> None:
+    # ARRANGE
+    model: AnnotatorModel = AnnotatorModel()
+    model.set_annotation_keys({"point": Key("point", None)})
+    model.set_all_images([Path("img1.tiff"), Path("img2.tiff")])
+    model.set_annotations({})
+    csv_path: Path = tmp_path / "annotations.csv"
+    points_dir: Path = tmp_path / "annotations.csv.points"
+    model.set_csv_save_path(csv_path)
+    controller: AnnotatorController = AnnotatorController(model, FakeViewer())
+    controller.view.annots_order = ["point"]
+    controller._save_points_to_sidecar = True
+    model.add_annotation(Path("img1.tiff"), [np.array([[1, 2]], dtype=np.float32)])
+    model.add_annotation(Path("img2.tiff"), [np.array([[3, 4], [5, 6]], dtype=np.float32)])
+
+    # ACT
+    controller.write_csv()
+
+    # ASSERT
+    rows: list = CSVUtils.read_csv(csv_path)[3]
+    references: list[PointsReference] = [PointsStore.parse_reference(points_dir, row[1][0]) for row in rows]
+    assert [reference.count for reference in references] == [1, 2]
+    np.testing.assert_array_equal(references[1].load(), [[3, 4], [5, 6]])
+
+    # ACT
+    model.add_annotation(Path("img2.tiff"), [np.array([[7, 8]], dtype=np.float32)])
+    controller.write_csv()
+
+    # ASSERT
+    # the file of the replaced points is removed once the csv file no longer references it
+    assert not (points_dir / references[1].file_name).exists()
+    assert len(list(points_dir.iterdir())) == 2
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+
+from napari_allencell_annotator.controller.autosave_scheduler import AutosaveScheduler
+from napari_allencell_annotator.model.annotation_model import AnnotatorModel
+
+
+@pytest.fixture
+def annotator_model() -> AnnotatorModel:
+    model: AnnotatorModel = AnnotatorModel()
+    model.set_annotations({})
+    return model
+
+
+def test_flush_after_change_threshold(annotator_model: AnnotatorModel, qtbot) -> None:
+    # ARRANGE
+    saves: list[bool] = []
+    scheduler: AutosaveScheduler = AutosaveScheduler(
+        annotator_model, lambda: saves.append(True), interval_seconds=60, change_threshold=3
+    )
+    scheduler.start()
+
+    # ACT
+    annotator_model.add_annotation(Path("a.tiff"), ["a"])
+    annotator_model.add_annotation(Path("b.tiff"), ["b"])
+
+    # ASSERT
+    assert saves == []
+
+    # ACT
+    annotator_model.add_annotation(Path("c.tiff"), ["c"])
+
+    # ASSERT
+    assert saves == [True]
+
+
+def test_flush_after_interval(annotator_model: AnnotatorModel, qtbot) -> None:
+    # ARRANGE
+    saves: list[bool] = []
+    scheduler: AutosaveScheduler = AutosaveScheduler(
+        annotator_model, lambda: saves.append(True), interval_seconds=0.05, change_threshold=100
+    )
+    scheduler.start()
+
+    # ACT
+    annotator_model.add_annotation(Path("a.tiff"), ["a"])
+
+    # ASSERT
+    qtbot.waitUntil(lambda: saves == [True], timeout=2000)
+
+
+def test_unchanged_annotation_not_counted(annotator_model: AnnotatorModel, qtbot) -> None:
+    # ARRANGE
+    saves: list[bool] = []
+    scheduler: AutosaveScheduler = AutosaveScheduler(
+        annotator_model, lambda: saves.append(True), interval_seconds=60, change_threshold=2
+    )
+    scheduler.start()
+
+    # ACT
+    annotator_model.add_annotation(Path("a.tiff"), ["a"])
+    annotator_model.add_annotation(Path("a.tiff"), ["a"])
+
+    # ASSERT
+    assert saves == []
+
+
+def test_stop(annotator_model: AnnotatorModel, qtbot) -> None:
+    # ARRANGE
+    saves: list[bool] = []
+    scheduler: AutosaveScheduler = AutosaveScheduler(
+        annotator_model, lambda: saves.append(True), interval_seconds=60, change_threshold=1
+    )
+    scheduler.start()
+
+    # ACT
+    scheduler.stop()
+    annotator_model.add_annotation(Path("a.tiff"), ["a"])
+
+    # ASSERT
+    assert saves == []
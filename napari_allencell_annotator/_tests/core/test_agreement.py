@@ -0,0 +1,119 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from napari_allencell_annotator.core import agreement
+from napari_allencell_annotator.core.agreement import Agreement, AgreementReport, KeyAgreement
+from napari_allencell_annotator.core.session import Session
+from napari_allencell_annotator.model.combo_key import ComboKey
+from napari_allencell_annotator.model.key import Key
+
+
+def make_session(annotations: dict[Path, list]) -> Session:
+    return Session(
+        {
+            "text": Key("string", ""),
+            "choice": ComboKey("list", ["a", "b"], "a"),
+            "good": Key("bool", False),
+            "size": Key("number", 0),
+            "points": Key("point", None),
+        },
+        annotations,
+    )
+
+
+def test_cohen_kappa() -> None:
+    # ARRANGE
+    codes: np.ndarray = np.array([[0, 0], [0, 1], [1, 1], [1, 1], [1, -1]])
+
+    # ACT / ASSERT
+    assert Agreement.cohen_kappa(codes) == pytest.approx(0.5)
+    assert Agreement.cohen_kappa(np.array([[0, 0], [1, 1]])) == pytest.approx(1.0)
+    assert np.isnan(Agreement.cohen_kappa(np.array([[0, -1]])))
+
+
+def test_fleiss_kappa() -> None:
+    # ARRANGE
+    counts: np.ndarray = np.array([[3, 0], [1, 2], [1, 0]])
+
+    # ACT / ASSERT
+    assert Agreement.fleiss_kappa(counts) == pytest.approx(0.25)
+
+
+def test_compute() -> None:
+    # ARRANGE
+    first: Session = make_session(
+        {
+            Path("img1.tiff"): ["x", "a", "True", "10", np.array([[0.0, 0.0], [50.0, 50.0]])],
+            Path("img2.tiff"): ["x", "a", "True", "10", np.array([[0.0, 0.0]])],
+            Path("img3.tiff"): [],
+        }
+    )
+    second: Session = make_session(
+        {
+            Path("img1.tiff"): ["y", "b", True, 20, np.array([[1.0, 1.0]])],
+            Path("img2.tiff"): ["y", "a", True, 10, np.array([[0.0, 1.0]])],
+            Path("img4.tiff"): ["y", "a", True, 10, None],
+        }
+    )
+
+    # ACT
+    report: AgreementReport = Agreement.compute([first, second], match_distance=5.0)
+
+    # ASSERT
+    assert report.images == [Path("img1.tiff"), Path("img2.tiff"), Path("img3.tiff"), Path("img4.tiff")]
+    keys: dict[str, KeyAgreement] = {key.name: key for key in report.keys}
+    assert list(keys) == ["choice", "good", "size", "points"]
+    assert keys["choice"].statistic == "cohen_kappa"
+    np.testing.assert_array_equal(keys["choice"].disagreement, [1, 0, np.nan, np.nan])
+    assert keys["good"].value == pytest.approx(1.0)
+    assert keys["size"].value == pytest.approx(12.5)
+    # the second point of img1 has no point of the other annotator within 5 pixels
+    np.testing.assert_allclose(keys["points"].disagreement, [1 / 3, 0, np.nan, np.nan])
+    assert keys["points"].value == pytest.approx(4 / 5)
+    assert report.get_review_queue()[0][0] == Path("img1.tiff")
+    assert [path for path, _ in report.get_review_queue()] == [Path("img1.tiff")]
+
+
+def test_compute_fleiss() -> None:
+    # ARRANGE
+    sessions: list[Session] = [
+        make_session({Path("img1.tiff"): ["x", "a", "True", "1", ""], Path("img2.tiff"): ["x", choice, "", "", ""]})
+        for choice in ("a", "b", "b")
+    ]
+
+    # ACT
+    report: AgreementReport = Agreement.compute(sessions)
+
+    # ASSERT
+    choice: KeyAgreement = report.keys[0]
+    assert choice.statistic == "fleiss_kappa"
+    np.testing.assert_allclose(choice.disagreement, [0, 2 / 3])
+    assert report.get_review_queue() == [(Path("img2.tiff"), pytest.approx(2 / 3))]
+
+
+def test_compute_points_in_workers(monkeypatch: pytest.MonkeyPatch) -> None:
+    # ARRANGE
+    monkeypatch.setattr(agreement, "_POINT_CHUNK_SIZE", 1)
+    sessions: list[Session] = [
+        make_session(
+            {Path(f"img{index}.tiff"): ["", "", "", "", np.array([[index * offset, 0.0]])] for index in range(4)}
+        )
+        for offset in (1.0, 3.0)
+    ]
+
+    # ACT
+    report: AgreementReport = Agreement.compute(sessions, match_distance=3.0, workers=2)
+
+    # ASSERT
+    np.testing.assert_array_equal(report.keys[-1].disagreement, [0, 0, 1, 1])
+    assert report.keys[-1].value == pytest.approx(0.5)
+
+
+def test_compute_different_templates() -> None:
+    # ACT / ASSERT
+    with pytest.raises(ValueError):
+        Agreement.compute([make_session({}), Session({"other": Key("number", 0)}, {})])
+    with pytest.raises(ValueError):
+        Agreement.compute([make_session({})])
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from napari_allencell_annotator.core.annotation_state import AnnotationState
+from napari_allencell_annotator.core.events import Event
+
+
+def test_event() -> None:
+    # ARRANGE
+    event: Event = Event()
+    received: list[tuple] = []
+
+    def callback(*args) -> None:
+        received.append(args)
+
+    event.connect(callback)
+
+    # ACT
+    event.emit(1, "a")
+    event.disconnect(callback)
+    event.emit(2, "b")
+
+    # ASSERT
+    assert received == [(1, "a")]
+
+
+def test_add_annotation_emits_changes() -> None:
+    # ARRANGE
+    state: AnnotationState = AnnotationState()
+    state.set_annotations({})
+    changed: list[tuple[Path, list]] = []
+    state.annotation_changed.connect(lambda path, annotation: changed.append((path, annotation)))
+
+    # ACT
+    first: bool = state.add_annotation(Path("a.tiff"), ["x"])
+    same: bool = state.add_annotation(Path("a.tiff"), ["x"])
+
+    # ASSERT
+    assert first
+    assert not same
+    assert changed == [(Path("a.tiff"), ["x"])]
+    assert state.get_dirty_annotations() == {Path("a.tiff"): ["x"]}
@@ -0,0 +1,129 @@
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from napari_allencell_annotator.core.session import Session
+from napari_allencell_annotator.model.combo_key import ComboKey
+from napari_allencell_annotator.model.key import Key
+from napari_allencell_annotator.util.csv_utils import CSVUtils
+
+
+def make_session() -> Session:
+    return Session(
+        {"text": Key("string", ""), "choice": ComboKey("list", ["a", "b"], "a"), "points": Key("point", None)},
+        {Path("img1.tiff"): ["x", "a", np.array([[1.0, 2.0]], dtype=np.float32)], Path("img2.tiff"): []},
+    )
+
+
+def test_core_imports_without_qt() -> None:
+    # ACT
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, napari_allencell_annotator.core.session; "
+            "print(sorted(m for m in ('qtpy', 'PyQt5', 'napari') if m in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # ASSERT
+    assert result.stdout.strip() == "[]"
+
+
+def test_load_csv_with_journal(tmp_path: Path) -> None:
+    # ARRANGE
+    csv_path: Path = tmp_path / "annotations.csv"
+    session: Session = make_session()
+    session.save(csv_path)
+    CSVUtils.append_journal(CSVUtils.get_journal_path(csv_path), {Path("img2.tiff"): ["y", "b", ""]})
+
+    # ACT
+    loaded: Session = Session.load(csv_path)
+
+    # ASSERT
+    assert list(loaded.annotation_keys) == ["text", "choice", "points"]
+    assert loaded.annotations[Path("img1.tiff")][:2] == ["x", "a"]
+    np.testing.assert_array_equal(loaded.annotations[Path("img1.tiff")][2], np.array([[1.0, 2.0]]))
+    assert loaded.annotations[Path("img2.tiff")] == ["y", "b", ""]
+    assert loaded.load_problems == []
+
+
+@pytest.mark.parametrize("file_name", ["annotations.db", "annotations.parquet"])
+def test_save_and_load(tmp_path: Path, file_name: str) -> None:
+    # ARRANGE
+    if file_name.endswith(".parquet"):
+        pytest.importorskip("pyarrow")
+    file_path: Path = tmp_path / file_name
+
+    # ACT
+    make_session().save(file_path)
+    loaded: Session = Session.load(file_path)
+
+    # ASSERT
+    assert list(loaded.annotation_keys) == ["text", "choice", "points"]
+    assert list(loaded.annotations) == [Path("img1.tiff"), Path("img2.tiff")]
+    np.testing.assert_array_equal(loaded.annotations[Path("img1.tiff")][2], np.array([[1.0, 2.0]]))
+
+
+def test_load_unsupported(tmp_path: Path) -> None:
+    # ACT / ASSERT
+    with pytest.raises(ValueError):
+        Session.load(tmp_path / "annotations.txt")
+    with pytest.raises(FileNotFoundError):
+        Session.load(tmp_path / "missing.db")
+
+
+def test_validate() -> None:
+    # ARRANGE
+    session: Session = make_session()
+    session.annotations[Path("img3.tiff")] = ["x", "c", ""]
+    session.annotations[Path("img4.tiff")] = ["x"]
+
+    # ACT
+    problems: list[str] = session.validate()
+
+    # ASSERT
+    assert problems == [
+        "img3.tiff: choice is not one of the dropdown options: c",
+        "img4.tiff: 1 annotation values for 3 annotations",
+    ]
+
+
+def test_merge() -> None:
+    # ARRANGE
+    first: Session = make_session()
+    second: Session = make_session()
+    second.annotations = {Path("img2.tiff"): ["y", "b", ""], Path("img3.tiff"): [], Path("img1.tiff"): []}
+
+    # ACT
+    merged: Session = Session.merge([first, second])
+
+    # ASSERT
+    assert list(merged.annotations) == [Path("img1.tiff"), Path("img2.tiff"), Path("img3.tiff")]
+    assert merged.annotations[Path("img1.tiff")][0] == "x"
+    assert merged.annotations[Path("img2.tiff")] == ["y", "b", ""]
+
+
+def test_merge_different_templates() -> None:
+    # ARRANGE
+    other: Session = Session({"text": Key("string", "")}, {})
+
+    # ACT / ASSERT
+    with pytest.raises(ValueError):
+        Session.merge([make_session(), other])
+
+
+def test_session_pickles() -> None:
+    # ACT
+    loaded: Session = pickle.loads(pickle.dumps(make_session()))
+
+    # ASSERT
+    assert list(loaded.annotation_keys) == ["text", "choice", "points"]
+    assert loaded.annotations[Path("img2.tiff")] == []
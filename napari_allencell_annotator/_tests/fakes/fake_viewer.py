@@ -1,4 +1,4 @@
-from typing import List, Tuple
+from typing import List, Union
 
 import numpy as np
 from napari.layers import Layer, Points
@@ -14,12 +14,37 @@ class FakeViewer(IViewer):
         self._layers = []
         self.alerts = []
         self._layers_selection = []
+        self._recycled_points_layers = set()
 
-    def add_image(self, image: np.ndarray) -> None:
+    def add_image(self, image: Union[np.ndarray, List[np.ndarray]]) -> None:
         self._layers.append(image)
 
+    def set_image(self, image: Union[np.ndarray, List[np.ndarray]]) -> None:
+        images: list = [layer for layer in self._layers if not isinstance(layer, Points)]
+        full_resolution = image[0] if isinstance(image, list) else image
+        if len(images) == 1 and type(images[0]) is type(image):
+            current = images[0][0] if isinstance(images[0], list) else images[0]
+            if current.ndim == full_resolution.ndim and current.dtype == full_resolution.dtype:
+                self._layers[self._layers.index(images[0])] = image
+                return
+        for layer in images:
+            self._layers.remove(layer)
+        self._layers.insert(0, image)
+
     def clear_layers(self) -> None:
         self._layers.clear()
+        self._recycled_points_layers.clear()
+
+    def reset_points_layers(self) -> None:
+        for points_layer in self.get_all_points_layers():
+            points_layer.data = np.empty((0, points_layer.ndim))
+            points_layer.visible = False
+            self._recycled_points_layers.add(points_layer.name)
+
+    def hide_points_layers(self) -> None:
+        for points_layer in self.get_all_points_layers():
+            self.set_points_layer_mode(points_layer, PointsLayerMode.PAN_ZOOM)
+            points_layer.visible = False
 
     def alert(self, alert_msg: str) -> None:
         self.alerts.append(alert_msg)
@@ -31,6 +56,13 @@ class FakeViewer(IViewer):
         return [layer for layer in self.get_layers() if isinstance(layer, Points)]
 
     def create_points_layer(self, name: str, visible: bool, data: np.ndarray = None) -> Points:
+        if name in self._recycled_points_layers:
+            self._recycled_points_layers.remove(name)
+            points: Points = next(layer for layer in self.get_all_points_layers() if layer.name == name)
+            if data is not None:
+                points.data = data
+            points.visible = visible
+            return points
         points: Points = Points(data=data, name=name, visible=visible, ndim=6)
         self._layers.append(points)
         return points
@@ -41,15 +73,16 @@ class FakeViewer(IViewer):
     def get_points_layer_mode(self, points_layer: Points) -> str:
         return points_layer.mode
 
-    def get_selected_points(self, point_layer: Points) -> List[Tuple]:
-        return list(map(tuple, point_layer.data))
+    def get_selected_points(self, point_layer: Points) -> np.ndarray:
+        return np.array(point_layer.data, dtype=np.float32)
 
-    def get_all_point_annotations(self) -> dict[str, list[tuple]]:
-        all_point_annotations: dict[str, list[tuple]] = {}
+    def get_all_point_annotations(self) -> dict[str, np.ndarray]:
+        all_point_annotations: dict[str, np.ndarray] = {}
 
         all_points_layers: list[Points] = self.get_all_points_layers()
         for points_layer in all_points_layers:
-            all_point_annotations[points_layer.name] = self.get_selected_points(points_layer)
+            if points_layer.name not in self._recycled_points_layers:
+                all_point_annotations[points_layer.name] = self.get_selected_points(points_layer)
 
         return all_point_annotations
 
@@ -0,0 +1,221 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from napari_allencell_annotator.model.annotation_model import AnnotatorModel
+from napari_allencell_annotator.model.key import Key
+
+
+@pytest.fixture
+def annotator_model() -> AnnotatorModel:
+    model: AnnotatorModel = AnnotatorModel()
+    model.set_all_images([Path("a.tiff"), Path("b.tiff"), Path("c.tiff")])
+    return model
+
+
+def test_contains_image(annotator_model: AnnotatorModel) -> None:
+    # ASSERT
+    assert annotator_model.contains_image(Path("b.tiff"))
+    assert not annotator_model.contains_image(Path("d.tiff"))
+
+
+def test_get_image_index(annotator_model: AnnotatorModel) -> None:
+    # ASSERT
+    assert annotator_model.get_image_index(Path("a.tiff")) == 0
+    assert annotator_model.get_image_index(Path("c.tiff")) == 2
+    assert annotator_model.get_image_index(Path("d.tiff")) == -1
+
+
+def test_add_image(annotator_model: AnnotatorModel) -> None:
+    # ACT
+    annotator_model.add_image(Path("d.tiff"))
+    annotator_model.add_image(Path("e.tiff"), 1)
+
+    # ASSERT
+    assert annotator_model.get_all_images() == [
+        Path("a.tiff"),
+        Path("e.tiff"),
+        Path("b.tiff"),
+        Path("c.tiff"),
+        Path("d.tiff"),
+    ]
+    for idx, path in enumerate(annotator_model.get_all_images()):
+        assert annotator_model.get_image_index(path) == idx
+
+
+def test_remove_image(annotator_model: AnnotatorModel) -> None:
+    # ACT
+    annotator_model.remove_image(Path("a.tiff"))
+
+    # ASSERT
+    assert annotator_model.get_all_images() == [Path("b.tiff"), Path("c.tiff")]
+    assert not annotator_model.contains_image(Path("a.tiff"))
+    assert annotator_model.get_image_index(Path("b.tiff")) == 0
+    assert annotator_model.get_image_index(Path("c.tiff")) == 1
+
+
+def test_set_shuffled_images(annotator_model: AnnotatorModel) -> None:
+    # ACT
+    annotator_model.set_shuffled_images([Path("c.tiff"), Path("a.tiff"), Path("b.tiff")])
+
+    # ASSERT
+    assert annotator_model.get_image_index(Path("c.tiff")) == 0
+    assert annotator_model.get_image_index(Path("b.tiff")) == 2
+
+    # ACT
+    annotator_model.set_shuffled_images(None)
+
+    # ASSERT
+    assert annotator_model.get_image_index(Path("c.tiff")) == 2
+
+
+def test_clear_all_images(annotator_model: AnnotatorModel) -> None:
+    # ACT
+    annotator_model.clear_all_images()
+
+    # ASSERT
+    assert not annotator_model.contains_image(Path("a.tiff"))
+    assert annotator_model.get_image_index(Path("a.tiff")) == -1
+
+
+def test_add_images(annotator_model: AnnotatorModel) -> None:
+    # ARRANGE
+    added: list[list[Path]] = []
+    counts: list[int] = []
+    annotator_model.images_added.connect(added.append)
+    annotator_model.image_count_changed.connect(counts.append)
+
+    # ACT
+    result: list[Path] = annotator_model.add_images([Path("b.tiff"), Path("d.tiff"), Path("e.tiff"), Path("d.tiff")])
+
+    # ASSERT
+    assert result == [Path("d.tiff"), Path("e.tiff")]
+    assert added == [[Path("d.tiff"), Path("e.tiff")]]
+    assert counts == [5]
+    assert annotator_model.get_image_index(Path("e.tiff")) == 4
+
+
+def test_add_images_none_new(annotator_model: AnnotatorModel) -> None:
+    # ARRANGE
+    counts: list[int] = []
+    annotator_model.image_count_changed.connect(counts.append)
+
+    # ACT
+    annotator_model.add_images([Path("a.tiff")])
+
+    # ASSERT
+    assert counts == []
+
+
+def test_remove_images(annotator_model: AnnotatorModel) -> None:
+    # ARRANGE
+    removed: list[list[Path]] = []
+    counts: list[int] = []
+    annotator_model.images_removed.connect(removed.append)
+    annotator_model.image_count_changed.connect(counts.append)
+
+    # ACT
+    result: list[Path] = annotator_model.remove_images([Path("c.tiff"), Path("a.tiff"), Path("d.tiff")])
+
+    # ASSERT
+    assert result == [Path("c.tiff"), Path("a.tiff")]
+    assert removed == [[Path("c.tiff"), Path("a.tiff")]]
+    assert counts == [1]
+    assert annotator_model.get_all_images() == [Path("b.tiff")]
+    assert annotator_model.get_image_index(Path("b.tiff")) == 0
+
+
+def test_add_annotation_dirty(annotator_model: AnnotatorModel) -> None:
+    # ARRANGE
+    annotator_model.set_annotations({})
+
+    # ACT
+    annotator_model.add_annotation(Path("a.tiff"), ["x"])
+    annotator_model.add_annotation(Path("b.tiff"), [])
+
+    # ASSERT
+    assert annotator_model.get_dirty_annotations() == {Path("a.tiff"): ["x"], Path("b.tiff"): []}
+
+    # ACT
+    annotator_model.clear_dirty_annotations()
+    annotator_model.add_annotation(Path("a.tiff"), ["x"])
+    annotator_model.add_annotation(Path("b.tiff"), ["y"])
+
+    # ASSERT
+    assert annotator_model.get_dirty_annotations() == {Path("b.tiff"): ["y"]}
+
+
+def test_add_annotation_dirty_points(annotator_model: AnnotatorModel) -> None:
+    # ARRANGE
+    annotator_model.set_annotations({Path("a.tiff"): ["x", np.array([[1, 2]], dtype=np.float32)]})
+
+    # ACT
+    annotator_model.add_annotation(Path("a.tiff"), ["x", np.array([[1, 2]], dtype=np.float32)])
+
+    # ASSERT
+    assert annotator_model.get_dirty_annotations() == {}
+
+    # ACT
+    annotator_model.add_annotation(Path("a.tiff"), ["x", np.array([[1, 2], [3, 4]], dtype=np.float32)])
+
+    # ASSERT
+    assert list(annotator_model.get_dirty_annotations()) == [Path("a.tiff")]
+
+
+def test_get_first_incomplete_index(annotator_model: AnnotatorModel) -> None:
+    # ARRANGE
+    annotator_model.set_annotation_keys({"text": Key("string", ""), "number": Key("number", 0)})
+    annotator_model.set_annotations({Path("a.tiff"): ["x", 1], Path("b.tiff"): ["y"]})
+
+    # ASSERT
+    assert annotator_model.is_annotation_complete(["x", 1])
+    assert not annotator_model.is_annotation_complete(["y"])
+    assert not annotator_model.is_annotation_complete(None)
+    assert annotator_model.get_first_incomplete_index() == 1
+
+    # ACT
+    annotator_model.add_annotation(Path("b.tiff"), ["y", 2])
+    annotator_model.add_annotation(Path("c.tiff"), ["z", 3])
+
+    # ASSERT
+    assert annotator_model.get_first_incomplete_index() is None
+
+
+def test_completion_bitmap(annotator_model: AnnotatorModel) -> None:
+    # ARRANGE
+    annotator_model.set_annotation_keys({"text": Key("string", ""), "point": Key("point", None)})
+    annotator_model.set_annotations(
+        {Path("a.tiff"): ["x", np.zeros((1, 2))], Path("b.tiff"): ["", np.zeros((1, 2))], Path("c.tiff"): ["y", None]}
+    )
+
+    # ASSERT
+    assert annotator_model.get_completion_bitmap().tolist() == [True, False, False]
+
+    # ACT
+    annotator_model.add_annotation(Path("b.tiff"), ["z", np.zeros((1, 2))])
+
+    # ASSERT
+    assert annotator_model.get_completion_bitmap().tolist() == [True, True, False]
+
+    # ACT
+    annotator_model.add_images([Path("d.tiff")])
+    annotator_model.remove_images([Path("a.tiff")])
+
+    # ASSERT
+    assert annotator_model.get_completion_bitmap().tolist() == [True, False, False]
+
+
+def test_next_and_previous_incomplete_index(annotator_model: AnnotatorModel) -> None:
+    # ARRANGE
+    annotator_model.set_annotation_keys({"text": Key("string", "")})
+    annotator_model.add_images([Path("d.tiff"), Path("e.tiff")])
+    annotator_model.set_annotations({Path("a.tiff"): ["x"], Path("c.tiff"): ["y"], Path("d.tiff"): ["z"]})
+
+    # ASSERT
+    assert annotator_model.get_next_incomplete_index(-1) == 1
+    assert annotator_model.get_next_incomplete_index(1) == 4
+    assert annotator_model.get_next_incomplete_index(4) is None
+    assert annotator_model.get_previous_incomplete_index(4) == 1
+    assert annotator_model.get_previous_incomplete_index(1) is None
+    assert annotator_model.get_previous_incomplete_index(0) is None
@@ -0,0 +1,135 @@
+from pathlib import Path
+
+import pytest
+
+from napari_allencell_annotator import cli
+from napari_allencell_annotator.core.session import Session
+from napari_allencell_annotator.model.combo_key import ComboKey
+from napari_allencell_annotator.model.key import Key
+
+
+def make_session(annotations: dict[Path, list]) -> Session:
+    return Session({"text": Key("string", ""), "choice": ComboKey("list", ["a", "b"], "a")}, annotations)
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_validate(tmp_path: Path, capsys: pytest.CaptureFixture, workers: str) -> None:
+    # ARRANGE
+    valid: Path = tmp_path / "valid.csv"
+    invalid: Path = tmp_path / "invalid.csv"
+    make_session({Path("img1.tiff"): ["x", "a"]}).save(valid)
+    make_session({Path("img2.tiff"): ["y", "c"]}).save(invalid)
+
+    # ACT
+    status: int = cli.main(["-j", workers, "validate", str(valid), str(invalid), str(tmp_path / "missing.db")])
+
+    # ASSERT
+    assert status == 1
+    output: str = capsys.readouterr().out
+    assert f"{invalid}: img2.tiff: choice is not one of the dropdown options: c" in output
+    assert f"{tmp_path / 'missing.db'}: could not be read" in output
+    assert str(valid) not in output
+
+
+def test_validate_valid(tmp_path: Path) -> None:
+    # ARRANGE
+    valid: Path = tmp_path / "valid.csv"
+    make_session({Path("img1.tiff"): ["x", "a"]}).save(valid)
+
+    # ACT / ASSERT
+    assert cli.main(["validate", str(valid)]) == 0
+
+
+@pytest.mark.parametrize("to", ["db", "json"])
+def test_convert(tmp_path: Path, to: str) -> None:
+    # ARRANGE
+    csv_paths: list[Path] = [tmp_path / "first.csv", tmp_path / "second.csv"]
+    for index, csv_path in enumerate(csv_paths):
+        make_session({Path(f"img{index}.tiff"): ["x", "b"]}).save(csv_path)
+    output_dir: Path = tmp_path / "converted"
+    output_dir.mkdir()
+
+    # ACT
+    status: int = cli.main(["-j", "2", "convert", "--to", to, "-o", str(output_dir), *map(str, csv_paths)])
+
+    # ASSERT
+    assert status == 0
+    converted: Session = cli.load_session(output_dir / f"second.{to}")
+    assert list(converted.annotation_keys) == ["text", "choice"]
+    assert converted.annotation_keys["choice"].get_options() == ["a", "b"]
+    assert dict(converted.annotations) == ({Path("img1.tiff"): ["x", "b"]} if to == "db" else {})
+
+
+def test_convert_json_template(tmp_path: Path) -> None:
+    # ARRANGE
+    json_path: Path = tmp_path / "template.json"
+    cli.save_session(make_session({}), json_path)
+
+    # ACT
+    status: int = cli.main(["convert", "--to", "csv", str(json_path)])
+
+    # ASSERT
+    assert status == 0
+    session: Session = Session.load(tmp_path / "template.csv")
+    assert list(session.annotation_keys) == ["text", "choice"]
+    assert len(session.annotations) == 0
+
+
+def test_convert_to_same_format(tmp_path: Path) -> None:
+    # ARRANGE
+    csv_path: Path = tmp_path / "first.csv"
+    make_session({}).save(csv_path)
+
+    # ACT / ASSERT
+    assert cli.main(["convert", "--to", "csv", str(csv_path)]) == 1
+
+
+def test_merge(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    # ARRANGE
+    first: Path = tmp_path / "first.db"
+    second: Path = tmp_path / "second.csv"
+    make_session({Path("img1.tiff"): ["x", "a"], Path("img2.tiff"): []}).save(first)
+    make_session({Path("img2.tiff"): ["y", "b"], Path("img3.tiff"): []}).save(second)
+    output: Path = tmp_path / "merged.csv"
+
+    # ACT
+    status: int = cli.main(["-j", "2", "merge", "-o", str(output), str(first), str(second)])
+
+    # ASSERT
+    assert status == 0
+    assert "3 image(s)" in capsys.readouterr().out
+    merged: Session = Session.load(output)
+    assert merged.annotations == {
+        Path("img1.tiff"): ["x", "a"],
+        Path("img2.tiff"): ["y", "b"],
+        Path("img3.tiff"): [],
+    }
+
+
+def test_merge_different_templates(tmp_path: Path) -> None:
+    # ARRANGE
+    first: Path = tmp_path / "first.csv"
+    second: Path = tmp_path / "second.csv"
+    make_session({}).save(first)
+    Session({"other": Key("number", 0)}, {}).save(second)
+
+    # ACT / ASSERT
+    assert cli.main(["merge", "-o", str(tmp_path / "merged.csv"), str(first), str(second)]) == 1
+    assert not (tmp_path / "merged.csv").exists()
+
+
+def test_agreement(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    # ARRANGE
+    first: Path = tmp_path / "first.csv"
+    second: Path = tmp_path / "second.csv"
+    make_session({Path("img1.tiff"): ["x", "a"], Path("img2.tiff"): ["x", "a"]}).save(first)
+    make_session({Path("img1.tiff"): ["y", "a"], Path("img2.tiff"): ["y", "b"]}).save(second)
+    output: Path = tmp_path / "review.csv"
+
+    # ACT
+    status: int = cli.main(["-j", "2", "agreement", "-o", str(output), str(first), str(second)])
+
+    # ASSERT
+    assert status == 0
+    assert "choice: cohen_kappa = 0.000" in capsys.readouterr().out
+    assert output.read_text().splitlines() == ["File Path,Disagreement,choice", "img2.tiff,1.0000,1.0000"]
@@ -0,0 +1,225 @@
+import csv
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from napari_allencell_annotator.model.key import Key
+from napari_allencell_annotator.util.csv_utils import CSVUtils
+from napari_allencell_annotator.util.points_store import PointsReference, PointsStore
+
+
+def test_get_journal_path() -> None:
+    # ASSERT
+    assert CSVUtils.get_journal_path(Path("dir/annotations.csv")) == Path("dir/annotations.csv.journal")
+
+
+def test_write_csv(tmp_path: Path) -> None:
+    # ARRANGE
+    csv_path: Path = tmp_path / "annotations.csv"
+
+    # ACT
+    CSVUtils.write_csv(
+        csv_path,
+        False,
+        {"text": Key("string", "a")},
+        ["text"],
+        {Path("dir/img1.tiff"): ["b"], Path("dir/img2.tiff"): []},
+    )
+
+    # ASSERT
+    with open(csv_path, newline="") as file:
+        rows: list[list[str]] = list(csv.reader(file))
+    assert rows == [
+        ["Shuffled:", "False"],
+        ["Annotations:", '{"text": {"type": "string", "default": "a"}}'],
+        ["File Name", "File Path", "text"],
+        ["img1.tiff", str(Path("dir/img1.tiff")), "b"],
+        ["img2.tiff", str(Path("dir/img2.tiff"))],
+    ]
+
+
+def test_append_and_read_journal(tmp_path: Path) -> None:
+    # ARRANGE
+    journal_path: Path = tmp_path / "annotations.csv.journal"
+
+    # ACT
+    CSVUtils.append_journal(journal_path, {Path("img1.tiff"): ["a", 1], Path("img2.tiff"): ["b", 2]})
+    CSVUtils.append_journal(journal_path, {Path("img1.tiff"): ["c", 3]})
+
+    # ASSERT
+    assert CSVUtils.read_journal(journal_path) == ({Path("img1.tiff"): ["c", "3"], Path("img2.tiff"): ["b", "2"]}, 0)
+
+
+def test_make_row_formats_points() -> None:
+    # ACT
+    row: list = CSVUtils.make_row(
+        Path("img1.tiff"), ["a", np.array([[1.0, 2.0], [3.0, 4.0]]), [(np.float64(5.0), np.float64(6.0))], ""]
+    )
+
+    # ASSERT
+    assert row == ["img1.tiff", "img1.tiff", "a", "[(1.0, 2.0), (3.0, 4.0)]", "[(5.0, 6.0)]", ""]
+
+
+def test_make_row_points_store(tmp_path: Path) -> None:
+    # ARRANGE
+    other_dir: Path = tmp_path / "other.csv.points"
+    saved: PointsReference = PointsStore.write_points(other_dir, Path("img1.tiff"), 1, np.array([[5.0, 6.0]]))
+    referenced: set[str] = set()
+
+    # ACT
+    row: list = CSVUtils.make_row(
+        Path("img1.tiff"), [np.array([[1.0, 2.0]], dtype=np.float32), saved, np.empty((0, 2))], tmp_path, referenced
+    )
+    inline_row: list = CSVUtils.make_row(Path("img1.tiff"), [saved])
+
+    # ASSERT
+    reference: PointsReference = PointsStore.parse_reference(tmp_path, row[2])
+    np.testing.assert_array_equal(reference.load(), [[1.0, 2.0]])
+    # points saved to another csv file's store are copied to this one
+    assert PointsStore.parse_reference(tmp_path, row[3]).load().tolist() == [[5.0, 6.0]]
+    assert row[4] == "[]"
+    assert referenced == {reference.file_name, PointsStore.parse_reference(tmp_path, row[3]).file_name}
+    assert inline_row[2] == "[(5.0, 6.0)]"
+
+
+def test_read_journal_missing(tmp_path: Path) -> None:
+    # ASSERT
+    assert CSVUtils.read_journal(tmp_path / "annotations.csv.journal") == ({}, 0)
+
+
+def test_remove_journal(tmp_path: Path) -> None:
+    # ARRANGE
+    journal_path: Path = tmp_path / "annotations.csv.journal"
+    journal_path.touch()
+
+    # ACT
+    CSVUtils.remove_journal(journal_path)
+    CSVUtils.remove_journal(journal_path)
+
+    # ASSERT
+    assert not journal_path.exists()
+
+
+class _Unwritable:
+    def __str__(self) -> str:
+        raise OSError("disk full")
+
+
+def test_write_csv_replaces_atomically(tmp_path: Path) -> None:
+    # ARRANGE
+    csv_path: Path = tmp_path / "annotations.csv"
+    CSVUtils.write_csv(csv_path, False, {"text": Key("string", "a")}, ["text"], {Path("img1.tiff"): ["b"]})
+    contents: str = csv_path.read_text()
+
+    # ACT
+    with pytest.raises(OSError):
+        CSVUtils.write_csv(
+            csv_path, False, {"text": Key("string", "a")}, ["text"], {Path("img1.tiff"): [_Unwritable()]}
+        )
+
+    # ASSERT
+    assert csv_path.read_text() == contents
+    assert list(tmp_path.iterdir()) == [csv_path]
+
+
+def test_read_csv(tmp_path: Path) -> None:
+    # ARRANGE
+    csv_path: Path = tmp_path / "annotations.csv"
+    CSVUtils.write_csv(
+        csv_path, True, {"text": Key("string", "a")}, ["text"], {Path("img1.tiff"): ["b"], Path("img2.tiff"): []}
+    )
+
+    # ACT
+    shuffled, annotations, header, rows, num_skipped = CSVUtils.read_csv(csv_path)
+
+    # ASSERT
+    assert shuffled
+    assert annotations == '{"text": {"type": "string", "default": "a"}}'
+    assert header == ["File Name", "File Path", "text"]
+    assert rows == [(Path("img1.tiff"), ["b"]), (Path("img2.tiff"), [])]
+    assert num_skipped == 0
+
+
+def test_read_csv_torn(tmp_path: Path) -> None:
+    # ARRANGE
+    csv_path: Path = tmp_path / "annotations.csv"
+    CSVUtils.write_csv(
+        csv_path,
+        False,
+        {"text": Key("string", "a"), "number": Key("number", 1)},
+        ["text", "number"],
+        {Path("img1.tiff"): ["b", 2], Path("img2.tiff"): ["c", 3]},
+    )
+    # a row with a missing value and a last row cut short
+    with open(csv_path, "a", newline="") as file:
+        file.write("img3.tiff,img3.tiff,d\r\nimg4.tiff,img4.tiff,e,")
+
+    # ACT
+    _, _, _, rows, num_skipped = CSVUtils.read_csv(csv_path)
+
+    # ASSERT
+    assert rows == [(Path("img1.tiff"), ["b", "2"]), (Path("img2.tiff"), ["c", "3"])]
+    assert num_skipped == 2
+
+
+def test_read_csv_missing_header(tmp_path: Path) -> None:
+    # ARRANGE
+    csv_path: Path = tmp_path / "annotations.csv"
+    csv_path.write_text('Shuffled:,False\r\nAnnotations:,"{""text"": {""type')
+
+    # ACT / ASSERT
+    with pytest.raises(ValueError):
+        CSVUtils.read_csv(csv_path)
+
+
+def test_read_journal_torn(tmp_path: Path) -> None:
+    # ARRANGE
+    journal_path: Path = tmp_path / "annotations.csv.journal"
+    CSVUtils.append_journal(journal_path, {Path("img1.tiff"): ["a", 1]})
+    with open(journal_path, "a", newline="") as file:
+        file.write("img1.tiff,img1.tiff,b")
+
+    # ACT
+    annotations, num_skipped = CSVUtils.read_journal(journal_path, 4)
+
+    # ASSERT
+    assert annotations == {Path("img1.tiff"): ["a", "1"]}
+    assert num_skipped == 1
+
+
+def test_read_csv_header(tmp_path: Path) -> None:
+    # ARRANGE
+    csv_path: Path = tmp_path / "annotations.csv"
+    CSVUtils.write_csv(csv_path, False, {"text": Key("string", "a")}, ["text"], {Path("img1.tiff"): ["b"]})
+
+    # ACT
+    shuffled, annotations, header = CSVUtils.read_csv_header(csv_path)
+
+    # ASSERT
+    assert not shuffled
+    assert annotations == '{"text": {"type": "string", "default": "a"}}'
+    assert header == ["File Name", "File Path", "text"]
+
+
+def test_iter_csv_rows(tmp_path: Path) -> None:
+    # ARRANGE
+    csv_path: Path = tmp_path / "annotations.csv"
+    CSVUtils.write_csv(
+        csv_path,
+        False,
+        {"text": Key("string", "a")},
+        ["text"],
+        {Path(f"img{idx}.tiff"): [str(idx)] for idx in range(5)},
+    )
+    # a last row cut short
+    with open(csv_path, "a", newline="") as file:
+        file.write("img5.tiff,img5.tiff,")
+
+    # ACT
+    batches: list[tuple[list[tuple[Path, list[str]]], int]] = list(CSVUtils.iter_csv_rows(csv_path, 3, batch_size=2))
+
+    # ASSERT
+    assert [len(rows) for rows, _ in batches] == [2, 2, 1]
+    assert [row for rows, _ in batches for row in rows] == [(Path(f"img{idx}.tiff"), [str(idx)]) for idx in range(5)]
+    assert sum(num_skipped for _, num_skipped in batches) == 1
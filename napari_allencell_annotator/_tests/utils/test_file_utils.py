@@ -43,3 +43,79 @@ def test_get_file_name() -> None:
     assert jpeg_file_name == "test.jpeg"
     assert czi_file_name == "test.czi"
     assert zarr_file_name == "parent"
+
+
+def test_get_valid_images_sorted_in_dir(tmp_path: Path) -> None:
+    # ARRANGE
+    (tmp_path / "c.tiff").touch()
+    (tmp_path / "b.czi").touch()
+    (tmp_path / ".hidden.tiff").touch()
+    (tmp_path / "test.csv").touch()
+    (tmp_path / "a.ome.zarr").mkdir()
+    (tmp_path / "d" / "raw.ome.zarr").mkdir(parents=True)
+    (tmp_path / "empty_dir").mkdir()
+
+    # ACT
+    valid_files: List[Path]
+    num_unsupported: int
+    valid_files, num_unsupported = FileUtils.get_valid_images_sorted_in_dir(tmp_path)
+
+    # ASSERT
+    # raw zarrs are sorted by the name of their parent folder
+    assert valid_files == [
+        tmp_path / "b.czi",
+        tmp_path / "c.tiff",
+        tmp_path / "d" / "raw.ome.zarr",
+        tmp_path / "a.ome.zarr",
+    ]
+    assert num_unsupported == 2
+
+
+def test_get_valid_images_sorted_in_dir_empty(tmp_path: Path) -> None:
+    # ACT
+    valid_files: List[Path]
+    num_unsupported: int
+    valid_files, num_unsupported = FileUtils.get_valid_images_sorted_in_dir(tmp_path)
+
+    # ASSERT
+    assert valid_files == []
+    assert num_unsupported == 0
+
+
+def test_iter_valid_images_in_tree(tmp_path: Path) -> None:
+    # ARRANGE
+    (tmp_path / "b.tiff").touch()
+    (tmp_path / "notes.txt").touch()
+    (tmp_path / "plate" / "well_2").mkdir(parents=True)
+    (tmp_path / "plate" / "well_1" / ".hidden").mkdir(parents=True)
+    (tmp_path / "plate" / "well_1" / ".hidden" / "hidden.tiff").touch()
+    (tmp_path / "plate" / "well_1" / "field_2.czi").touch()
+    (tmp_path / "plate" / "well_1" / "field_1.czi").touch()
+    (tmp_path / "plate" / "well_2" / "field.ome.zarr" / "0").mkdir(parents=True)
+    (tmp_path / "plate" / "well_2" / "field.ome.zarr" / "0" / "inner.tiff").touch()
+
+    # ACT
+    batches: List[tuple[List[Path], int]] = list(FileUtils.iter_valid_images_in_tree(tmp_path, batch_size=2))
+
+    # ASSERT
+    assert [image for images, _ in batches for image in images] == [
+        tmp_path / "b.tiff",
+        tmp_path / "plate" / "well_1" / "field_1.czi",
+        tmp_path / "plate" / "well_1" / "field_2.czi",
+        tmp_path / "plate" / "well_2" / "field.ome.zarr",
+    ]
+    assert sum(num_unsupported for _, num_unsupported in batches) == 1
+    assert len(batches) > 1
+
+
+def test_iter_valid_images_in_tree_symlink_loop(tmp_path: Path) -> None:
+    # ARRANGE
+    (tmp_path / "plate").mkdir()
+    (tmp_path / "plate" / "a.tiff").touch()
+    (tmp_path / "plate" / "parent").symlink_to(tmp_path, target_is_directory=True)
+
+    # ACT
+    batches: List[tuple[List[Path], int]] = list(FileUtils.iter_valid_images_in_tree(tmp_path))
+
+    # ASSERT
+    assert [image for images, _ in batches for image in images] == [tmp_path / "plate" / "a.tiff"]
@@ -0,0 +1,123 @@
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+from bioio_ome_zarr.writers import OMEZarrWriter
+
+import napari_allencell_annotator
+from napari_allencell_annotator.util.image_cache import ImageCache
+from napari_allencell_annotator.util.image_utils import ImageUtils
+
+TEST_IMAGE: Path = (
+    Path(napari_allencell_annotator.__file__).parent / "_tests" / "assets" / "image_types" / "img.ome.tiff"
+)
+
+
+@pytest.fixture
+def image_paths(tmp_path: Path) -> list[Path]:
+    paths: list[Path] = []
+    for idx in range(3):
+        path: Path = tmp_path / f"img_{idx}.ome.tiff"
+        shutil.copy(TEST_IMAGE, path)
+        paths.append(path)
+    return paths
+
+
+def test_get_cached(image_paths: list[Path]) -> None:
+    # ARRANGE
+    cache: ImageCache = ImageCache()
+
+    # ACT
+    image: ImageUtils = cache.get(image_paths[0])
+
+    # ASSERT
+    assert cache.get(image_paths[0]) is image
+    assert len(cache) == 1
+    assert cache.get_nbytes() == image.get_estimated_nbytes()
+
+
+def test_get_modified_file_reopens(image_paths: list[Path]) -> None:
+    # ARRANGE
+    cache: ImageCache = ImageCache()
+    image: ImageUtils = cache.get(image_paths[0])
+    mtime_ns: int = image_paths[0].stat().st_mtime_ns
+    os.utime(image_paths[0], ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+    # ACT
+    reopened: ImageUtils = cache.get(image_paths[0])
+
+    # ASSERT
+    assert reopened is not image
+    assert len(cache) == 1
+    assert cache.get_nbytes() == reopened.get_estimated_nbytes()
+
+
+def test_evict_by_entry_count(image_paths: list[Path]) -> None:
+    # ARRANGE
+    cache: ImageCache = ImageCache(max_entries=2)
+    cache.get(image_paths[0])
+    cache.get(image_paths[1])
+    cache.get(image_paths[0])  # image 1 is now least recently used
+
+    # ACT
+    cache.get(image_paths[2])
+
+    # ASSERT
+    assert len(cache) == 2
+    assert image_paths[0] in cache
+    assert image_paths[1] not in cache
+    assert image_paths[2] in cache
+
+
+def test_evict_by_bytes(image_paths: list[Path]) -> None:
+    # ARRANGE
+    nbytes: int = ImageUtils(TEST_IMAGE).get_estimated_nbytes()
+    cache: ImageCache = ImageCache(max_bytes=2 * nbytes)
+
+    # ACT
+    for path in image_paths:
+        cache.get(path)
+
+    # ASSERT
+    assert len(cache) == 2
+    assert image_paths[0] not in cache
+    assert cache.get_nbytes() == 2 * nbytes
+
+
+def test_evict_by_bytes_full_resolution(tmp_path: Path) -> None:
+    # ARRANGE
+    paths: list[Path] = []
+    for idx in range(3):
+        path: Path = tmp_path / f"img_{idx}.ome.zarr"
+        writer: OMEZarrWriter = OMEZarrWriter(
+            path, level_shapes=[(1, 1, 1, 512, 512), (1, 1, 1, 8, 8)], dtype="uint16", zarr_format=2
+        )
+        writer.write_full_volume(np.zeros((1, 1, 1, 512, 512), dtype="uint16"))
+        paths.append(path)
+    # room for one full resolution plane but not two, with the default entry limit
+    cache: ImageCache = ImageCache(max_bytes=1024**2)
+
+    # ACT
+    for path in paths:
+        cache.get(path)
+
+    # ASSERT
+    # the low resolution level is small enough for every image to fit, the full resolution level is not
+    assert len(cache) == 1
+    assert paths[2] in cache
+    assert cache.get_nbytes() >= 512 * 512 * 2
+
+
+def test_clear(image_paths: list[Path]) -> None:
+    # ARRANGE
+    cache: ImageCache = ImageCache()
+    cache.get(image_paths[0])
+
+    # ACT
+    cache.clear()
+
+    # ASSERT
+    assert len(cache) == 0
+    assert cache.get_nbytes() == 0
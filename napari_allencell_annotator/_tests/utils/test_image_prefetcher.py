@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import napari_allencell_annotator
+from napari_allencell_annotator.model.annotation_model import AnnotatorModel
+from napari_allencell_annotator.util.image_prefetcher import ImagePrefetcher
+from napari_allencell_annotator.util.image_utils import ImageUtils
+
+TEST_IMAGE: Path = (
+    Path(napari_allencell_annotator.__file__).parent / "_tests" / "assets" / "image_types" / "img.ome.tiff"
+)
+
+
+@pytest.fixture
+def annotator_model() -> AnnotatorModel:
+    model: AnnotatorModel = AnnotatorModel()
+    model.set_all_images([Path(f"img_{idx}.ome.tiff") for idx in range(10)])
+    return model
+
+
+def test_prefetch_neighbors_window(annotator_model: AnnotatorModel) -> None:
+    # ARRANGE
+    prefetcher: ImagePrefetcher = ImagePrefetcher(annotator_model, depth=2, num_workers=1)
+    annotator_model.set_curr_img_index(5)
+
+    # ACT
+    prefetcher.prefetch_neighbors()
+
+    # ASSERT
+    assert set(prefetcher._prefetched.keys()) == {Path(f"img_{idx}.ome.tiff") for idx in range(3, 8)}
+    prefetcher.shutdown()
+
+
+def test_prefetch_neighbors_drops_images_outside_window(annotator_model: AnnotatorModel) -> None:
+    # ARRANGE
+    prefetcher: ImagePrefetcher = ImagePrefetcher(annotator_model, depth=1, num_workers=1)
+    annotator_model.set_curr_img_index(0)
+    prefetcher.prefetch_neighbors()
+
+    # ACT
+    annotator_model.set_curr_img_index(9)
+    prefetcher.prefetch_neighbors()
+
+    # ASSERT
+    assert set(prefetcher._prefetched.keys()) == {Path("img_8.ome.tiff"), Path("img_9.ome.tiff")}
+    prefetcher.shutdown()
+
+
+def test_get_image_prefetched() -> None:
+    # ARRANGE
+    annotator_model: AnnotatorModel = AnnotatorModel()
+    annotator_model.set_all_images([TEST_IMAGE])
+    annotator_model.set_curr_img_index(0)
+    prefetcher: ImagePrefetcher = ImagePrefetcher(annotator_model)
+    prefetcher.prefetch_neighbors()
+
+    # ACT
+    image: ImageUtils = prefetcher.get_image(TEST_IMAGE)
+
+    # ASSERT
+    assert image is prefetcher.get_image(TEST_IMAGE)
+    np.testing.assert_array_equal(image.get_image_dask_data()[0, 0, :, :, :, :], np.zeros((2, 2, 2, 2)))
+    prefetcher.shutdown()
+
+
+def test_get_image_not_prefetched() -> None:
+    # ARRANGE
+    prefetcher: ImagePrefetcher = ImagePrefetcher(AnnotatorModel())
+
+    # ACT
+    image: ImageUtils = prefetcher.get_image(TEST_IMAGE)
+
+    # ASSERT
+    np.testing.assert_array_equal(image.get_image_dask_data()[0, 0, :, :, :, :], np.zeros((2, 2, 2, 2)))
+    prefetcher.shutdown()
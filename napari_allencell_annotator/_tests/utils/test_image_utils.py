@@ -1,7 +1,11 @@
 from pathlib import Path
 import numpy as np
 import dask.array as da
+import pytest
+from bioio_ome_tiff.writers import OmeTiffWriter
+from bioio_ome_zarr.writers import OMEZarrWriter
 import napari_allencell_annotator
+from napari_allencell_annotator.util import image_utils
 from napari_allencell_annotator.util.image_utils import ImageUtils
 
 
@@ -16,3 +20,75 @@ def test_get_dask_data_tiff() -> None:
 
     # ASSERT
     np.testing.assert_array_equal(test_image[0, 0, :, :, :, :], np.zeros((2, 2, 2, 2)))
+
+
+def test_get_multiscale_dask_data_tiff() -> None:
+    # ARRANGE
+    test_path: Path = (
+        Path(napari_allencell_annotator.__file__).parent / "_tests" / "assets" / "image_types" / "img.ome.tiff"
+    )
+    test_image: ImageUtils = ImageUtils(test_path)
+
+    # ACT
+    levels: list[da.Array] = test_image.get_image_multiscale_dask_data()
+
+    # ASSERT
+    assert not test_image.is_multiscale()
+    assert len(levels) == 1
+    assert levels[0] is test_image.get_image_dask_data()
+
+
+def test_get_multiscale_dask_data_zarr(tmp_path: Path) -> None:
+    # ARRANGE
+    test_path: Path = tmp_path / "raw.ome.zarr"
+    writer: OMEZarrWriter = OMEZarrWriter(
+        test_path, level_shapes=[(1, 1, 1, 8, 8), (1, 1, 1, 4, 4), (1, 1, 1, 2, 2)], dtype="uint8", zarr_format=2
+    )
+    writer.write_full_volume(np.ones((1, 1, 1, 8, 8), dtype="uint8"))
+    test_image: ImageUtils = ImageUtils(test_path)
+
+    # ACT
+    levels: list[da.Array] = test_image.get_image_multiscale_dask_data()
+
+    # ASSERT
+    assert test_image.is_multiscale()
+    assert [level.shape for level in levels] == [(1, 1, 1, 1, 8, 8), (1, 1, 1, 1, 4, 4), (1, 1, 1, 1, 2, 2)]
+    # the image is left at full resolution
+    assert test_image.get_image_dask_data().shape == (1, 1, 1, 1, 8, 8)
+    # a full resolution plane and one dask task per resolution level
+    assert test_image.get_estimated_nbytes() == 8 * 8 + 3 * image_utils._DASK_TASK_NBYTES
+
+
+@pytest.fixture
+def multi_scene_path(tmp_path: Path) -> Path:
+    test_path: Path = tmp_path / "multi_scene.ome.tiff"
+    OmeTiffWriter.save(
+        [np.full((2, 4, 4), scene, dtype="uint8") for scene in range(3)], test_path, dim_order=["ZYX"] * 3
+    )
+    return test_path
+
+
+def test_get_dask_data_lazy_scenes(multi_scene_path: Path) -> None:
+    # ARRANGE
+    test_image: ImageUtils = ImageUtils(multi_scene_path, lazy_scenes=True)
+
+    # ACT
+    lazy_data: da.Array = test_image.get_image_dask_data()
+
+    # ASSERT
+    # only the first scene is opened until another scene is read
+    assert len(test_image._scene_dask_data) == 0
+    np.testing.assert_array_equal(lazy_data[2, 0, 0, 1].compute(), np.full((4, 4), 2))
+    assert list(test_image._scene_dask_data.keys()) == [(2, 0)]
+    np.testing.assert_array_equal(
+        lazy_data.compute(), ImageUtils(multi_scene_path, lazy_scenes=False).get_image_dask_data().compute()
+    )
+
+
+def test_get_dask_data_eager_scenes(multi_scene_path: Path) -> None:
+    # ACT
+    test_data: da.Array = ImageUtils(multi_scene_path, lazy_scenes=False).get_image_dask_data()
+
+    # ASSERT
+    assert test_data.shape == (3, 1, 1, 2, 4, 4)
+    np.testing.assert_array_equal(test_data[1, 0, 0, 0].compute(), np.full((4, 4), 1))
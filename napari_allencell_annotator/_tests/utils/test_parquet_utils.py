@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from napari_allencell_annotator.model.key import Key
+from napari_allencell_annotator.util.parquet_utils import ParquetUtils
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def test_write_and_read_parquet(tmp_path: Path) -> None:
+    # ARRANGE
+    parquet_path: Path = tmp_path / "annotations.parquet"
+    annotation_keys: dict[str, Key] = {
+        "text": Key("string", ""),
+        "number": Key("number", 0),
+        "check": Key("bool", False),
+        "points": Key("point", None),
+    }
+    annotations: dict[Path, list] = {
+        Path("img1.tiff"): ["a", 2, True, np.array([[1.5, 2.0], [3.0, 4.0]], dtype=np.float32)],
+        # values imported from a csv file are text
+        Path("img2.tiff"): ["b", "3", "False", None],
+        Path("img3.tiff"): [],
+        Path("img4.tiff"): ["c", 4, False, np.array([[1.0, 2.0, 3.0]], dtype=np.float32)],
+    }
+
+    # ACT
+    ParquetUtils.write_parquet(parquet_path, True, annotation_keys, list(annotation_keys), annotations)
+    shuffled, annotations_json, images = ParquetUtils.read_parquet(parquet_path)
+
+    # ASSERT
+    assert shuffled
+    assert annotations_json == (
+        '{"text": {"type": "string", "default": ""}, "number": {"type": "number", "default": 0}, '
+        '"check": {"type": "bool", "default": false}, "points": {"type": "point", "default": null}}'
+    )
+    assert [path for path, _ in images] == list(annotations)
+    assert images[0][1][:3] == ["a", 2, True]
+    np.testing.assert_array_equal(images[0][1][3], annotations[Path("img1.tiff")][3])
+    assert images[0][1][3].dtype == np.float32
+    assert images[1][1] == ["b", 3, False, None]
+    assert images[2][1] == []
+    np.testing.assert_array_equal(images[3][1][3], annotations[Path("img4.tiff")][3])
+
+
+def test_write_and_read_parquet_empty_points(tmp_path: Path) -> None:
+    # ARRANGE
+    parquet_path: Path = tmp_path / "annotations.parquet"
+    annotation_keys: dict[str, Key] = {"points": Key("point", None)}
+    annotations: dict[Path, list] = {
+        Path("img1.tiff"): [np.zeros((0, 2), dtype=np.float32)],
+        Path("img2.tiff"): [np.zeros((0, 3), dtype=np.float32)],
+        Path("img3.tiff"): [[]],
+        Path("img4.tiff"): [np.ones((1, 3), dtype=np.float32)],
+    }
+
+    # ACT
+    ParquetUtils.write_parquet(parquet_path, False, annotation_keys, list(annotation_keys), annotations)
+    _, _, images = ParquetUtils.read_parquet(parquet_path)
+
+    # ASSERT
+    assert [values[0].shape for _, values in images] == [(0, 2), (0, 3), (0, 2), (1, 3)]
+    np.testing.assert_array_equal(images[3][1][0], np.ones((1, 3)))
+
+
+def test_parquet_columns_are_typed(tmp_path: Path) -> None:
+    # ARRANGE
+    parquet_path: Path = tmp_path / "annotations.parquet"
+    annotation_keys: dict[str, Key] = {"number": Key("number", 0), "points": Key("point", None)}
+
+    # ACT
+    ParquetUtils.write_parquet(
+        parquet_path,
+        False,
+        annotation_keys,
+        ["number", "points"],
+        {Path("img1.tiff"): [1, np.zeros((2, 3))], Path("plate/raw.ome.zarr"): [2, None]},
+    )
+
+    # ASSERT
+    # a zarr image is named after the directory holding it, as in csv files
+    assert pq.read_table(parquet_path).column("File Name").to_pylist() == ["img1.tiff", "plate"]
+    schema = pq.read_schema(parquet_path)
+    assert schema.field("number").type == pa.int64()
+    assert schema.field("points").type == pa.list_(pa.list_(pa.float32()))
+
+
+def test_read_parquet_not_annotator_file(tmp_path: Path) -> None:
+    # ARRANGE
+    parquet_path: Path = tmp_path / "other.parquet"
+    pq.write_table(pa.table({"a": [1, 2]}), parquet_path)
+
+    # ACT / ASSERT
+    with pytest.raises(ValueError):
+        ParquetUtils.read_parquet(parquet_path)
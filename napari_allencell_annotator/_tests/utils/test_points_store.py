@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from napari_allencell_annotator.util.points_store import PointsReference, PointsStore
+
+
+def test_get_points_dir() -> None:
+    # ASSERT
+    assert PointsStore.get_points_dir(Path("dir/annotations.csv")) == Path("dir/annotations.csv.points")
+
+
+def test_write_points(tmp_path: Path) -> None:
+    # ARRANGE
+    points_dir: Path = tmp_path / "annotations.csv.points"
+    points: np.ndarray = np.array([[1, 2, 3], [4, 5, 6]], dtype=np.float32)
+
+    # ACT
+    reference: PointsReference = PointsStore.write_points(points_dir, Path("img1.tiff"), 0, points)
+
+    # ASSERT
+    assert reference.count == 2
+    assert (points_dir / reference.file_name).exists()
+    np.testing.assert_array_equal(reference.load(), points)
+    assert PointsStore.parse_reference(points_dir, reference.to_cell()) == reference
+
+
+def test_write_points_content_addressed(tmp_path: Path) -> None:
+    # ARRANGE
+    points: np.ndarray = np.zeros((1, 2), dtype=np.float32)
+    reference: PointsReference = PointsStore.write_points(tmp_path, Path("img1.tiff"), 0, points)
+    modified_time: int = (tmp_path / reference.file_name).stat().st_mtime_ns
+
+    # ACT
+    same: PointsReference = PointsStore.write_points(tmp_path, Path("img1.tiff"), 0, points.copy())
+    other_column: PointsReference = PointsStore.write_points(tmp_path, Path("img1.tiff"), 1, points)
+    other_points: PointsReference = PointsStore.write_points(tmp_path, Path("img1.tiff"), 0, points + 1)
+
+    # ASSERT
+    assert same == reference
+    assert (tmp_path / reference.file_name).stat().st_mtime_ns == modified_time
+    assert len({reference.file_name, other_column.file_name, other_points.file_name}) == 3
+
+
+@pytest.mark.parametrize("cell", ["[(1.0, 2.0)]", "", "0123abcd.npy", "0123abcd.npy (x points)", "../a.npy (1 points)"])
+def test_parse_reference_invalid(cell: str) -> None:
+    # ASSERT
+    assert not PointsStore.is_reference(cell)
+    with pytest.raises(ValueError):
+        PointsStore.parse_reference(Path("."), cell)
+
+
+def test_load_wrong_count(tmp_path: Path) -> None:
+    # ARRANGE
+    reference: PointsReference = PointsStore.write_points(tmp_path, Path("img1.tiff"), 0, np.zeros((2, 2)))
+
+    # ASSERT
+    with pytest.raises(ValueError):
+        PointsReference(tmp_path, reference.file_name, 3).load()
+    with pytest.raises(OSError):
+        PointsReference(tmp_path, "0123abcd.npy", 2).load()
+
+
+def test_remove_unreferenced(tmp_path: Path) -> None:
+    # ARRANGE
+    points_dir: Path = tmp_path / "annotations.csv.points"
+    kept: PointsReference = PointsStore.write_points(points_dir, Path("img1.tiff"), 0, np.zeros((1, 2)))
+    removed: PointsReference = PointsStore.write_points(points_dir, Path("img2.tiff"), 0, np.zeros((1, 2)))
+
+    # ACT
+    PointsStore.remove_unreferenced(points_dir, {kept.file_name})
+
+    # ASSERT
+    assert (points_dir / kept.file_name).exists()
+    assert not (points_dir / removed.file_name).exists()
+
+    # ACT
+    PointsStore.remove_unreferenced(points_dir, set())
+
+    # ASSERT
+    assert not points_dir.exists()
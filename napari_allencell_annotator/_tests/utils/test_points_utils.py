@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from napari_allencell_annotator.util.points_utils import PointsUtils
+
+
+def test_parse_points() -> None:
+    # ACT
+    points: np.ndarray = PointsUtils.parse_points("[(1.0, 2.5, -3.0), (4.0, 5e-1, 6.0)]")
+
+    # ASSERT
+    assert points.dtype == np.float32
+    np.testing.assert_array_equal(points, np.array([[1.0, 2.5, -3.0], [4.0, 0.5, 6.0]]))
+
+
+def test_parse_points_numpy_scalars() -> None:
+    # ACT
+    points: np.ndarray = PointsUtils.parse_points(
+        "[(np.float64(1.0), np.float64(2.0)), (np.float64(3.0), np.float64(4.0))]"
+    )
+
+    # ASSERT
+    np.testing.assert_array_equal(points, np.array([[1.0, 2.0], [3.0, 4.0]]))
+
+
+def test_parse_points_empty() -> None:
+    # ACT
+    points: np.ndarray = PointsUtils.parse_points("[]")
+
+    # ASSERT
+    assert points.shape == (0, 2)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "(1.0, 2.0)",
+        "[(1.0, 2.0), (3.0)]",
+        "[(1.0, 2.0), 3.0]",
+        "[(1.0, a)]",
+        "[__import__('os').getcwd()]",
+    ],
+)
+def test_parse_points_invalid(text: str) -> None:
+    # ASSERT
+    with pytest.raises(ValueError):
+        PointsUtils.parse_points(text)
+
+
+def test_format_points_round_trip() -> None:
+    # ARRANGE
+    points: np.ndarray = np.array([[1.0, 2.5, 0.1], [4.0, -5.0, 6.0]], dtype=np.float32)
+
+    # ACT
+    text: str = PointsUtils.format_points(points)
+
+    # ASSERT
+    assert text == "[(1.0, 2.5, 0.1), (4.0, -5.0, 6.0)]"
+    np.testing.assert_array_equal(PointsUtils.parse_points(text), points)
+
+
+def test_format_points_tuples() -> None:
+    # ASSERT
+    assert PointsUtils.format_points([(np.float64(1.0), np.float64(2.0))]) == "[(1.0, 2.0)]"
+    assert PointsUtils.format_points([]) == "[]"
+
+
+def test_annotations_equal() -> None:
+    # ARRANGE
+    points: np.ndarray = np.array([[1.0, 2.0]])
+
+    # ASSERT
+    assert PointsUtils.annotations_equal(["a", points], ["a", [(1.0, 2.0)]])
+    assert PointsUtils.annotations_equal([np.empty((0, 2))], [[]])
+    assert not PointsUtils.annotations_equal(["a", points], ["a", np.array([[1.0, 3.0]])])
+    assert not PointsUtils.annotations_equal([points], [None])
+    assert not PointsUtils.annotations_equal(["a"], ["a", points])
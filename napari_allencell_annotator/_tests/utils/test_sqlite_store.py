@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from napari_allencell_annotator.model.key import Key
+from napari_allencell_annotator.util.sqlite_store import SQLiteAnnotationStore
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> SQLiteAnnotationStore:
+    store: SQLiteAnnotationStore = SQLiteAnnotationStore(tmp_path / "annotations.db")
+    yield store
+    store.close()
+
+
+def test_set_and_get(store: SQLiteAnnotationStore) -> None:
+    # ARRANGE
+    points: np.ndarray = np.array([[1.5, 2.0, 3.0], [4.0, 5.0, 6.0]], dtype=np.float32)
+
+    # ACT
+    store[Path("img1.tiff")] = ["a", 2, 1.5, True, points, None]
+    store[Path("img2.tiff")] = []
+
+    # ASSERT
+    values: list = store[Path("img1.tiff")]
+    assert values[:4] == ["a", 2, 1.5, True]
+    assert isinstance(values[3], bool)
+    np.testing.assert_array_equal(values[4], points)
+    assert values[4].dtype == np.float32
+    assert values[5] is None
+    assert store[Path("img2.tiff")] == []
+    assert Path("img1.tiff") in store
+    assert Path("img3.tiff") not in store
+    assert len(store) == 2
+    with pytest.raises(KeyError):
+        store[Path("img3.tiff")]
+
+
+def test_set_and_get_empty_points(store: SQLiteAnnotationStore) -> None:
+    # ACT
+    store[Path("img1.tiff")] = [np.zeros((0, 3), dtype=np.float32), np.zeros((0, 2), dtype=np.float32), []]
+
+    # ASSERT
+    assert [points.shape for points in store[Path("img1.tiff")]] == [(0, 3), (0, 2), (0, 2)]
+
+
+def test_replace_keeps_order(store: SQLiteAnnotationStore) -> None:
+    # ARRANGE
+    store[Path("img1.tiff")] = ["a"]
+    store[Path("img2.tiff")] = ["b"]
+    store[Path("img3.tiff")] = ["c"]
+
+    # ACT
+    store[Path("img1.tiff")] = ["d", "e"]
+    del store[Path("img2.tiff")]
+
+    # ASSERT
+    assert list(store.items()) == [(Path("img1.tiff"), ["d", "e"]), (Path("img3.tiff"), ["c"])]
+
+
+def test_commit(tmp_path: Path, store: SQLiteAnnotationStore) -> None:
+    # ARRANGE
+    store[Path("img1.tiff")] = ["a"]
+    store.commit()
+    store[Path("img2.tiff")] = ["b"]
+
+    # ACT
+    store.close()
+    reopened: SQLiteAnnotationStore = SQLiteAnnotationStore(tmp_path / "annotations.db")
+
+    # ASSERT
+    # changes made after the last commit are discarded
+    assert dict(reopened) == {Path("img1.tiff"): ["a"]}
+    reopened.close()
+
+
+def test_get_num_complete(store: SQLiteAnnotationStore) -> None:
+    # ARRANGE
+    store[Path("img1.tiff")] = ["a", np.zeros((1, 2))]
+    store[Path("img2.tiff")] = ["", np.zeros((1, 2))]
+    store[Path("img3.tiff")] = ["c", None]
+    store[Path("img4.tiff")] = []
+    store[Path("img5.tiff")] = ["e", np.zeros((0, 2))]
+
+    # ACT
+    num_complete: int = store.get_num_complete(2)
+
+    # ASSERT
+    assert num_complete == 2
+
+
+def test_write_session(tmp_path: Path) -> None:
+    # ARRANGE
+    db_path: Path = tmp_path / "session.db"
+    annotation_keys: dict[str, Key] = {"text": Key("string", "a")}
+
+    # ACT
+    SQLiteAnnotationStore.write_session(db_path, True, annotation_keys, ["text"], {Path("img1.tiff"): ["b"]})
+
+    # ASSERT
+    store: SQLiteAnnotationStore = SQLiteAnnotationStore(db_path)
+    assert store.get_session() == (True, '{"text": {"type": "string", "default": "a"}}')
+    assert dict(store) == {Path("img1.tiff"): ["b"]}
+    store.close()
+
+
+def test_get_session_missing(store: SQLiteAnnotationStore) -> None:
+    # ACT / ASSERT
+    with pytest.raises(ValueError):
+        store.get_session()
@@ -1,6 +1,10 @@
 from unittest import mock
 from unittest.mock import MagicMock, create_autospec
 
+from pathlib import Path
+
+import numpy as np
+
 import pytest
 
 from napari_allencell_annotator.model.combo_key import ComboKey
@@ -21,6 +25,7 @@ from napari_allencell_annotator.view.annotator_view import (
     TemplateList,
     QScrollArea,
 )
+from napari_allencell_annotator.util.points_store import PointsReference, PointsStore
 from napari_allencell_annotator.widgets.template_item import TemplateItem
 
 
@@ -42,12 +47,46 @@ def test_render_values(annotator_model: AnnotatorModel, viewer: IViewer) -> None
     annotator_view.annot_list.add_item("point_created", Key("point", None))
 
     # ACT
-    annotator_view.render_values(["", 2, [(0, 0, 0, 0, 0, 0)]])
+    annotator_view.render_values(["", 2, np.array([[0, 0, 0, 0, 0, 0], [1, 1, 1, 1, 1, 1]], dtype=np.float32)])
 
     # ASSERT
     assert annotator_view.annot_list.item(0).editable_widget.text() == "text"
     assert annotator_view.annot_list.item(1).editable_widget.value() == 2
     assert "point_created" in annotator_view._annotator_model.get_all_curr_img_points_layers()
+    np.testing.assert_array_equal(
+        annotator_view._annotator_model.get_points_layer("point_created").data,
+        [[0, 0, 0, 0, 0, 0], [1, 1, 1, 1, 1, 1]],
+    )
+
+
+def test_render_values_copies_points(annotator_model: AnnotatorModel, viewer: IViewer) -> None:
+    # ARRANGE
+    annotator_view: AnnotatorView = AnnotatorView(annotator_model, viewer)
+    annotator_view.annot_list.add_item("point_created", Key("point", None))
+    points: np.ndarray = np.zeros((1, 6), dtype=np.float32)
+
+    # ACT
+    annotator_view.render_values([points])
+    annotator_model.get_points_layer("point_created").data[0, 0] = 5
+
+    # ASSERT
+    # moving a point in the layer does not change the saved annotation
+    assert points[0, 0] == 0
+
+
+def test_render_values_loads_saved_points(annotator_model: AnnotatorModel, viewer: IViewer, tmp_path: Path) -> None:
+    # ARRANGE
+    annotator_view: AnnotatorView = AnnotatorView(annotator_model, viewer)
+    annotator_view.annot_list.add_item("point_created", Key("point", None))
+    annotator_view.annot_list.add_item("point_missing", Key("point", None))
+    saved: PointsReference = PointsStore.write_points(tmp_path, Path("img1.tiff"), 0, np.ones((2, 6)))
+
+    # ACT
+    annotator_view.render_values([saved, PointsReference(tmp_path, "0123abcd.npy", 1)])
+
+    # ASSERT
+    np.testing.assert_array_equal(annotator_model.get_points_layer("point_created").data, np.ones((2, 6)))
+    assert "point_missing" not in annotator_model.get_all_curr_img_points_layers()
 
 
 def test_get_curr_annots(annotator_model: AnnotatorModel, viewer: IViewer) -> None:
@@ -62,8 +101,14 @@ def test_get_curr_annots(annotator_model: AnnotatorModel, viewer: IViewer) -> No
     annotator_view.annot_list.add_item("point_none", Key("point", None))
     annotator_view.viewer.create_points_layer("point_created", True, [(0, 0, 0, 0, 0, 0)])
 
+    # ACT
+    annots: list = annotator_view.get_curr_annots()
+
     # ASSERT
-    assert annotator_view.get_curr_annots() == ["", 1, True, "a", [(0, 0, 0, 0, 0, 0)], None]
+    assert annots[:4] == ["", 1, True, "a"]
+    assert annots[4].dtype == np.float32
+    np.testing.assert_array_equal(annots[4], [[0, 0, 0, 0, 0, 0]])
+    assert annots[5] is None
 
 
 class TestAnnotatorView:
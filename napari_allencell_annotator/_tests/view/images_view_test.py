@@ -1,13 +1,18 @@
+import shutil
 from pathlib import Path
 import napari_allencell_annotator
+import numpy as np
 import pytest
+import tifffile
+from napari.layers import Points
 from pytestqt import qtbot
+from qtpy.QtCore import QCoreApplication, QEvent, Qt
 
 from napari_allencell_annotator._tests.fakes.fake_viewer import FakeViewer
 from napari_allencell_annotator.model.annotation_model import AnnotatorModel
+from napari_allencell_annotator.util.image_cache import ImageCache
 from napari_allencell_annotator.view.images_view import ImagesView
 from napari_allencell_annotator.widgets.files_widget import FilesWidget
-from napari_allencell_annotator.widgets.file_item import FileItem
 
 
 @pytest.fixture
@@ -88,7 +93,7 @@ def test_toggle_delete_button_text_unchecked(images_view: ImagesView) -> None:
 def test_display_img_start_display(images_view: ImagesView) -> None:
     # ARRANGE
     test_current_file: Path = Path(napari_allencell_annotator.__file__).parent / "_tests" / "assets" / "test_img1.tiff"
-    test_current_file_item: FileItem = FileItem(test_current_file, images_view.file_widget, False)
+    images_view.file_widget.add_item(test_current_file)
     pass
 
 
@@ -96,13 +101,145 @@ def test_display_img_start_display(images_view: ImagesView) -> None:
 def test_display_img_change_image(images_view: ImagesView) -> None:
     # ARRANGE
     test_previous_file: Path = Path(napari_allencell_annotator.__file__).parent / "_tests" / "assets" / "test_img1.tiff"
-    test_previous_file_item: FileItem = FileItem(test_previous_file, images_view.file_widget, False)
+    images_view.file_widget.add_item(test_previous_file)
 
     test_current_file: Path = Path(napari_allencell_annotator.__file__).parent / "_tests" / "assets" / "test_img1.tiff"
-    test_current_file_item: FileItem = FileItem(test_current_file, images_view.file_widget, False)
+    images_view.file_widget.add_item(test_current_file)
     pass
 
 
+@pytest.fixture
+def test_images(tmp_path: Path) -> list[Path]:
+    test_image: Path = (
+        Path(napari_allencell_annotator.__file__).parent / "_tests" / "assets" / "image_types" / "img.ome.tiff"
+    )
+    paths: list[Path] = []
+    for idx in range(3):
+        path: Path = tmp_path / f"img_{idx}.ome.tiff"
+        shutil.copy(test_image, path)
+        paths.append(path)
+    return paths
+
+
+def test_display_img_first_image(
+    images_view: ImagesView, annotator_model: AnnotatorModel, test_images: list[Path], qtbot
+) -> None:
+    # ARRANGE
+    annotator_model.set_all_images(test_images)
+    annotator_model.set_curr_img_index(0)
+
+    # ACT
+    images_view._display_img()
+
+    # ASSERT
+    # the image is opened on a worker thread
+    assert not annotator_model.is_image_displayed()
+    qtbot.waitUntil(lambda: images_view._display_worker is None)
+    assert annotator_model.is_image_displayed()
+    assert len(images_view.viewer.get_layers()) == 1
+    assert images_view.viewer.get_layers()[0] is ImageCache.get_instance().get(test_images[0]).get_image_dask_data()
+
+
+def test_display_img_first_image_unreadable(
+    images_view: ImagesView, annotator_model: AnnotatorModel, tmp_path: Path, qtbot
+) -> None:
+    # ARRANGE
+    path: Path = tmp_path / "corrupt.ome.tiff"
+    path.write_bytes(b"not a tiff")
+    annotator_model.set_all_images([path])
+    annotator_model.set_curr_img_index(0)
+
+    # ACT
+    images_view._display_img()
+    qtbot.waitUntil(lambda: images_view._display_worker is None)
+
+    # ASSERT
+    assert images_view.viewer.alerts[0].startswith("Could not open corrupt.ome.tiff")
+    assert len(images_view.viewer.get_layers()) == 0
+    assert not annotator_model.is_image_displayed()
+
+
+def test_display_img_discards_superseded_images(
+    images_view: ImagesView, annotator_model: AnnotatorModel, test_images: list[Path], qtbot
+) -> None:
+    # ARRANGE
+    annotator_model.set_all_images(test_images)
+    annotator_model.set_curr_img_index(0)
+    images_view._display_img()
+    qtbot.waitUntil(lambda: images_view._display_worker is None)
+
+    # ACT
+    for idx in [1, 2, 1, 2]:
+        annotator_model.set_curr_img_index(idx)
+        images_view._display_img()
+    qtbot.waitUntil(lambda: images_view._display_worker is None)
+
+    # ASSERT
+    assert len(images_view.viewer.get_layers()) == 1
+    assert images_view.viewer.get_layers()[0] is ImageCache.get_instance().get(test_images[2]).get_image_dask_data()
+
+
+def test_display_img_cleared_while_opening(
+    images_view: ImagesView, annotator_model: AnnotatorModel, test_images: list[Path], qtbot
+) -> None:
+    # ARRANGE
+    annotator_model.set_all_images(test_images)
+    annotator_model.set_curr_img_index(0)
+    images_view._display_img()
+    annotator_model.set_curr_img_index(1)
+    images_view._display_img()
+
+    # ACT
+    images_view._clear_display()
+    qtbot.waitUntil(lambda: images_view._display_worker is None)
+
+    # ASSERT
+    assert len(images_view.viewer.get_layers()) == 0
+
+
+def test_display_img_incompatible_image_keeps_points(
+    images_view: ImagesView, annotator_model: AnnotatorModel, tmp_path: Path, qtbot
+) -> None:
+    # ARRANGE
+    paths: list[Path] = [tmp_path / "img_uint8.ome.tiff", tmp_path / "img_uint16.ome.tiff"]
+    tifffile.imwrite(paths[0], np.zeros((4, 4), dtype=np.uint8), ome=True)
+    tifffile.imwrite(paths[1], np.zeros((4, 4), dtype=np.uint16), ome=True)
+    annotator_model.set_all_images(paths)
+    annotator_model.set_curr_img_index(0)
+    images_view._display_img()
+    qtbot.waitUntil(lambda: images_view._display_worker is None)
+    points: Points = images_view.viewer.create_points_layer("points", True, np.ones((1, 6)))
+
+    # ACT
+    annotator_model.set_curr_img_index(1)
+    images_view._display_img()
+
+    # ASSERT
+    # the points of the previous image are kept, hidden, until the new image is displayed
+    assert not points.visible
+    np.testing.assert_array_equal(points.data, np.ones((1, 6)))
+    qtbot.waitUntil(lambda: images_view._display_worker is None)
+    assert annotator_model.is_image_displayed()
+    assert images_view.viewer.get_layers()[0] is ImageCache.get_instance().get(paths[1]).get_image_dask_data()
+    # the points layer is emptied and reused for the annotations of the new image
+    assert images_view.viewer.create_points_layer("points", True) is points
+    assert len(points.data) == 0
+
+
+def test_prefetcher_shut_down_with_widget(annotator_model: AnnotatorModel, qtbot) -> None:
+    # ARRANGE
+    images_view: ImagesView = ImagesView(annotator_model, FakeViewer())
+    executor = images_view._prefetcher._executor
+
+    # ACT
+    images_view.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    # ASSERT
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+
 def test_update_num_files_label(images_view: ImagesView) -> None:
     # ACT
     images_view.update_num_files_label(1)
@@ -138,6 +275,73 @@ def test_add_selected_dir_to_ui_non_empty_dir(images_view: ImagesView, annotator
     assert annotator_model.get_all_images()[1] == img_dir / "test_img2.tiff"
 
 
+def test_add_selected_dir_include_subfolders(
+    images_view: ImagesView, annotator_model: AnnotatorModel, tmp_path: Path, qtbot
+) -> None:
+    # ARRANGE
+    (tmp_path / "well_1").mkdir()
+    (tmp_path / "well_2").mkdir()
+    (tmp_path / "well_1" / "a.tiff").touch()
+    (tmp_path / "well_2" / "b.tiff").touch()
+    images_view.include_subfolders.setChecked(True)
+
+    # ACT
+    images_view._add_sorted_valid_images_in_dir(tmp_path)
+
+    # ASSERT
+    assert not images_view.input_dir._input_btn.isEnabled()
+    qtbot.waitUntil(lambda: images_view._import_worker is None)
+    assert annotator_model.get_all_images() == [tmp_path / "well_1" / "a.tiff", tmp_path / "well_2" / "b.tiff"]
+    assert images_view.num_files_label.text() == "Image files: 2"
+    assert images_view.input_dir._input_btn.isEnabled()
+    assert images_view.cancel_import.isHidden()
+    assert len(images_view.viewer.alerts) == 0
+
+
+def test_add_selected_dir_include_subfolders_stopped(
+    images_view: ImagesView, annotator_model: AnnotatorModel, tmp_path: Path, qtbot
+) -> None:
+    # ARRANGE
+    for idx in range(10):
+        (tmp_path / f"{idx}.tiff").touch()
+    images_view.include_subfolders.setChecked(True)
+
+    # ACT
+    images_view._add_sorted_valid_images_in_dir(tmp_path)
+    images_view._stop_import()
+
+    # ASSERT
+    qtbot.waitUntil(lambda: images_view._import_worker is None)
+    assert annotator_model.get_num_images() == 0
+    assert images_view.input_dir._input_btn.isEnabled()
+    assert len(images_view.viewer.alerts) == 0
+
+
+@pytest.mark.parametrize("action", ["clear_all", "set_all_images", "start_annotating"])
+def test_add_selected_dir_include_subfolders_stopped_by_image_list_change(
+    images_view: ImagesView, annotator_model: AnnotatorModel, tmp_path: Path, qtbot, action: str
+) -> None:
+    # ARRANGE
+    for idx in range(10):
+        (tmp_path / f"{idx}.tiff").touch()
+    images_view.include_subfolders.setChecked(True)
+    expected_images: list[Path] = []
+
+    # ACT
+    images_view._add_sorted_valid_images_in_dir(tmp_path)
+    if action == "clear_all":
+        images_view.clear_all()
+    elif action == "set_all_images":
+        expected_images = [tmp_path / "imported.tiff"]
+        annotator_model.set_all_images(list(expected_images))
+    else:
+        annotator_model.set_annotation_started(True)
+
+    # ASSERT
+    qtbot.waitUntil(lambda: images_view._import_worker is None)
+    assert annotator_model.get_all_images() == expected_images
+
+
 def test_add_new_item(images_view: ImagesView, annotator_model: AnnotatorModel) -> None:
     # ARRANGE
     test_file: Path = Path(napari_allencell_annotator.__file__).parent / "_tests" / "assets" / "test_img1.tiff"
@@ -149,7 +353,7 @@ def test_add_new_item(images_view: ImagesView, annotator_model: AnnotatorModel)
     assert annotator_model.get_num_images() == 1
     assert annotator_model.get_all_images()[annotator_model.get_num_images() - 1] == test_file
     assert images_view.file_widget.count() == 1
-    assert images_view.file_widget.item(0).label.text() == "test_img1.tiff"
+    assert images_view.file_widget.get_files_model().index(0).data() == "test_img1.tiff"
 
 
 def test_add_selected_files_repeated_files(images_view: ImagesView, annotator_model: AnnotatorModel) -> None:
@@ -187,6 +391,22 @@ def test_add_selected_files_valid_files(images_view: ImagesView, annotator_model
     )
 
 
+def test_add_selected_files_updates_once(images_view: ImagesView, annotator_model: AnnotatorModel) -> None:
+    # ARRANGE
+    counts: list[int] = []
+    annotator_model.image_count_changed.connect(counts.append)
+    files: list[Path] = [Path(f"img_{i}.tiff") for i in range(100)]
+
+    # ACT
+    images_view._add_selected_files(files)
+
+    # ASSERT
+    assert counts == [100]
+    assert images_view.file_widget.count() == 100
+    assert images_view.file_widget.get_file_at(99) == files[99]
+    assert images_view.num_files_label.text() == "Image files: 100"
+
+
 def test_handle_shuffle_clicked_toggled_on(images_view: ImagesView, annotator_model: AnnotatorModel):
     # ARRANGE
     test_previous_file: Path = Path(napari_allencell_annotator.__file__).parent / "_tests" / "assets" / "test_img1.tiff"
@@ -217,9 +437,7 @@ def test_delete_checked(images_view: ImagesView, annotator_model: AnnotatorModel
     test_file_2: Path = Path(napari_allencell_annotator.__file__).parent / "_tests" / "assets" / "test_img2.tiff"
 
     annotator_model.set_all_images([test_file_1, test_file_2])
-    test_file_item_1: FileItem = images_view.file_widget.item(0)
-    test_file_item_2: FileItem = images_view.file_widget.item(1)
-    images_view.file_widget.checked = {test_file_item_1, test_file_item_2}
+    images_view.file_widget.checked = {test_file_1, test_file_2}
     assert annotator_model.get_num_images() == 2
     assert images_view.file_widget.count() == 2
 
@@ -236,10 +454,9 @@ def test_remove_image(images_view: ImagesView, annotator_model: AnnotatorModel)
     test_file: Path = Path(napari_allencell_annotator.__file__).parent / "_tests" / "assets" / "test_img1.tiff"
 
     annotator_model.set_all_images([test_file])
-    test_file_item: FileItem = images_view.file_widget.item(0)
 
     # ACT
-    images_view.remove_image(test_file_item)
+    images_view.remove_image(test_file)
 
     # ASSERT
     assert annotator_model.get_num_images() == 0
@@ -278,8 +495,9 @@ def test_start_annotating_with_files(images_view: ImagesView, annotator_model: A
     images_view.start_annotating()
 
     # ASSERT
+    assert len(images_view.viewer.alerts) == 0
     for i in range(images_view.file_widget.count()):
-        assert images_view.file_widget.item(i).check.isHidden()
+        assert images_view.file_widget.get_files_model().index(i).data(Qt.CheckStateRole) is None
 
 
 def test_hide_image_paths(images_view: ImagesView, annotator_model: AnnotatorModel) -> None:
@@ -321,7 +539,7 @@ def test_handle_image_count_changed_no_images(images_view: ImagesView) -> None:
 # def test_stop_annotating(images_view):
 #     # ARRANGE
 #     test_file: Path = Path(napari_allencell_annotator.__file__).parent / "_tests" / "assets" / "test_img1.tiff"
-#     test_file_item: FileItem = FileItem(test_file, images_view.file_widget, False)
+#     images_view.file_widget.add_item(test_file)
 #     assert images_view.file_widget.count() == 1
 #
 #     # ACT
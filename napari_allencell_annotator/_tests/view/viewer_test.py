@@ -38,6 +38,123 @@ def test_add_image(viewer: Viewer) -> None:
     np.testing.assert_array_equal(viewer.get_layers()[0].data, test_image)
 
 
+def test_add_image_multiscale(viewer: Viewer) -> None:
+    # ARRANGE
+    test_levels: list[np.ndarray] = [np.zeros(shape=(4, 4)), np.zeros(shape=(2, 2))]
+
+    # ACT
+    viewer.add_image(test_levels)
+
+    # ASSERT
+    assert len(viewer.get_layers()) == 1
+    assert viewer.get_layers()[0].multiscale
+    assert len(viewer.get_layers()[0].data) == 2
+
+
+def test_set_image_in_place(viewer: Viewer) -> None:
+    # ARRANGE
+    viewer.set_image(np.zeros(shape=(2, 2)))
+    image_layer = viewer.get_layers()[0]
+    test_image = np.ones(shape=(4, 4))
+
+    # ACT
+    viewer.set_image(test_image)
+
+    # ASSERT
+    assert len(viewer.get_layers()) == 1
+    assert viewer.get_layers()[0] is image_layer
+    np.testing.assert_array_equal(image_layer.data, test_image)
+
+
+def test_set_image_in_place_resets_contrast(viewer: Viewer) -> None:
+    # ARRANGE
+    viewer.set_image(np.arange(16, dtype=np.uint16).reshape(4, 4))
+    image_layer = viewer.get_layers()[0]
+
+    # ACT
+    viewer.set_image(np.arange(16, dtype=np.uint16).reshape(4, 4) * 1000)
+
+    # ASSERT
+    assert viewer.get_layers()[0] is image_layer
+    assert list(image_layer.contrast_limits) == [0, 15000]
+    assert list(image_layer.contrast_limits_range) == [0, 15000]
+
+
+def test_set_image_rebuild(viewer: Viewer) -> None:
+    # ARRANGE
+    viewer.set_image(np.zeros(shape=(2, 2)))
+    image_layer = viewer.get_layers()[0]
+    test_image = np.ones(shape=(2, 4, 4))
+
+    # ACT
+    viewer.set_image(test_image)
+
+    # ASSERT
+    assert len(viewer.get_layers()) == 1
+    assert viewer.get_layers()[0] is not image_layer
+    np.testing.assert_array_equal(viewer.get_layers()[0].data, test_image)
+
+
+def test_set_image_rebuild_keeps_points_layers(viewer: Viewer) -> None:
+    # ARRANGE
+    viewer.set_image(np.zeros(shape=(4, 4), dtype=np.uint8))
+    test_points_layer: Points = viewer.create_points_layer("test", True, np.ones(shape=(1, 2)))
+    test_image = np.ones(shape=(4, 4), dtype=np.uint16)
+
+    # ACT
+    viewer.set_image(test_image)
+
+    # ASSERT
+    assert len(viewer.get_layers()) == 2
+    np.testing.assert_array_equal(viewer.get_layers()[0].data, test_image)
+    assert viewer.get_layers()[1] is test_points_layer
+    np.testing.assert_array_equal(viewer.get_all_point_annotations()["test"], np.ones(shape=(1, 2)))
+
+
+def test_reset_points_layers(viewer: Viewer) -> None:
+    # ARRANGE
+    test_points_layer: Points = viewer.create_points_layer("test", True, np.ones(shape=(1, 2)))
+
+    # ACT
+    viewer.reset_points_layers()
+
+    # ASSERT
+    assert test_points_layer in viewer.get_all_points_layers()
+    assert len(test_points_layer.data) == 0
+    assert not test_points_layer.visible
+    assert viewer.get_all_point_annotations() == {}
+
+
+def test_hide_points_layers(viewer: Viewer) -> None:
+    # ARRANGE
+    test_points_layer: Points = viewer.create_points_layer("test", True, np.ones(shape=(1, 2)))
+    viewer.set_points_layer_mode(test_points_layer, PointsLayerMode.ADD)
+
+    # ACT
+    viewer.hide_points_layers()
+
+    # ASSERT
+    assert not test_points_layer.visible
+    assert viewer.get_points_layer_mode(test_points_layer) == PointsLayerMode.PAN_ZOOM.value
+    np.testing.assert_array_equal(viewer.get_all_point_annotations()["test"], np.ones(shape=(1, 2)))
+
+
+def test_create_points_layer_reuses_reset_layer(viewer: Viewer) -> None:
+    # ARRANGE
+    test_points_layer: Points = viewer.create_points_layer("test", True, np.ones(shape=(1, 2)))
+    viewer.reset_points_layers()
+
+    # ACT
+    reused_points_layer: Points = viewer.create_points_layer("test", True, np.zeros(shape=(2, 2)))
+
+    # ASSERT
+    assert reused_points_layer is test_points_layer
+    assert len(viewer.get_all_points_layers()) == 1
+    assert reused_points_layer.visible
+    assert list(viewer.get_all_point_annotations()) == ["test"]
+    np.testing.assert_array_equal(viewer.get_all_point_annotations()["test"], np.zeros(shape=(2, 2)))
+
+
 def test_create_points_layer(viewer: Viewer) -> None:
     # ARRANGE
     test_points_data = np.zeros(shape=(1, 2))
@@ -53,6 +170,21 @@ def test_create_points_layer(viewer: Viewer) -> None:
     np.testing.assert_array_equal(test_points_layer2.face_color[0], Colormap("fuchsia").colors[0])
 
 
+def test_create_points_layer_more_layers_than_colors(viewer: Viewer) -> None:
+    # ARRANGE
+    viewer.add_image(np.zeros(shape=(2, 2)))
+    for idx in range(len(viewer.colors)):
+        viewer.create_points_layer(f"test{idx}", True)
+    viewer.reset_points_layers()
+
+    # ACT
+    points_layer: Points = viewer.create_points_layer("other", True)
+
+    # ASSERT
+    assert points_layer in viewer.get_all_points_layers()
+    assert len(viewer.get_all_points_layers()) == len(viewer.colors) + 1
+
+
 def test_set_points_layer_mode(viewer: Viewer) -> None:
     # ARRANGE
     test_points_layer: Points = viewer.create_points_layer("test", True)
@@ -81,10 +213,12 @@ def test_get_selected_points(viewer: Viewer) -> None:
     test_points_layer: Points = viewer.create_points_layer("test", True, np.array([np.zeros(2), np.ones(2)]))
 
     # ACT
-    selected_points: list[tuple] = viewer.get_selected_points(test_points_layer)
+    selected_points: np.ndarray = viewer.get_selected_points(test_points_layer)
 
     # ASSERT
-    assert selected_points == [(0, 0), (1, 1)]
+    assert selected_points.dtype == np.float32
+    np.testing.assert_array_equal(selected_points, [[0, 0], [1, 1]])
+    assert not np.shares_memory(selected_points, test_points_layer.data)
 
 
 def test_get_all_point_annotations(viewer: Viewer) -> None:
@@ -93,10 +227,12 @@ def test_get_all_point_annotations(viewer: Viewer) -> None:
     test_points_layer2: Points = viewer.create_points_layer("test2", True, np.ones(shape=(1, 2)))
 
     # ACT
-    all_point_annotations: dict[str, list[tuple]] = viewer.get_all_point_annotations()
+    all_point_annotations: dict[str, np.ndarray] = viewer.get_all_point_annotations()
 
     # ASSERT
-    assert all_point_annotations == {"test1": [(0, 0)], "test2": [(1, 1)]}
+    assert list(all_point_annotations) == ["test1", "test2"]
+    np.testing.assert_array_equal(all_point_annotations["test1"], [[0, 0]])
+    np.testing.assert_array_equal(all_point_annotations["test2"], [[1, 1]])
 
 
 def test_toggle_points_layer_pan_zoom(viewer: Viewer) -> None:
@@ -0,0 +1,88 @@
+from pathlib import Path
+
+import pytest
+from qtpy.QtCore import Qt
+
+from napari_allencell_annotator.widgets.files_list_model import FilesListModel
+
+
+@pytest.fixture
+def files_list_model(qtbot) -> FilesListModel:
+    model: FilesListModel = FilesListModel()
+    model.set_files([Path("a.tiff"), Path("b.tiff"), Path("c.tiff"), Path("d.tiff")])
+    return model
+
+
+def test_data_display_name(files_list_model: FilesListModel) -> None:
+    # ARRANGE
+    long_name: Path = Path("a_very_long_file_name_that_does_not_fit_in_the_list.tiff")
+    files_list_model.add_files([long_name])
+
+    # ASSERT
+    assert files_list_model.rowCount() == 5
+    assert files_list_model.index(0).data() == "a.tiff"
+    assert files_list_model.index(4).data() == "a_very_long_fil..._in_the_list.tiff"
+
+
+def test_data_hidden(files_list_model: FilesListModel) -> None:
+    # ACT
+    files_list_model.set_hidden(True)
+
+    # ASSERT
+    assert files_list_model.index(2).data() == "Image 3"
+    assert files_list_model.index(2).data(Qt.CheckStateRole) is None
+    assert not files_list_model.flags(files_list_model.index(2)) & Qt.ItemIsUserCheckable
+
+
+def test_set_data_check_state(files_list_model: FilesListModel) -> None:
+    # ARRANGE
+    changes: list[tuple[Path, bool]] = []
+    files_list_model.check_state_changed.connect(lambda file, checked: changes.append((file, checked)))
+
+    # ACT
+    files_list_model.setData(files_list_model.index(1), Qt.Checked, Qt.CheckStateRole)
+    files_list_model.setData(files_list_model.index(1), Qt.Checked, Qt.CheckStateRole)
+
+    # ASSERT
+    assert files_list_model.checked == {Path("b.tiff")}
+    assert files_list_model.index(1).data(Qt.CheckStateRole) == Qt.Checked
+    assert changes == [(Path("b.tiff"), True)]
+
+    # ACT
+    files_list_model.setData(files_list_model.index(1), Qt.Unchecked, Qt.CheckStateRole)
+
+    # ASSERT
+    assert files_list_model.checked == set()
+    assert changes == [(Path("b.tiff"), True), (Path("b.tiff"), False)]
+
+
+def test_set_checkable(files_list_model: FilesListModel) -> None:
+    # ACT
+    files_list_model.set_checkable(False)
+
+    # ASSERT
+    assert files_list_model.index(0).data(Qt.CheckStateRole) is None
+    assert not files_list_model.setData(files_list_model.index(0), Qt.Checked, Qt.CheckStateRole)
+
+
+def test_remove_files(files_list_model: FilesListModel) -> None:
+    # ARRANGE
+    files_list_model.checked = {Path("a.tiff"), Path("c.tiff")}
+
+    # ACT
+    files_list_model.remove_files([Path("a.tiff"), Path("b.tiff"), Path("d.tiff"), Path("e.tiff")])
+
+    # ASSERT
+    assert files_list_model.rowCount() == 1
+    assert files_list_model.get_file_at(0) == Path("c.tiff")
+    assert files_list_model.checked == {Path("c.tiff")}
+
+
+def test_set_highlighted_row(files_list_model: FilesListModel) -> None:
+    # ACT
+    files_list_model.set_highlighted_row(1)
+
+    # ASSERT
+    assert files_list_model.index(1).data(Qt.FontRole).bold()
+    assert files_list_model.index(1).data(Qt.FontRole).underline()
+    assert not files_list_model.index(0).data(Qt.FontRole).bold()
@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import pytest
+from qtpy.QtCore import Qt
+
+from napari_allencell_annotator.model.annotation_model import AnnotatorModel
+from napari_allencell_annotator.widgets.files_widget import FilesWidget
+
+
+@pytest.fixture
+def annotator_model() -> AnnotatorModel:
+    return AnnotatorModel()
+
+
+@pytest.fixture
+def files_widget(annotator_model: AnnotatorModel, qtbot) -> FilesWidget:
+    widget: FilesWidget = FilesWidget(annotator_model)
+    qtbot.addWidget(widget)
+    annotator_model.add_images([Path("a.tiff"), Path("b.tiff"), Path("c.tiff")])
+    return widget
+
+
+def test_images_added(files_widget: FilesWidget) -> None:
+    # ASSERT
+    assert files_widget.count() == 3
+    assert files_widget.get_file_at(2) == Path("c.tiff")
+
+
+def test_files_selected(files_widget: FilesWidget) -> None:
+    # ARRANGE
+    selected: list[bool] = []
+    files_widget.files_selected.connect(selected.append)
+    model = files_widget.get_files_model()
+
+    # ACT
+    model.setData(model.index(0), Qt.Checked, Qt.CheckStateRole)
+    model.setData(model.index(1), Qt.Checked, Qt.CheckStateRole)
+    model.setData(model.index(0), Qt.Unchecked, Qt.CheckStateRole)
+    model.setData(model.index(1), Qt.Unchecked, Qt.CheckStateRole)
+
+    # ASSERT
+    assert selected == [True, False]
+
+
+def test_current_row_changed(files_widget: FilesWidget, annotator_model: AnnotatorModel) -> None:
+    # ACT
+    files_widget.setCurrentIndex(files_widget.get_files_model().index(1))
+
+    # ASSERT
+    assert annotator_model.get_curr_img_index() == 1
+    assert annotator_model.get_previous_image_index() == -1
+    assert files_widget.get_curr_row() == 1
+
+
+def test_image_changed(files_widget: FilesWidget, annotator_model: AnnotatorModel) -> None:
+    # ACT
+    annotator_model.set_curr_img_index(2)
+
+    # ASSERT
+    assert files_widget.get_curr_row() == 2
+    assert files_widget.get_files_model().get_highlighted_row() == 2
+
+
+def test_images_removed(files_widget: FilesWidget, annotator_model: AnnotatorModel) -> None:
+    # ARRANGE
+    selected: list[bool] = []
+    files_widget.files_selected.connect(selected.append)
+    files_widget.checked = {Path("b.tiff")}
+    files_widget.setCurrentIndex(files_widget.get_files_model().index(1))
+
+    # ACT
+    annotator_model.remove_images([Path("b.tiff")])
+
+    # ASSERT
+    assert files_widget.count() == 2
+    assert files_widget.get_curr_row() == -1
+    assert annotator_model.get_curr_img_index() == -1
+    assert selected == [False]
+
+
+def test_shuffle(files_widget: FilesWidget, annotator_model: AnnotatorModel) -> None:
+    # ACT
+    annotator_model.set_shuffled_images([Path("c.tiff"), Path("a.tiff"), Path("b.tiff")])
+
+    # ASSERT
+    assert files_widget.get_file_at(0) == Path("c.tiff")
+    assert files_widget.get_files_model().index(0).data() == "Image 1"
+
+    # ACT
+    files_widget.unhide_all()
+
+    # ASSERT
+    assert files_widget.get_files_model().index(0).data() == "c.tiff"
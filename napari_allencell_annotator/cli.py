@@ -0,0 +1,275 @@
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from napari_allencell_annotator.core.agreement import Agreement, AgreementReport
+from napari_allencell_annotator.core.session import Session
+from napari_allencell_annotator.util.json_utils import JSONUtils
+
+# extension of each format a session can be converted to. A json file holds only the annotation template.
+FORMAT_EXTENSIONS: dict[str, str] = {"csv": ".csv", "parquet": ".parquet", "db": ".db", "json": ".json"}
+
+
+def load_session(file_path: Path) -> Session:
+    """
+    Load a session from a csv, parquet or database file, or an annotation template from a json file as a session
+    without images.
+
+    Parameters
+    ----------
+    file_path: Path
+        The path to the file
+
+    Raises
+    ------
+    ValueError
+        If the file is not a session or template file
+    OSError
+        If the file cannot be read
+    ImportError
+        If the file is a parquet file and pyarrow is not installed
+    """
+    if file_path.suffix == ".json":
+        return Session(JSONUtils.json_dump_to_dict(JSONUtils.get_json_data(file_path)), {})
+    return Session.load(file_path)
+
+
+def save_session(session: Session, file_path: Path) -> None:
+    """
+    Save a session to a csv, parquet or database file, or its annotation template to a json file.
+
+    Parameters
+    ----------
+    session: Session
+        The session
+    file_path: Path
+        The path to the file
+    """
+    if file_path.suffix == ".json":
+        JSONUtils.write_json_data(JSONUtils.dict_to_json_dump(session.annotation_keys), file_path)
+    else:
+        session.save(file_path)
+
+
+def _validate_file(file_path: Path, check_files: bool) -> list[str]:
+    """Return the problems with a session file. Runs in a worker process."""
+    try:
+        return load_session(file_path).validate(check_files)
+    except (ImportError, OSError, ValueError) as error:
+        return [f"could not be read: {error}"]
+
+
+def _convert_file(source: Path, destination: Path) -> Optional[str]:
+    """Convert a session file, return the error if it could not be converted. Runs in a worker process."""
+    try:
+        save_session(load_session(source), destination)
+    except (ImportError, OSError, ValueError) as error:
+        return str(error)
+    return None
+
+
+def _load_file(file_path: Path) -> Session:
+    """Load a session file to send back from a worker process, with its annotations read into memory."""
+    session: Session = load_session(file_path)
+    # the annotations of a database are read from it as they are needed, and a database connection cannot be sent
+    # between processes
+    session.annotations = dict(session.annotations)
+    return session
+
+
+def _run(function: Callable[..., Any], arguments: list[tuple], workers: int) -> list[Any]:
+    """
+    Call a function with each set of arguments across a pool of worker processes, or in this process if there is a
+    single worker or a single set of arguments.
+
+    Returns
+    -------
+    list[Any]
+        The results, in the order of the arguments
+    """
+    if workers <= 1 or len(arguments) <= 1:
+        return [function(*args) for args in arguments]
+    workers = min(workers, len(arguments))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # send the files in chunks so thousands of small files do not cost a round trip each
+        return list(executor.map(function, *zip(*arguments), chunksize=max(1, len(arguments) // (workers * 4))))
+
+
+def _validate(args: argparse.Namespace) -> int:
+    results: list[list[str]] = _run(_validate_file, [(path, args.check_files) for path in args.files], args.workers)
+    num_invalid: int = 0
+    for path, problems in zip(args.files, results):
+        if len(problems) > 0:
+            num_invalid += 1
+            for problem in problems:
+                print(f"{path}: {problem}")
+    print(f"{num_invalid} of {len(args.files)} file(s) have problems", file=sys.stderr)
+    return 1 if num_invalid > 0 else 0
+
+
+def _convert(args: argparse.Namespace) -> int:
+    extension: str = FORMAT_EXTENSIONS[args.to]
+    conversions: list[tuple[Path, Path]] = []
+    for path in args.files:
+        destination: Path = (args.output_dir or path.parent) / (path.stem + extension)
+        if destination == path:
+            print(f"{path}: is already a {args.to} file", file=sys.stderr)
+            return 1
+        conversions.append((path, destination))
+
+    errors: list[Optional[str]] = _run(_convert_file, conversions, args.workers)
+    num_failed: int = 0
+    for (source, destination), error in zip(conversions, errors):
+        if error is None:
+            print(f"{source} -> {destination}")
+        else:
+            num_failed += 1
+            print(f"{source}: could not be converted: {error}", file=sys.stderr)
+    return 1 if num_failed > 0 else 0
+
+
+def _merge(args: argparse.Namespace) -> int:
+    try:
+        sessions: list[Session] = _run(_load_file, [(path,) for path in args.files], args.workers)
+        merged: Session = Session.merge(sessions)
+        save_session(merged, args.output)
+    except (ImportError, OSError, ValueError) as error:
+        print(f"Could not merge the sessions: {error}", file=sys.stderr)
+        return 1
+    for problem in merged.load_problems:
+        print(problem, file=sys.stderr)
+    print(f"Merged {len(args.files)} session(s), {len(merged.annotations)} image(s), into {args.output}")
+    return 0
+
+
+def _agreement(args: argparse.Namespace) -> int:
+    try:
+        sessions: list[Session] = _run(_load_file, [(path,) for path in args.files], args.workers)
+        report: AgreementReport = Agreement.compute(sessions, args.match_distance, args.workers)
+    except (ImportError, OSError, ValueError) as error:
+        print(f"Could not compare the sessions: {error}", file=sys.stderr)
+        return 1
+    for key in report.keys:
+        print(f"{key.name}: {key.statistic} = {key.value:.3f}")
+
+    queue: list[tuple[Path, float]] = report.get_review_queue()
+    if args.output is None:
+        for path, disagreement in queue[: args.top]:
+            print(f"{disagreement:.3f} {path}")
+    else:
+        write_review_queue(report, queue, args.output)
+    print(f"{len(queue)} of {len(report.images)} image(s) to review", file=sys.stderr)
+    return 0
+
+
+def write_review_queue(report: AgreementReport, queue: list[tuple[Path, float]], file_path: Path) -> None:
+    """
+    Write the images to review to a csv file: their path, their disagreement and their disagreement on each
+    annotation, the images annotators disagree on the most first.
+
+    Parameters
+    ----------
+    report: AgreementReport
+        The agreement between the annotators
+    queue: list[tuple[Path, float]]
+        The images to review and their disagreement, as returned by report.get_review_queue()
+    file_path: Path
+        The path to the csv file
+    """
+    indices: dict[Path, int] = {path: index for index, path in enumerate(report.images)}
+    with open(file_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["File Path", "Disagreement", *(key.name for key in report.keys)])
+        for path, disagreement in queue:
+            index: int = indices[path]
+            writer.writerow(
+                [str(path), f"{disagreement:.4f}", *(f"{key.disagreement[index]:.4f}" for key in report.keys)]
+            )
+
+
+def make_parser() -> argparse.ArgumentParser:
+    """Return the parser of the command line arguments."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog="allencell-annotator",
+        description="Validate, convert, merge and compare annotating sessions saved by napari-allencell-annotator.",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes the files are processed by (default: the number of cores)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate = commands.add_parser(
+        "validate", help="report annotation values that do not match the annotation template"
+    )
+    validate.add_argument("files", nargs="+", type=Path, help="session files (.csv, .parquet, .db, .json)")
+    validate.add_argument(
+        "--check-files", action="store_true", help="also report images and saved points that do not exist"
+    )
+    validate.set_defaults(run=_validate)
+
+    convert = commands.add_parser("convert", help="convert session files to another format")
+    convert.add_argument("files", nargs="+", type=Path, help="session files (.csv, .parquet, .db, .json)")
+    convert.add_argument(
+        "--to",
+        required=True,
+        choices=list(FORMAT_EXTENSIONS),
+        help="format to convert to, json writes only the annotation template",
+    )
+    convert.add_argument(
+        "-o", "--output-dir", type=Path, help="folder to write the converted files to (default: next to each file)"
+    )
+    convert.set_defaults(run=_convert)
+
+    merge = commands.add_parser("merge", help="merge sessions with the same annotation template into one")
+    merge.add_argument("files", nargs="+", type=Path, help="session files (.csv, .parquet, .db)")
+    merge.add_argument("-o", "--output", required=True, type=Path, help="file to save the merged session to")
+    merge.set_defaults(run=_merge)
+
+    agreement = commands.add_parser(
+        "agreement", help="measure the agreement of annotators on the same images and rank images to review"
+    )
+    agreement.add_argument("files", nargs="+", type=Path, help="session files, one per annotator (.csv, .parquet, .db)")
+    agreement.add_argument(
+        "--match-distance",
+        type=float,
+        default=5.0,
+        help="distance in pixels within which points of two annotators are the same point (default: 5)",
+    )
+    agreement.add_argument(
+        "-o", "--output", type=Path, help="csv file to write the images to review to, instead of printing them"
+    )
+    agreement.add_argument(
+        "--top", type=int, default=20, help="number of images to review printed without --output (default: 20)"
+    )
+    agreement.set_defaults(run=_agreement)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Run the command line tool.
+
+    Parameters
+    ----------
+    argv: Optional[list[str]]
+        The command line arguments, those of the process if None
+
+    Returns
+    -------
+    int
+        The exit status
+    """
+    args: argparse.Namespace = make_parser().parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,27 @@
 SUPPORTED_FILE_TYPES = {".jpeg", ".png", ".jpg", ".czi", ".tiff", ".tif", ".zarr"}
+
+# number of images on each side of the current image that are opened ahead of time while annotating
+PREFETCH_DEPTH = 2
+# number of threads used to open images ahead of time
+PREFETCH_WORKERS = 2
+
+# maximum number of opened images kept in the process-wide image cache
+IMAGE_CACHE_MAX_ENTRIES = 32
+# maximum estimated memory, in bytes, held by the opened images in the process-wide image cache
+IMAGE_CACHE_MAX_BYTES = 512 * 1024**2
+
+# when True, only the first scene of a multi-scene image is opened up front and the others are opened when displayed
+LAZY_SCENE_LOADING = True
+
+# number of directory entries examined, or csv rows read, between batches of images yielded while importing a folder
+# and its subfolders or a csv file
+IMPORT_BATCH_SIZE = 500
+
+# seconds after the first unsaved annotation change at which changed annotations are saved in the background
+AUTOSAVE_INTERVAL_SECONDS = 30
+# number of unsaved annotation changes at which changed annotations are saved in the background right away
+AUTOSAVE_CHANGE_THRESHOLD = 20
+
+# when True, point annotations are saved as .npy files in a folder next to the csv file, "<csv name>.points", and the
+# csv file holds a reference to each file and its number of points instead of the coordinates
+SAVE_POINTS_TO_SIDECAR = False
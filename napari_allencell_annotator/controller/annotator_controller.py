@@ -4,16 +4,26 @@ from napari_allencell_annotator.view.i_viewer import IViewer
 
 from napari_allencell_annotator.model.annotation_model import AnnotatorModel
 from napari_allencell_annotator.model.key import Key
-from napari_allencell_annotator.util.file_utils import FileUtils
+from napari_allencell_annotator.constants.constants import SAVE_POINTS_TO_SIDECAR
+from napari_allencell_annotator.core.session import Session
+from napari_allencell_annotator.util.csv_utils import CSVUtils
+from napari_allencell_annotator.util.parquet_utils import ParquetUtils
+from napari_allencell_annotator.util.sqlite_store import SQLiteAnnotationStore
 from napari_allencell_annotator.util.json_utils import JSONUtils
+from napari_allencell_annotator.util.points_store import PointsStore
 from napari_allencell_annotator.view.annotator_view import (
     AnnotatorView,
     AnnotatorViewMode,
 )
 import napari
 
-from typing import List, Optional
-import csv
+from functools import partial
+from threading import Lock
+from typing import Any, Callable, Optional
+
+from napari.qt.threading import FunctionWorker, create_worker
+
+from napari_allencell_annotator.controller.autosave_scheduler import AutosaveScheduler
 
 
 class AnnotatorController:
@@ -57,23 +67,48 @@ class AnnotatorController:
     read_csv(file_path : str)
         Reads the first line of a csv file into a dictionary and sets annot_json_data.
 
-    write_to_csv()
-        Writes header and annotations to the csv file.
+    write_csv()
+        Writes header and annotations to the csv file and removes its journal.
+
+    write_journal()
+        Appends the annotations that changed since the last save to the journal of the csv file.
+
+    autosave()
+        Saves the annotations that changed since the last save on a worker thread.
     """
 
     def __init__(self, model: AnnotatorModel, viewer: IViewer):
         self._annotation_model = model
+        self._viewer: IViewer = viewer
 
         # open in view mode
         self.view: AnnotatorView = AnnotatorView(model, viewer)
 
         self.view.show()
 
+        # csv file that has been written in full during this annotating session, None if none has been
+        self._written_csv_path: Optional[Path] = None
+        # number of rows appended to the journal of that csv file since it was written
+        self._num_journal_rows: int = 0
+        # held while the csv file or its journal is written, by the main thread or an autosave worker
+        self._save_lock: Lock = Lock()
+        # number of writes to the csv file or its journal, lets an autosave worker tell that a save overtook it
+        self._num_saves: int = 0
+        # worker running an autosave, None if no autosave is running
+        self._autosave_worker: Optional[FunctionWorker] = None
+        # True if an autosave was triggered while another one was running
+        self._autosave_pending: bool = False
+        self._autosave_scheduler: AutosaveScheduler = AutosaveScheduler(self._annotation_model, self.autosave)
+        # whether point annotations are saved to the points store of the csv file instead of in its rows
+        self._save_points_to_sidecar: bool = SAVE_POINTS_TO_SIDECAR
+
         self.view.cancel_btn.clicked.connect(self.stop_viewing)
         # we want to save the annotation for the image that we just switched off of.
         self._annotation_model.image_changed.connect(
             lambda: self._record_annotations(self._annotation_model.get_previous_image_index())
         )
+        # the annotations of an image are rendered once the image is displayed
+        self._annotation_model.image_displayed_changed.connect(self._handle_image_displayed_changed)
 
     def write_json(self, file_path: str):
         """
@@ -112,6 +147,7 @@ class AnnotatorController:
             The files to be used. path -> [name, FMS]
         """
         self.view.set_mode(mode=AnnotatorViewMode.ANNOTATE)
+        self._autosave_scheduler.start()
 
         # self.view.annot_list.currentItemChanged.connect(self._curr_item_changed)
 
@@ -119,7 +155,26 @@ class AnnotatorController:
         """Save current annotation data"""
         # save annotations for file we're on
         self._record_annotations(self._annotation_model.get_curr_img_index())
-        self.write_csv()
+        if self._should_compact():
+            self.write_csv()
+        else:
+            self.write_journal()
+
+    def _should_compact(self) -> bool:
+        """
+        Return whether a save should rewrite the whole csv file rather than append to its journal.
+
+        The csv file is written in full on the first save to it in a session, and again once its journal has as many
+        rows as the csv file, so that a save costs as much as the images changed since the last one. Parquet files
+        and databases have no journal and are always written in full, which for a database holding the annotations is
+        a commit.
+        """
+        save_path: Path = self._annotation_model.get_csv_save_path()
+        if ParquetUtils.is_parquet(save_path) or SQLiteAnnotationStore.is_sqlite(save_path):
+            return True
+        if self._written_csv_path != self._annotation_model.get_csv_save_path():
+            return True
+        return self._num_journal_rows >= len(self._annotation_model.get_annotations())
 
     def stop_annotating(self):
         """Reset values from annotating and change mode to ADD."""
@@ -131,10 +186,14 @@ class AnnotatorController:
             if self._annotation_model.get_image_at(idx) not in self._annotation_model.get_annotations():
                 self._annotation_model.add_annotation(self._annotation_model.get_image_at(idx), [])
 
+        self._autosave_scheduler.stop()
         self.write_csv()
         # reset optional fields in model to None (pre-annottion state)
         self._annotation_model.set_annotation_started(False)
         self._annotation_model.set_csv_save_path(None)
+        self._written_csv_path = None
+        # the annotation widgets are disabled while an image is being opened
+        self.view.annot_list.setEnabled(True)
         self.view.set_mode(AnnotatorViewMode.VIEW)
 
     def _curr_item_changed(self, current, previous):
@@ -166,20 +225,9 @@ class AnnotatorController:
             The current image {'File Path' : 'path', 'Row' : str(rownum)}
         """
         if self._annotation_model.get_annotations() is not None:
-            path: Path = self._annotation_model.get_curr_img()
-            # files_and_annots values are lists File Path ->[File Name, FMS, annot1val, annot2val ...]
-            # if the file has not been annotated the list is just length 2 [File Name, FMS]
-            if (
-                path is None
-                or path not in list(self._annotation_model.get_annotations().keys())
-                or len(self._annotation_model.get_annotations()[path]) == 0
-            ):
-                # if the image is un-annotated render the default values or no image is selected
-                self.view.render_default_values()
-            else:
-                # if the image has been annotated render the values that were entered
-                # dictionary list [2::] is [annot1val, annot2val, ...]
-                self.view.render_values(self._annotation_model.get_annotations()[path])
+            # otherwise the annotations are rendered once the image is displayed
+            if self._annotation_model.is_image_displayed():
+                self._render_curr_img_annotations()
 
             # convert row to int
             self.view.display_current_progress()
@@ -194,22 +242,62 @@ class AnnotatorController:
             else:
                 self.view.prev_btn.setEnabled(True)
 
+    def _render_curr_img_annotations(self) -> None:
+        """Render the annotation values of the current image, or the default values if it has not been annotated."""
+        path: Path = self._annotation_model.get_curr_img()
+        # files_and_annots values are lists File Path ->[File Name, FMS, annot1val, annot2val ...]
+        # if the file has not been annotated the list is just length 2 [File Name, FMS]
+        if (
+            path is None
+            or path not in self._annotation_model.get_annotations()
+            or len(self._annotation_model.get_annotations()[path]) == 0
+        ):
+            # if the image is un-annotated render the default values or no image is selected
+            self.view.render_default_values()
+        else:
+            # if the image has been annotated render the values that were entered
+            # dictionary list [2::] is [annot1val, annot2val, ...]
+            self.view.render_values(self._annotation_model.get_annotations()[path])
+
+    def _handle_image_displayed_changed(self, displayed: bool) -> None:
+        """
+        Render the annotation values of the current image once it is displayed, which creates the points layers of
+        its point annotations with the dimensionality of the image. While annotating, the annotation widgets are
+        disabled until then.
+
+        Parameters
+        ----------
+        displayed : bool
+            Whether the current image is displayed
+        """
+        self.view.annot_list.setEnabled(displayed or not self._annotation_model.is_annotation_started())
+        if displayed and self._annotation_model.get_annotations() is not None:
+            self._render_curr_img_annotations()
+
     def _record_annotations(self, record_idx: int) -> None:
         """
         Add the image's annotation values to the annotation dictionary
 
+        The values are only recorded if the image was displayed, since they are rendered into the annotation widgets
+        and points layers once it is. An image that is still being opened, or could not be opened, keeps the
+        annotations it had.
+
         Parameters
         ----------
         record_idx : int
             The index of the image we should save annotations for
         """
         if (
-            record_idx != -1 and self._annotation_model.is_annotation_started()
+            record_idx != -1
+            and self._annotation_model.is_annotation_started()
+            and self._annotation_model.is_image_displayed()
         ):  # ignore recording annotations when loading first image or just starting out
             # we're saving annotation for the image we just switched off of.
             self._annotation_model.add_annotation(
                 self._annotation_model.get_all_images()[record_idx], self.view.get_curr_annots()
             )
+            # annotations kept in a database are committed once per image switched off of
+            self._annotation_model.commit_annotations()
             # self._annotation_model.clear_all_cur_img_points_layers()
 
         # if the user changes to another image, send the annotation_recorded signal to clear all layers and
@@ -247,18 +335,132 @@ class AnnotatorController:
         self._annotation_model.set_annotation_keys(json_dict)
 
     def write_csv(self):
-        # TODO put into csv utils class
-        """write headers and file info"""
-        file = open(self._annotation_model.get_csv_save_path(), "w")
-        writer = csv.writer(file)
-        writer.writerow(["Shuffled:", self._annotation_model.is_images_shuffled()])
-        header: List[str] = ["Annotations:", JSONUtils.dict_to_json_dump(self._annotation_model.get_annotation_keys())]
-        writer.writerow(header)
-
-        header = ["File Name", "File Path"]
-        for name in self.view.annots_order:
-            header.append(name)
-        writer.writerow(header)
-        for path, annotations in self._annotation_model.get_annotations().items():
-            writer.writerow([FileUtils.get_file_name(path), str(path)] + annotations)
-        file.close()
+        """Write headers and every image's annotations to the csv file, and remove its journal."""
+        with self._save_lock:
+            self._write_csv_locked(
+                self._annotation_model.get_csv_save_path(),
+                self._annotation_model.is_images_shuffled(),
+                self._annotation_model.get_annotation_keys(),
+                list(self.view.annots_order),
+                self._annotation_model.get_annotations(),
+            )
+        self._annotation_model.clear_dirty_annotations()
+
+    def write_journal(self):
+        """Append the annotations that changed since the last save to the journal of the csv file."""
+        dirty_annotations: dict[Path, list[Any]] = self._annotation_model.get_dirty_annotations()
+        if len(dirty_annotations) == 0:
+            return
+        with self._save_lock:
+            self._append_journal_locked(self._annotation_model.get_csv_save_path(), dirty_annotations)
+        self._annotation_model.clear_dirty_annotations()
+
+    def _write_csv_locked(
+        self,
+        csv_path: Path,
+        shuffled: bool,
+        annotation_keys: dict[str, Key],
+        annots_order: list[str],
+        annotations: dict[Path, list[Any]],
+    ) -> None:
+        """
+        Write the csv file (or parquet file or database) in full, remove its journal and the points store files it no
+        longer references. The caller must hold the save lock.
+        """
+        Session.write(csv_path, shuffled, annotation_keys, annots_order, annotations, self._get_points_dir(csv_path))
+        self._written_csv_path = csv_path
+        self._num_journal_rows = 0
+        self._num_saves += 1
+
+    def _append_journal_locked(self, csv_path: Path, annotations: dict[Path, list[Any]]) -> None:
+        """Append rows to the journal of the csv file. The caller must hold the save lock."""
+        CSVUtils.append_journal(CSVUtils.get_journal_path(csv_path), annotations, self._get_points_dir(csv_path))
+        self._num_journal_rows += len(annotations)
+        self._num_saves += 1
+
+    def _get_points_dir(self, csv_path: Path) -> Optional[Path]:
+        """Return the points store to save point annotations to, None if they are saved in the csv rows."""
+        if self._save_points_to_sidecar:
+            return PointsStore.get_points_dir(csv_path)
+        return None
+
+    def autosave(self) -> None:
+        """
+        Save the annotations that changed since the last save on a worker thread.
+
+        The changed annotations are collected on the calling thread and written by the worker, in full or to the
+        journal as a save from the Save button would be. Only one autosave runs at a time, one triggered while another
+        is running starts once it is done. The annotations stay marked as changed until the write succeeds, and a
+        failed write is reported through the viewer.
+        """
+        if self._autosave_worker is not None:
+            self._autosave_pending = True
+            return
+        if not self._annotation_model.is_annotation_started() or self._annotation_model.get_csv_save_path() is None:
+            return
+
+        dirty_annotations: dict[Path, list[Any]] = self._annotation_model.get_dirty_annotations()
+        if len(dirty_annotations) == 0:
+            return
+
+        csv_path: Path = self._annotation_model.get_csv_save_path()
+        if SQLiteAnnotationStore.is_sqlite(csv_path):
+            # a database holding the annotations is saved by a commit, which is quick, and its connection belongs to
+            # this thread
+            self.write_csv()
+            return
+
+        write: Callable[[], None]
+        if self._should_compact():
+            # snapshot everything the worker writes, the model keeps changing on this thread meanwhile
+            annotations: dict[Path, list[Any]] = dict(self._annotation_model.get_annotations())
+            shuffled: bool = self._annotation_model.is_images_shuffled()
+            annotation_keys: dict[str, Key] = dict(self._annotation_model.get_annotation_keys())
+            annots_order: list[str] = list(self.view.annots_order)
+            write = partial(self._write_csv_locked, csv_path, shuffled, annotation_keys, annots_order, annotations)
+        else:
+            write = partial(self._append_journal_locked, csv_path, dirty_annotations)
+
+        self._autosave_worker = create_worker(
+            self._run_autosave,
+            write,
+            self._num_saves,
+            _connect={"errored": self._handle_autosave_failed},
+            _start_thread=False,
+        )
+        self._autosave_worker.returned.connect(
+            lambda written: self._handle_autosave_written(written, dirty_annotations)
+        )
+        self._autosave_worker.finished.connect(self._handle_autosave_finished)
+        self._autosave_worker.start()
+
+    def _run_autosave(self, write: Callable[[], None], num_saves: int) -> bool:
+        """
+        Run an autosave write on the worker thread. Returns False without writing if another save was written after
+        the autosave was started, since the autosave was prepared for the csv file and journal as they were before.
+
+        Parameters
+        ----------
+        write: Callable[[], None]
+            The write to run while holding the save lock
+        num_saves: int
+            The number of saves when the autosave was started
+        """
+        with self._save_lock:
+            if self._num_saves != num_saves:
+                return False
+            write()
+            return True
+
+    def _handle_autosave_written(self, written: bool, saved: dict[Path, list[Any]]) -> None:
+        if written:
+            self._annotation_model.clear_dirty_annotations(saved)
+
+    def _handle_autosave_failed(self, error: Exception) -> None:
+        self._viewer.alert(f"Autosave failed, your changes have not been saved: {error}")
+
+    def _handle_autosave_finished(self) -> None:
+        self._autosave_worker = None
+        if self._autosave_pending:
+            self._autosave_pending = False
+            self.autosave()
@@ -0,0 +1,79 @@
+from typing import Callable
+
+from qtpy.QtCore import QObject, QTimer
+
+from napari_allencell_annotator.constants.constants import AUTOSAVE_CHANGE_THRESHOLD, AUTOSAVE_INTERVAL_SECONDS
+from napari_allencell_annotator.model.annotation_model import AnnotatorModel
+
+
+class AutosaveScheduler(QObject):
+    """
+    Decides when changed annotations are saved without the user pressing Save.
+
+    A save is triggered interval_seconds after the first change that has not been saved, or as soon as there are
+    change_threshold of them, whichever comes first.
+
+    Attributes
+    ----------
+    interval_seconds: float
+        The longest time a change waits before it is saved
+    change_threshold: int
+        The number of changes that triggers a save right away
+
+    Methods
+    -------
+    start() -> None
+        Starts counting annotation changes.
+    stop() -> None
+        Stops counting annotation changes and cancels the pending save.
+    flush() -> None
+        Triggers the pending save now.
+    """
+
+    def __init__(
+        self,
+        annotator_model: AnnotatorModel,
+        save: Callable[[], None],
+        interval_seconds: float = AUTOSAVE_INTERVAL_SECONDS,
+        change_threshold: int = AUTOSAVE_CHANGE_THRESHOLD,
+    ):
+        super().__init__()
+        self._annotator_model: AnnotatorModel = annotator_model
+        self._save: Callable[[], None] = save
+        self.interval_seconds: float = interval_seconds
+        self.change_threshold: int = change_threshold
+
+        self._num_changes: int = 0
+        self._running: bool = False
+        self._timer: QTimer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+        self._annotator_model.annotation_changed.connect(self._handle_annotation_changed)
+
+    def start(self) -> None:
+        """Start counting annotation changes."""
+        self._running = True
+        self._num_changes = 0
+
+    def stop(self) -> None:
+        """Stop counting annotation changes and cancel the pending save."""
+        self._running = False
+        self._num_changes = 0
+        self._timer.stop()
+
+    def flush(self) -> None:
+        """Trigger the pending save now, if there is one."""
+        self._timer.stop()
+        if self._num_changes > 0:
+            self._num_changes = 0
+            self._save()
+
+    def _handle_annotation_changed(self) -> None:
+        if not self._running:
+            return
+        self._num_changes += 1
+        if self._num_changes >= self.change_threshold:
+            self.flush()
+        elif not self._timer.isActive():
+            self._timer.start(int(self.interval_seconds * 1000))
@@ -0,0 +1,388 @@
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from napari_allencell_annotator.core.session import Session
+from napari_allencell_annotator.model.combo_key import ComboKey
+from napari_allencell_annotator.util.json_utils import JSONUtils
+from napari_allencell_annotator.util.points_store import PointsReference
+
+# code of a categorical annotation that was not made
+_MISSING: int = -1
+# number of images whose points a worker process matches at a time
+_POINT_CHUNK_SIZE: int = 5000
+
+
+class KeyAgreement:
+    """
+    The agreement between annotators on one annotation.
+
+    Attributes
+    ----------
+    name: str
+        The name of the annotation
+    statistic: str
+        What value measures: "cohen_kappa" or "fleiss_kappa" for checkbox and dropdown annotations,
+        "mean_variance" for number annotations and "point_match_rate" for point annotations, the fraction of
+        points with a point of each other annotator within the match distance
+    value: float
+        The statistic over every image, nan if no image was annotated by two annotators
+    disagreement: np.ndarray
+        The disagreement on each image, from 0 (every annotator agrees) to 1, nan for images annotated by fewer
+        than two annotators
+    """
+
+    def __init__(self, name: str, statistic: str, value: float, disagreement: np.ndarray):
+        self.name: str = name
+        self.statistic: str = statistic
+        self.value: float = value
+        self.disagreement: np.ndarray = disagreement
+
+
+class AgreementReport:
+    """
+    The agreement between the annotators of the same images.
+
+    Attributes
+    ----------
+    images: list[Path]
+        The images, in the order they first appear in the sessions
+    num_annotators: int
+        The number of annotators
+    keys: list[KeyAgreement]
+        The agreement on each annotation that agreement can be measured on. Text annotations are left out.
+    """
+
+    def __init__(self, images: list[Path], num_annotators: int, keys: list[KeyAgreement]):
+        self.images: list[Path] = images
+        self.num_annotators: int = num_annotators
+        self.keys: list[KeyAgreement] = keys
+
+    def get_disagreement(self) -> np.ndarray:
+        """
+        Return the disagreement on each image, the mean of its disagreement on each annotation, nan for images no
+        annotation of which was made by two annotators.
+        """
+        if len(self.keys) == 0:
+            return np.full(len(self.images), np.nan)
+        disagreement: np.ndarray = np.stack([key.disagreement for key in self.keys], axis=1)
+        rated: np.ndarray = ~np.isnan(disagreement)
+        num_rated: np.ndarray = rated.sum(axis=1)
+        total: np.ndarray = np.where(rated, disagreement, 0).sum(axis=1)
+        return np.divide(total, num_rated, out=np.full(len(self.images), np.nan), where=num_rated > 0)
+
+    def get_review_queue(self) -> list[tuple[Path, float]]:
+        """
+        Return the images to review and their disagreement, the images annotators disagree on the most first.
+        Images annotators all agree on are left out, as are images no annotation of which was made by two
+        annotators.
+        """
+        disagreement: np.ndarray = self.get_disagreement()
+        # nan > 0 is False, so images without a disagreement are left out too
+        indices: np.ndarray = np.flatnonzero(disagreement > 0)
+        # a stable sort keeps images with the same disagreement in the order of the sessions
+        indices = indices[np.argsort(-disagreement[indices], kind="stable")]
+        return [(self.images[index], float(disagreement[index])) for index in indices]
+
+
+class Agreement:
+    """
+    Measures how much annotators agree, from the sessions each of them annotated the same images in.
+
+    Each annotation's values are aligned by image path into an images x annotators array, and the agreement on it is
+    computed from that array with NumPy: Cohen's kappa (two annotators) or Fleiss' kappa (more) for checkbox and
+    dropdown annotations, the variance of the values for number annotations and nearest neighbour matching for point
+    annotations.
+    """
+
+    @staticmethod
+    def compute(sessions: list[Session], match_distance: float = 5.0, workers: int = 1) -> AgreementReport:
+        """
+        Measure the agreement between the annotators of sessions, one session per annotator.
+
+        Parameters
+        ----------
+        sessions: list[Session]
+            The sessions
+        match_distance: float
+            The distance in pixels within which points of two annotators are the same point
+        workers: int
+            The number of worker processes the points of large sessions are matched across
+
+        Raises
+        ------
+        ValueError
+            If there are fewer than two sessions or their annotation templates differ
+        """
+        if len(sessions) < 2:
+            raise ValueError("Agreement needs the sessions of at least two annotators")
+        template: str = JSONUtils.dict_to_json_dump(sessions[0].annotation_keys)
+        for session in sessions[1:]:
+            if JSONUtils.dict_to_json_dump(session.annotation_keys) != template:
+                raise ValueError("Sessions with different annotation templates cannot be compared")
+
+        images: list[Path] = list(dict.fromkeys(path for session in sessions for path in session.annotations))
+        num_keys: int = len(sessions[0].annotation_keys)
+        # the annotation values of each annotator for each image, None where the annotator did not annotate it
+        rows: list[list[Optional[list[Any]]]] = []
+        for session in sessions:
+            annotations: MutableMapping = session.annotations
+            rows.append(
+                [
+                    values if values is not None and len(values) == num_keys else None
+                    for values in (annotations.get(path) for path in images)
+                ]
+            )
+
+        keys: list[KeyAgreement] = []
+        for index, (name, key) in enumerate(sessions[0].annotation_keys.items()):
+            column: list[list[Any]] = [
+                [None if values is None else values[index] for values in annotator_rows] for annotator_rows in rows
+            ]
+            key_type: str = key.get_type()
+            if key_type in ("bool", "list"):
+                options: list[str] = key.get_options() if isinstance(key, ComboKey) else ["False", "True"]
+                keys.append(Agreement._categorical_agreement(name, Agreement._encode_categories(column, options)))
+            elif key_type == "number":
+                keys.append(Agreement._number_agreement(name, Agreement._encode_numbers(column)))
+            elif key_type == "point":
+                keys.append(Agreement._point_agreement(name, column, match_distance, workers))
+        return AgreementReport(images, len(sessions), keys)
+
+    @staticmethod
+    def cohen_kappa(codes: np.ndarray) -> float:
+        """
+        Return Cohen's kappa between two annotators.
+
+        Parameters
+        ----------
+        codes: np.ndarray
+            The category each annotator chose for each image, an images x 2 array of integers, -1 where the
+            annotator did not annotate the image
+
+        Returns
+        -------
+        float
+            Cohen's kappa over the images both annotators annotated, nan if there are none
+        """
+        both: np.ndarray = (codes >= 0).all(axis=1)
+        first: np.ndarray = codes[both, 0]
+        second: np.ndarray = codes[both, 1]
+        num_images: int = len(first)
+        if num_images == 0:
+            return np.nan
+        num_categories: int = int(codes.max()) + 1
+        confusion: np.ndarray = np.bincount(
+            first * num_categories + second, minlength=num_categories * num_categories
+        ).reshape(num_categories, num_categories)
+        observed: float = np.trace(confusion) / num_images
+        expected: float = float(confusion.sum(axis=1) @ confusion.sum(axis=0)) / num_images**2
+        return Agreement._kappa(observed, expected)
+
+    @staticmethod
+    def fleiss_kappa(counts: np.ndarray) -> float:
+        """
+        Return Fleiss' kappa between annotators, generalised to images annotated by different numbers of
+        annotators.
+
+        Parameters
+        ----------
+        counts: np.ndarray
+            The number of annotators that chose each category for each image, an images x categories array
+
+        Returns
+        -------
+        float
+            Fleiss' kappa over the images at least two annotators annotated, nan if there are none
+        """
+        num_raters: np.ndarray = counts.sum(axis=1)
+        counts = counts[num_raters >= 2]
+        num_raters = num_raters[num_raters >= 2]
+        if len(counts) == 0:
+            return np.nan
+        observed: float = float(Agreement._pair_agreement(counts, num_raters).mean())
+        proportions: np.ndarray = counts.sum(axis=0) / num_raters.sum()
+        return Agreement._kappa(observed, float(proportions @ proportions))
+
+    @staticmethod
+    def _kappa(observed: float, expected: float) -> float:
+        """Return the kappa of an observed and a chance agreement."""
+        if expected >= 1:
+            # every annotator chose the same category for every image
+            return 1.0
+        return (observed - expected) / (1 - expected)
+
+    @staticmethod
+    def _pair_agreement(counts: np.ndarray, num_raters: np.ndarray) -> np.ndarray:
+        """Return the fraction of pairs of annotators of each image that chose the same category."""
+        return ((counts * counts).sum(axis=1) - num_raters) / (num_raters * (num_raters - 1))
+
+    @staticmethod
+    def _encode_categories(column: list[list[Any]], options: list[str]) -> np.ndarray:
+        """
+        Return the categories annotators chose, an images x annotators array of integers with -1 for annotations
+        that were not made. Values outside the options, which validation reports, are categories of their own.
+        """
+        categories: dict[str, int] = {option: code for code, option in enumerate(options)}
+        codes: np.ndarray = np.empty((len(column[0]), len(column)), dtype=np.int64)
+        for annotator, values in enumerate(column):
+            # a csv file has checkbox values as "True" and "False", a parquet file or a database as booleans
+            codes[:, annotator] = [
+                (
+                    _MISSING
+                    if value is None or (isinstance(value, str) and value == "")
+                    else categories.setdefault(str(value), len(categories))
+                )
+                for value in values
+            ]
+        return codes
+
+    @staticmethod
+    def _encode_numbers(column: list[list[Any]]) -> np.ndarray:
+        """Return the numbers annotators entered, an images x annotators array with nan for annotations not made."""
+        numbers: np.ndarray = np.empty((len(column[0]), len(column)))
+        for annotator, values in enumerate(column):
+            numbers[:, annotator] = [Agreement._to_number(value) for value in values]
+        return numbers
+
+    @staticmethod
+    def _to_number(value: Any) -> float:
+        if value is None or isinstance(value, bool):
+            return np.nan
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+
+    @staticmethod
+    def _categorical_agreement(name: str, codes: np.ndarray) -> KeyAgreement:
+        num_images, num_annotators = codes.shape
+        num_categories: int = int(codes.max(initial=0)) + 1
+        rated: np.ndarray = codes >= 0
+        # count the annotators that chose each category of each image in one pass over the flattened array
+        rows: np.ndarray = np.broadcast_to(np.arange(num_images)[:, None], codes.shape)
+        counts: np.ndarray = np.bincount(
+            rows[rated] * num_categories + codes[rated], minlength=num_images * num_categories
+        ).reshape(num_images, num_categories)
+        num_raters: np.ndarray = rated.sum(axis=1)
+
+        disagreement: np.ndarray = np.full(num_images, np.nan)
+        compared: np.ndarray = num_raters >= 2
+        disagreement[compared] = 1 - Agreement._pair_agreement(counts[compared], num_raters[compared])
+        if num_annotators == 2:
+            return KeyAgreement(name, "cohen_kappa", Agreement.cohen_kappa(codes), disagreement)
+        return KeyAgreement(name, "fleiss_kappa", Agreement.fleiss_kappa(counts), disagreement)
+
+    @staticmethod
+    def _number_agreement(name: str, numbers: np.ndarray) -> KeyAgreement:
+        rated: np.ndarray = ~np.isnan(numbers)
+        num_raters: np.ndarray = rated.sum(axis=1)
+        compared: np.ndarray = num_raters >= 2
+        values: np.ndarray = np.where(rated, numbers, 0)[compared]
+        num_compared: np.ndarray = num_raters[compared]
+        means: np.ndarray = values.sum(axis=1) / num_compared
+        deviations: np.ndarray = np.where(rated[compared], values - means[:, None], 0)
+        variances: np.ndarray = (deviations * deviations).sum(axis=1) / num_compared
+
+        # a spread of values as wide as that of the annotation over every image is a disagreement of 0.5
+        spread: float = float(np.std(numbers[rated])) if rated.any() else 0.0
+        deviation: np.ndarray = np.sqrt(variances)
+        disagreement: np.ndarray = np.full(len(numbers), np.nan)
+        disagreement[compared] = np.divide(
+            deviation, deviation + spread, out=np.zeros_like(deviation), where=deviation + spread > 0
+        )
+        value: float = float(variances.mean()) if len(variances) > 0 else np.nan
+        return KeyAgreement(name, "mean_variance", value, disagreement)
+
+    @staticmethod
+    def _point_agreement(name: str, column: list[list[Any]], match_distance: float, workers: int) -> KeyAgreement:
+        # the point annotations of every annotator, per image
+        images: list[tuple[Any, ...]] = list(zip(*column))
+        if workers <= 1 or len(images) < 2 * _POINT_CHUNK_SIZE:
+            results: list[tuple[np.ndarray, int, int]] = [Agreement._match_images(images, match_distance)]
+        else:
+            chunks: list[list[tuple[Any, ...]]] = [
+                images[start : start + _POINT_CHUNK_SIZE] for start in range(0, len(images), _POINT_CHUNK_SIZE)
+            ]
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+                results = list(executor.map(Agreement._match_images, chunks, [match_distance] * len(chunks)))
+
+        disagreement: np.ndarray = np.concatenate([result[0] for result in results])
+        num_matched: int = sum(result[1] for result in results)
+        num_points: int = sum(result[2] for result in results)
+        value: float = np.nan
+        if num_points > 0:
+            value = num_matched / num_points
+        elif not np.isnan(disagreement).all():
+            # the images annotators compared on had no points
+            value = 1.0
+        return KeyAgreement(name, "point_match_rate", value, disagreement)
+
+    @staticmethod
+    def _match_images(images: list[tuple[Any, ...]], match_distance: float) -> tuple[np.ndarray, int, int]:
+        """
+        Match the points annotators placed on images. Runs in a worker process for large sessions.
+
+        Returns
+        -------
+        tuple[np.ndarray, int, int]
+            The disagreement on each image, the number of points matched by another annotator and the number of
+            points times the other annotators they could be matched by
+        """
+        disagreement: np.ndarray = np.full(len(images), np.nan)
+        num_matched: int = 0
+        num_points: int = 0
+        for image, values in enumerate(images):
+            point_sets: list[np.ndarray] = [
+                points for points in (Agreement._to_points(value) for value in values) if points is not None
+            ]
+            if len(point_sets) < 2:
+                continue
+            matched: Optional[np.ndarray] = Agreement._match_points(point_sets, match_distance)
+            if matched is None:
+                # none of the annotators placed a point
+                disagreement[image] = 0
+                continue
+            # the fraction of the other annotators with a point within the match distance of each point
+            match_fraction: np.ndarray = matched.sum(axis=1) / (len(point_sets) - 1)
+            disagreement[image] = 1 - match_fraction.mean()
+            num_matched += int(matched.sum())
+            num_points += matched.shape[0] * (len(point_sets) - 1)
+        return disagreement, num_matched, num_points
+
+    @staticmethod
+    def _match_points(point_sets: list[np.ndarray], match_distance: float) -> Optional[np.ndarray]:
+        """
+        Return, for each point placed by any annotator, whether each other annotator that placed points placed one
+        within the match distance of it, None if no annotator placed a point.
+        """
+        placed: list[np.ndarray] = [points for points in point_sets if len(points) > 0]
+        if len(placed) == 0:
+            return None
+        if len({points.shape[1] for points in placed}) > 1:
+            # points of different dimensions never match
+            return np.zeros((sum(len(points) for points in placed), 1), dtype=bool)
+        points: np.ndarray = np.concatenate(placed)
+        annotators: np.ndarray = np.repeat(np.arange(len(placed)), [len(points) for points in placed])
+        differences: np.ndarray = points[:, None, :] - points[None, :, :]
+        # squared distances, compared with the squared match distance
+        distances: np.ndarray = (differences * differences).sum(axis=-1)
+        # a point is not matched by the annotator that placed it
+        distances[annotators[:, None] == annotators[None, :]] = np.inf
+        starts: np.ndarray = np.concatenate([[0], np.cumsum([len(points) for points in placed])[:-1]])
+        # the squared distance from each point to the nearest point of each annotator
+        nearest: np.ndarray = np.minimum.reduceat(distances, starts, axis=1)
+        return nearest <= match_distance * match_distance
+
+    @staticmethod
+    def _to_points(value: Any) -> Optional[np.ndarray]:
+        """Return the points of a point annotation as an (n, ndim) array, None if the annotation was not made."""
+        if value is None or (isinstance(value, str) and value == ""):
+            return None
+        if isinstance(value, PointsReference):
+            value = value.load()
+        points: np.ndarray = np.asarray(value, dtype=np.float64)
+        return points.reshape(len(points), -1) if len(points) > 0 else points.reshape(0, 0)
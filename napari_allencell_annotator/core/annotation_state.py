@@ -0,0 +1,114 @@
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Optional
+
+from napari_allencell_annotator.core.events import Event
+from napari_allencell_annotator.model.key import Key
+from napari_allencell_annotator.util.points_utils import PointsUtils
+from napari_allencell_annotator.util.sqlite_store import SQLiteAnnotationStore
+
+
+class AnnotationState:
+    """
+    The annotation template and the annotation values of each image, with the images whose values changed since they
+    were last saved. It holds no viewer or widget state, so it can be used in scripts and worker processes, and the
+    Qt AnnotatorModel wraps it.
+
+    Attributes
+    ----------
+    annotation_changed: Event
+        Emitted with the image path and its annotation values when the annotation values of an image change
+    """
+
+    def __init__(self):
+        self.annotation_changed: Event = Event()
+        # dict of annotation key names -> Key objects containing information about that key
+        # such as default values, options, type
+        self._annotation_keys: dict[str, Key] = {}
+        # image path -> list of annotation values, or a SQLiteAnnotationStore mapping them the same way. None until
+        # annotations are set.
+        self._annotations: Optional[MutableMapping] = None
+        # images whose annotations changed since they were last saved
+        self._dirty_annotations: set[Path] = set()
+
+    def get_annotation_keys(self) -> dict[str, Key]:
+        return self._annotation_keys
+
+    def set_annotation_keys(self, annotation_keys: dict[str, Key]) -> None:
+        self._annotation_keys = annotation_keys
+
+    def clear_annotation_keys(self) -> None:
+        self._annotation_keys.clear()
+
+    def get_annotations(self) -> Optional[MutableMapping]:
+        return self._annotations
+
+    def set_annotations(self, annotations: Optional[MutableMapping]) -> None:
+        self._annotations = annotations
+        self._dirty_annotations = set()
+
+    def add_annotation(self, file_path: Path, annotation: list[Any]) -> bool:
+        """
+        Set the annotation values of an image, and mark them as changed if they differ from the ones it had.
+
+        Parameters
+        ----------
+        file_path: Path
+            The path to the image
+        annotation: list[Any]
+            The annotation values
+
+        Returns
+        -------
+        bool
+            Whether the annotation values changed
+        """
+        if file_path in self._annotations and PointsUtils.annotations_equal(self._annotations[file_path], annotation):
+            return False
+        self._annotations[file_path] = annotation
+        self._dirty_annotations.add(file_path)
+        self.annotation_changed.emit(file_path, annotation)
+        return True
+
+    def commit_annotations(self) -> None:
+        """Commit the annotations added since the last commit, if they are kept in a SQLiteAnnotationStore."""
+        if isinstance(self._annotations, SQLiteAnnotationStore):
+            self._annotations.commit()
+
+    def is_annotation_complete(self, annotation: Optional[list[Any]]) -> bool:
+        """
+        Return whether an image's annotation values hold a value for every annotation key, none of them None or an
+        empty string.
+
+        Parameters
+        ----------
+        annotation: Optional[list[Any]]
+            The annotation values of the image, None if it has not been annotated
+        """
+        if not annotation or len(annotation) != len(self._annotation_keys):
+            return False
+        for value in annotation:
+            if value is None or (isinstance(value, str) and value == ""):
+                return False
+        return True
+
+    def get_dirty_annotations(self) -> dict[Path, list[Any]]:
+        """Return the annotations of the images whose annotations changed since they were last saved."""
+        return {path: self._annotations[path] for path in self._dirty_annotations}
+
+    def clear_dirty_annotations(self, saved: Optional[dict[Path, list[Any]]] = None) -> None:
+        """
+        Mark images' annotations as saved.
+
+        Parameters
+        ----------
+        saved: Optional[dict[Path, list[Any]]]
+            The annotations that were saved, as returned by get_dirty_annotations. Images whose annotations have
+            changed again since are still marked as changed. If None, every image's annotations are marked as saved.
+        """
+        if saved is None:
+            self._dirty_annotations = set()
+        else:
+            for path, annotation in saved.items():
+                if self._annotations.get(path) is annotation:
+                    self._dirty_annotations.discard(path)
@@ -0,0 +1,44 @@
+from typing import Any, Callable
+
+
+class Event:
+    """
+    A lightweight observer, the Qt-free counterpart of a Signal: the callbacks connected to an event are called, in the
+    order they were connected, each time it is emitted.
+
+    Methods
+    -------
+    connect(callback: Callable[..., Any])
+        Calls callback each time the event is emitted.
+    disconnect(callback: Callable[..., Any])
+        Stops calling callback when the event is emitted.
+    emit(*args: Any)
+        Calls every connected callback with args.
+    """
+
+    def __init__(self):
+        self._callbacks: list[Callable[..., Any]] = []
+
+    def connect(self, callback: Callable[..., Any]) -> None:
+        self._callbacks.append(callback)
+
+    def disconnect(self, callback: Callable[..., Any]) -> None:
+        """
+        Stop calling a callback when the event is emitted.
+
+        Parameters
+        ----------
+        callback: Callable[..., Any]
+            The callback
+
+        Raises
+        ------
+        ValueError
+            If the callback is not connected
+        """
+        self._callbacks.remove(callback)
+
+    def emit(self, *args: Any) -> None:
+        # a callback may disconnect itself while the event is emitted
+        for callback in list(self._callbacks):
+            callback(*args)
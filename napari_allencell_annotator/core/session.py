@@ -0,0 +1,381 @@
+import sqlite3
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import numpy as np
+
+from napari_allencell_annotator.model.combo_key import ComboKey
+from napari_allencell_annotator.model.key import Key
+from napari_allencell_annotator.util.csv_utils import CSVUtils
+from napari_allencell_annotator.util.json_utils import JSONUtils
+from napari_allencell_annotator.util.parquet_utils import ParquetUtils
+from napari_allencell_annotator.util.points_store import PointsReference, PointsStore
+from napari_allencell_annotator.util.points_utils import PointsUtils
+from napari_allencell_annotator.util.sqlite_store import SQLiteAnnotationStore
+
+
+class Session:
+    """
+    An annotating session saved to a csv, parquet or database file: the annotation template, whether the images are
+    shuffled and the annotation values of each image, in the order of the images.
+
+    Sessions are loaded, validated, merged and saved without a viewer or Qt, so they can be processed in scripts and
+    in process pools.
+
+    Attributes
+    ----------
+    annotation_keys: dict[str, Key]
+        The annotation template, in the order of the annotation values
+    annotations: MutableMapping
+        Image path -> annotation values, an empty list for images that have not been annotated
+    shuffled: bool
+        Whether the images are shuffled
+    load_problems: list[str]
+        The problems found while loading the session, such as rows of a csv file that was not completely saved
+    """
+
+    def __init__(self, annotation_keys: dict[str, Key], annotations: MutableMapping, shuffled: bool = False):
+        self.annotation_keys: dict[str, Key] = annotation_keys
+        self.annotations: MutableMapping = annotations
+        self.shuffled: bool = shuffled
+        self.load_problems: list[str] = []
+
+    @staticmethod
+    def load(file_path: Path) -> "Session":
+        """
+        Load a session from a csv file and its journal, a parquet file or a database.
+
+        Point annotations are read as (n, ndim) float32 arrays, or as PointsReferences for those saved to the points
+        store of a csv file. The annotations of a database are not read into memory.
+
+        Parameters
+        ----------
+        file_path: Path
+            The path to the file
+
+        Raises
+        ------
+        ValueError
+            If the file is not a session file or its header cannot be read
+        OSError
+            If the file cannot be read
+        ImportError
+            If the file is a parquet file and pyarrow is not installed
+        """
+        if ParquetUtils.is_parquet(file_path):
+            shuffled, annotations_json, images = ParquetUtils.read_parquet(file_path)
+            return Session(JSONUtils.json_dump_to_dict(annotations_json), dict(images), shuffled)
+
+        if SQLiteAnnotationStore.is_sqlite(file_path):
+            if not file_path.exists():
+                # connecting would create an empty database
+                raise FileNotFoundError(f"No such file: {file_path}")
+            try:
+                store: SQLiteAnnotationStore = SQLiteAnnotationStore(file_path)
+                shuffled, annotations_json = store.get_session()
+            except sqlite3.Error as error:
+                raise ValueError(f"{file_path.name} is not an annotation database: {error}") from error
+            return Session(JSONUtils.json_dump_to_dict(annotations_json), store, shuffled)
+
+        if file_path.suffix != ".csv":
+            raise ValueError(f"{file_path.name} is not a csv, parquet or database file")
+
+        header: list[str]
+        shuffled, annotations_json, header = CSVUtils.read_csv_header(file_path)
+        annotation_keys: dict[str, Key] = JSONUtils.json_dump_to_dict(annotations_json)
+        annotations: dict[Path, list[Any]] = {}
+        num_skipped: int = 0
+        num_unreadable: int = 0
+        for images, batch_num_skipped, batch_num_unreadable in Session.iter_csv_images(
+            file_path, len(header), Session.get_point_columns(annotation_keys), True
+        ):
+            for path, values in images:
+                annotations[path] = [] if values is None else values
+            num_skipped += batch_num_skipped
+            num_unreadable += batch_num_unreadable
+
+        session: Session = Session(annotation_keys, annotations, shuffled)
+        if num_skipped > 0:
+            session.load_problems.append(
+                f"{file_path.name} was not completely saved, {num_skipped} incomplete row(s) were skipped"
+            )
+        if num_unreadable > 0:
+            session.load_problems.append(
+                f"The point annotations of {num_unreadable} image(s) in {file_path.name} could not be read, those "
+                "images were loaded without annotations"
+            )
+        return session
+
+    @staticmethod
+    def write(
+        file_path: Path,
+        shuffled: bool,
+        annotation_keys: dict[str, Key],
+        annots_order: list[str],
+        annotations: MutableMapping,
+        points_dir: Optional[Path] = None,
+    ) -> set[str]:
+        """
+        Write a session in full to a csv, parquet or database file, going by its extension.
+
+        A csv file's journal is removed, along with the files of its points store it no longer references.
+
+        Parameters
+        ----------
+        file_path: Path
+            The path to the file
+        shuffled: bool
+            Whether the images are shuffled
+        annotation_keys: dict[str, Key]
+            The annotation template
+        annots_order: list[str]
+            The names of the annotations, in the order of the annotation values
+        annotations: MutableMapping
+            The annotation values of each image
+        points_dir: Optional[Path]
+            The points store to save the point annotations of a csv file to, None to write them in the csv file
+
+        Returns
+        -------
+        set[str]
+            The names of the points store files the csv file references
+        """
+        if ParquetUtils.is_parquet(file_path):
+            # point annotations are saved in the parquet file itself
+            ParquetUtils.write_parquet(file_path, shuffled, annotation_keys, annots_order, annotations)
+            return set()
+        if SQLiteAnnotationStore.is_sqlite(file_path):
+            SQLiteAnnotationStore.write_session(file_path, shuffled, annotation_keys, annots_order, annotations)
+            return set()
+
+        referenced: set[str] = CSVUtils.write_csv(
+            file_path, shuffled, annotation_keys, annots_order, annotations, points_dir
+        )
+        CSVUtils.remove_journal(CSVUtils.get_journal_path(file_path))
+        # the csv file may have been saved with a points store before, even if this save does not use one
+        PointsStore.remove_unreferenced(PointsStore.get_points_dir(file_path), referenced)
+        return referenced
+
+    def save(self, file_path: Path, points_dir: Optional[Path] = None) -> None:
+        """
+        Save the session to a csv, parquet or database file, going by its extension.
+
+        Parameters
+        ----------
+        file_path: Path
+            The path to the file
+        points_dir: Optional[Path]
+            The points store to save the point annotations of a csv file to, None to write them in the csv file
+        """
+        Session.write(
+            file_path, self.shuffled, self.annotation_keys, list(self.annotation_keys), self.annotations, points_dir
+        )
+
+    def is_annotation_complete(self, annotation: Optional[list[Any]]) -> bool:
+        """
+        Return whether an image's annotation values hold a value for every annotation key, none of them None or an
+        empty string.
+
+        Parameters
+        ----------
+        annotation: Optional[list[Any]]
+            The annotation values of the image, None if it has not been annotated
+        """
+        if not annotation or len(annotation) != len(self.annotation_keys):
+            return False
+        return not any(value is None or (isinstance(value, str) and value == "") for value in annotation)
+
+    def validate(self, check_files: bool = False) -> list[str]:
+        """
+        Return the problems with the session's annotation values: values that do not match the type of their
+        annotation, dropdown values that are not among its options and images with the wrong number of values.
+        Annotations that have not been made are not problems.
+
+        Parameters
+        ----------
+        check_files: bool
+            Whether images that do not exist, and point annotations whose points store file does not, are problems
+        """
+        problems: list[str] = list(self.load_problems)
+        keys: list[tuple[str, Key]] = list(self.annotation_keys.items())
+        for path, values in self.annotations.items():
+            if check_files and not path.exists():
+                problems.append(f"{path}: the image does not exist")
+            if len(values) == 0:
+                continue
+            if len(values) != len(keys):
+                problems.append(f"{path}: {len(values)} annotation values for {len(keys)} annotations")
+                continue
+            for (name, key), value in zip(keys, values):
+                problem: Optional[str] = Session._validate_value(key, value, check_files)
+                if problem is not None:
+                    problems.append(f"{path}: {name} {problem}")
+        return problems
+
+    @staticmethod
+    def merge(sessions: list["Session"]) -> "Session":
+        """
+        Merge sessions with the same annotation template into one. Images are listed in the order they first appear,
+        and an image's annotation values are taken from the last session that annotated it.
+
+        Parameters
+        ----------
+        sessions: list[Session]
+            The sessions to merge
+
+        Raises
+        ------
+        ValueError
+            If there are no sessions or their annotation templates differ
+        """
+        if len(sessions) == 0:
+            raise ValueError("No sessions to merge")
+        template: str = JSONUtils.dict_to_json_dump(sessions[0].annotation_keys)
+        for session in sessions[1:]:
+            if JSONUtils.dict_to_json_dump(session.annotation_keys) != template:
+                raise ValueError("Sessions with different annotation templates cannot be merged")
+
+        annotations: dict[Path, list[Any]] = {}
+        for session in sessions:
+            for path, values in session.annotations.items():
+                if len(values) > 0 or path not in annotations:
+                    annotations[path] = values
+        merged: Session = Session(dict(sessions[0].annotation_keys), annotations, sessions[0].shuffled)
+        merged.load_problems = [problem for session in sessions for problem in session.load_problems]
+        return merged
+
+    @staticmethod
+    def get_point_columns(annotation_keys: dict[str, Key]) -> list[int]:
+        """
+        Return the indices of the point annotations among the annotation values.
+
+        Parameters
+        ----------
+        annotation_keys: dict[str, Key]
+            The annotation template
+        """
+        return [idx for idx, key in enumerate(annotation_keys.values()) if key.get_type() == "point"]
+
+    @staticmethod
+    def iter_csv_images(
+        csv_path: Path, num_columns: int, point_columns: list[int], read_annotations: bool
+    ) -> Iterator[tuple[list[tuple[Path, Optional[list[Any]]]], int, int]]:
+        """
+        Read the images and annotation values of a csv file and its journal in batches.
+
+        Annotation values saved to the journal since the csv file was last written in full replace those in the csv
+        file, and images only in the journal are read last.
+
+        Parameters
+        ----------
+        csv_path: Path
+            The path to the csv file
+        num_columns: int
+            The number of columns of the csv file
+        point_columns: list[int]
+            The indices of the point annotations among the annotation values
+        read_annotations: bool
+            Whether to read the annotation values as well as the images
+
+        Returns
+        -------
+        Iterator[tuple[list[tuple[Path, Optional[list[Any]]]], int, int]]
+            For each batch, the images with their annotation values (None if they are not read or their point
+            annotations could not be read), the number of incomplete rows skipped and the number of images whose
+            point annotations could not be read
+        """
+        journal: dict[Path, list[str]]
+        num_skipped_journal: int
+        journal, num_skipped_journal = CSVUtils.read_journal(CSVUtils.get_journal_path(csv_path), num_columns)
+        points_dir: Path = PointsStore.get_points_dir(csv_path)
+
+        def read_rows(rows: list[tuple[Path, list[str]]]) -> tuple[list[tuple[Path, Optional[list[Any]]]], int]:
+            images: list[tuple[Path, Optional[list[Any]]]] = []
+            num_unreadable: int = 0
+            for path, annotations in rows:
+                if not read_annotations:
+                    images.append((path, None))
+                    continue
+                try:
+                    images.append((path, Session.parse_point_annotations(annotations, point_columns, points_dir)))
+                except ValueError:
+                    images.append((path, None))
+                    num_unreadable += 1
+            return images, num_unreadable
+
+        images: list[tuple[Path, Optional[list[Any]]]]
+        num_unreadable: int
+        for rows, num_skipped in CSVUtils.iter_csv_rows(csv_path, num_columns):
+            # the journal entries left once the csv file is read are the images only in the journal
+            images, num_unreadable = read_rows([(path, journal.pop(path, annotations)) for path, annotations in rows])
+            yield images, num_skipped, num_unreadable
+
+        images, num_unreadable = read_rows(list(journal.items()))
+        yield images, num_skipped_journal, num_unreadable
+
+    @staticmethod
+    def parse_point_annotations(annotations: list[Any], point_columns: list[int], points_dir: Path) -> list[Any]:
+        """
+        Convert string representations of point annotations to arrays of point coordinates. Point annotations saved
+        to the points store of the csv file are not loaded until they are needed.
+
+        Parameters
+        ----------
+        annotations: list[Any]
+            The list of annotations read from the CSV
+        point_columns: list[int]
+            The indices of the point annotations in the list
+        points_dir: Path
+            The points store of the CSV
+
+        Returns
+        -------
+        list[Any]:
+            The same list of annotations with points annotations as (n, ndim) arrays, or PointsReferences for those in
+            the points store
+
+        Raises
+        ------
+        ValueError
+            If a point annotation is not a list of points
+        """
+        # if that image has been annotated
+        if len(annotations) > 0:
+            for idx in point_columns:
+                # if the annotation is point annotation and has been annotated, parse it into point coordinates.
+                if idx < len(annotations) and annotations[idx] != "":
+                    if PointsStore.is_reference(annotations[idx]):
+                        annotations[idx] = PointsStore.parse_reference(points_dir, annotations[idx])
+                    else:
+                        annotations[idx] = PointsUtils.parse_points(annotations[idx])
+        return annotations
+
+    @staticmethod
+    def _validate_value(key: Key, value: Any, check_files: bool) -> Optional[str]:
+        """Return the problem with an annotation value, None if there is none."""
+        if value is None or (isinstance(value, str) and value == ""):
+            return None
+        key_type: str = key.get_type()
+        if key_type == "point":
+            if isinstance(value, PointsReference):
+                if check_files and not (value.points_dir / value.file_name).exists():
+                    return f"references {value.file_name}, which does not exist"
+                return None
+            points: np.ndarray = np.asarray(value)
+            if len(points) > 0 and points.ndim != 2:
+                return "is not a list of points"
+            return None
+        if key_type == "number":
+            try:
+                int(value)
+            except (TypeError, ValueError):
+                return f"is not a number: {value}"
+            return None
+        if key_type == "bool":
+            if value not in (True, False, "True", "False"):
+                return f"is not a checkbox value: {value}"
+            return None
+        if isinstance(key, ComboKey) and str(value) not in key.get_options():
+            return f"is not one of the dropdown options: {value}"
+        return None
@@ -1,10 +1,13 @@
+from collections.abc import MutableMapping
 from pathlib import Path
 from typing import Optional, Any
 
+import numpy as np
 from PyQt5.QtCore import QObject
 from napari.layers import Points
 from qtpy.QtCore import Signal
 
+from napari_allencell_annotator.core.annotation_state import AnnotationState
 from napari_allencell_annotator.model.key import Key
 
 
@@ -12,22 +15,34 @@ class AnnotatorModel(QObject):
 
     image_changed: Signal = Signal()
     image_count_changed: Signal = Signal(int)
+    # emitted with the list of images added or removed by a single add or remove, before image_count_changed
+    images_added: Signal = Signal(list)
+    images_removed: Signal = Signal(list)
     images_shuffled: Signal = Signal(bool)
     image_set_added: Signal = Signal()
     annotation_started_changed: Signal = Signal()
     edit_points_layer_changed: Signal = Signal(str)
     annotation_recorded: Signal = Signal()
+    # emitted with True once the current image is on the canvas, and with False when another image is to be displayed
+    image_displayed_changed: Signal = Signal(bool)
+    # emitted when the annotations of an image change and have not been saved
+    annotation_changed: Signal = Signal()
 
     def __init__(self):
         super().__init__()
-        # dict of annotation key names -> Key objects containing information about that key
-        # such as default values, options, type
-        self._annotation_keys: dict[str, Key] = {}
+        # the annotation template and the annotations that have been created, with the images whose annotations
+        # changed since they were last saved. Annotations are None until annotating starts.
+        self._annotation_state: AnnotationState = AnnotationState()
+        self._annotation_state.annotation_changed.connect(self._handle_annotation_changed)
         # Images that have been added to annotator
         self._added_images: list[Path] = []
         # Shuffled images list. If user has not selected shuffle, this remains None
         # and is populated with a shuffled list if the user has selected shuffle
         self._shuffled_images: Optional[list[Path]] = None
+        # image path -> index of the image in _added_images and _shuffled_images, kept in sync with those lists so
+        # that membership checks and index lookups do not scan them
+        self._added_image_indices: dict[Path, int] = {}
+        self._shuffled_image_indices: Optional[dict[Path, int]] = None
 
         # THE FOLLOWING FIELDS ONLY ARE NEEDED WHEN ANNOTATING STARTS AND ARE INITIALIZED AFTER STARTING.
         # Current image index, which is none by default
@@ -35,33 +50,121 @@ class AnnotatorModel(QObject):
         # react to display that image. -1 if the user has not started annotating.
         self._curr_img_index: int = -1
         self._previous_img_index: int = -1  # index of previously viewed image, -1 by default
-        # annotations that have been crated. If annotating has not started, is None by default.
-        # dict of annotated image path -> list of annotations for that image
-        self._created_annotations: Optional[dict[Path, list[Any]]] = None
+        # completion bitmap, True at the index of each image in the image list (the shuffled list if images are
+        # shuffled) whose annotations are complete. None after the images, annotations or annotation keys are
+        # replaced, and rebuilt when next needed.
+        self._completed_images: Optional[np.ndarray] = None
         # path to csv where data should be saved.
         # None if annotating has not started.
         self._csv_save_path: Optional[Path] = None
 
         self._annotation_started = False
+        # whether the current image has been opened and is on the canvas
+        self._image_displayed: bool = False
 
         # dict storing current point layers {name: PointsLayer}
         self._curr_img_points_layer: dict[str, Points] = {}
 
+    def get_annotation_state(self) -> AnnotationState:
+        return self._annotation_state
+
     def get_annotation_keys(self) -> dict[str, Key]:
-        return self._annotation_keys
+        return self._annotation_state.get_annotation_keys()
 
     def clear_annotation_keys(self) -> None:
-        self._annotation_keys.clear()
+        self._annotation_state.clear_annotation_keys()
+        self._completed_images = None
 
     def set_annotation_keys(self, annotation_keys: dict[str, Key]) -> None:
-        self._annotation_keys = annotation_keys
+        self._annotation_state.set_annotation_keys(annotation_keys)
+        self._completed_images = None
 
     def add_image(self, file_item: Path, idx: Optional[int] = None) -> None:
-        if idx:
-            self._added_images.insert(idx)
+        if idx is not None:
+            self._added_images.insert(idx, file_item)
+            self._reindex(self._added_images, self._added_image_indices, idx)
+            self._completed_images = None
+            self.images_added.emit([file_item])
+            self.image_count_changed.emit(self.get_num_images())
         else:
-            self._added_images.append(file_item)
-        self.image_count_changed.emit(self.get_num_images())
+            self.add_images([file_item])
+
+    def add_images(self, file_items: list[Path]) -> list[Path]:
+        """
+        Add images to the end of the image list, skipping images that have already been added.
+
+        Emits images_added and image_count_changed once for the whole batch, and neither if no image was added.
+
+        Parameters
+        ----------
+        file_items: list[Path]
+            The paths to the images
+
+        Returns
+        -------
+        list[Path]
+            The images that were added
+        """
+        added: list[Path] = []
+        for file_item in file_items:
+            if file_item not in self._added_image_indices:
+                self._added_image_indices[file_item] = len(self._added_images)
+                self._added_images.append(file_item)
+                added.append(file_item)
+
+        if len(added) > 0:
+            self._completed_images = None
+            self.images_added.emit(added)
+            self.image_count_changed.emit(self.get_num_images())
+        return added
+
+    @staticmethod
+    def _reindex(images: list[Path], indices: dict[Path, int], start: int = 0) -> None:
+        """
+        Update the indices of the images from start onwards after the list has changed at start.
+
+        Parameters
+        ----------
+        images: list[Path]
+            The list of images
+        indices: dict[Path, int]
+            The image path -> index mapping of that list
+        start: int
+            The first index that changed
+        """
+        if start == 0:
+            indices.clear()
+        for idx in range(start, len(images)):
+            indices[images[idx]] = idx
+
+    def contains_image(self, file_path: Path) -> bool:
+        """
+        Return whether an image has been added.
+
+        Parameters
+        ----------
+        file_path: Path
+            The path to the image
+        """
+        if self.is_images_shuffled():
+            return file_path in self._shuffled_image_indices
+        else:
+            return file_path in self._added_image_indices
+
+    def get_image_index(self, file_path: Path) -> int:
+        """
+        Return the index of an image in the image list (the shuffled list if images are shuffled), -1 if the image has
+        not been added.
+
+        Parameters
+        ----------
+        file_path: Path
+            The path to the image
+        """
+        if self.is_images_shuffled():
+            return self._shuffled_image_indices.get(file_path, -1)
+        else:
+            return self._added_image_indices.get(file_path, -1)
 
     def get_all_images(self) -> list[Path]:
         if self.is_images_shuffled():
@@ -83,12 +186,16 @@ class AnnotatorModel(QObject):
 
     def set_all_images(self, list_of_img: list[Path]) -> None:
         self._added_images = list_of_img
+        self._reindex(self._added_images, self._added_image_indices)
+        self._completed_images = None
         self.image_set_added.emit()
         self.image_count_changed.emit(self.get_num_images())
 
     def clear_all_images(self) -> None:
         self._added_images = []
-        self._created_annotations = None
+        self._added_image_indices = {}
+        self._annotation_state.set_annotations(None)
+        self._completed_images = None
         if self.is_images_shuffled():
             self.set_shuffled_images(None)
         self.image_count_changed.emit(0)
@@ -96,15 +203,56 @@ class AnnotatorModel(QObject):
     def empty_image_list(self) -> None:
         if self.is_images_shuffled():
             self._shuffled_images = []
+            self._shuffled_image_indices = {}
         else:
             self._added_images = []
+            self._added_image_indices = {}
+        self._completed_images = None
 
     def remove_image(self, item: Path) -> None:
-        self._added_images.remove(item)
+        self.remove_images([item])
+
+    def remove_images(self, items: list[Path]) -> list[Path]:
+        """
+        Remove images from the image list, skipping images that have not been added.
+
+        Emits images_removed and image_count_changed once for the whole batch, and neither if no image was removed.
+
+        Parameters
+        ----------
+        items: list[Path]
+            The paths to the images
+
+        Returns
+        -------
+        list[Path]
+            The images that were removed
+        """
+        removed: list[Path] = [item for item in dict.fromkeys(items) if item in self._added_image_indices]
+        if len(removed) == 0:
+            return removed
+
+        removed_set: set[Path] = set(removed)
+        # rebuild the lists in one pass instead of deleting from them one image at a time
+        self._added_images = [image for image in self._added_images if image not in removed_set]
+        self._reindex(self._added_images, self._added_image_indices)
+        if self.is_images_shuffled():
+            self._shuffled_images = [image for image in self._shuffled_images if image not in removed_set]
+            self._reindex(self._shuffled_images, self._shuffled_image_indices)
+        self._completed_images = None
+
+        self.images_removed.emit(removed)
         self.image_count_changed.emit(self.get_num_images())
+        return removed
 
     def set_shuffled_images(self, shuffled: Optional[list[Path]]) -> None:
         self._shuffled_images = shuffled
+        if shuffled is not None:
+            self._shuffled_image_indices = {}
+            self._reindex(self._shuffled_images, self._shuffled_image_indices)
+        else:
+            self._shuffled_image_indices = None
+        self._completed_images = None
         if shuffled is not None:
             # we are setting the _shuffled_images field to a list of shuffled images. emit event so ui reacts
             self.images_shuffled.emit(True)
@@ -134,14 +282,104 @@ class AnnotatorModel(QObject):
         else:
             return None
 
-    def get_annotations(self) -> dict[Path, list[Any]]:
-        return self._created_annotations
+    def get_annotations(self) -> MutableMapping:
+        return self._annotation_state.get_annotations()
 
     def add_annotation(self, file_path: Path, annotation: list[Any]):
-        self._created_annotations[file_path] = annotation
+        self._annotation_state.add_annotation(file_path, annotation)
+
+    def _handle_annotation_changed(self, file_path: Path, annotation: list[Any]) -> None:
+        if self._completed_images is not None:
+            idx: int = self.get_image_index(file_path)
+            if idx != -1:
+                self._completed_images[idx] = self.is_annotation_complete(annotation)
+        self.annotation_changed.emit()
+
+    def set_annotations(self, annotations: MutableMapping) -> None:
+        self._annotation_state.set_annotations(annotations)
+        self._completed_images = None
+
+    def commit_annotations(self) -> None:
+        """Commit the annotations added since the last commit, if they are kept in a SQLiteAnnotationStore."""
+        self._annotation_state.commit_annotations()
+
+    def is_annotation_complete(self, annotation: Optional[list[Any]]) -> bool:
+        """
+        Return whether an image's annotation values hold a value for every annotation key, none of them None or an
+        empty string.
+
+        Parameters
+        ----------
+        annotation: Optional[list[Any]]
+            The annotation values of the image, None if it has not been annotated
+        """
+        return self._annotation_state.is_annotation_complete(annotation)
+
+    def get_completion_bitmap(self) -> np.ndarray:
+        """
+        Return a bool array with an entry for each image in the image list (the shuffled list if images are
+        shuffled), True if the image's annotations are complete. It is updated as annotations are added and must not
+        be modified.
+        """
+        if self._completed_images is None:
+            annotations: MutableMapping = self.get_annotations() or {}
+            images: list[Path] = self.get_all_images() or []
+            self._completed_images = np.fromiter(
+                (self.is_annotation_complete(annotations.get(image)) for image in images), dtype=bool, count=len(images)
+            )
+        return self._completed_images
+
+    def get_first_incomplete_index(self) -> Optional[int]:
+        """
+        Return the index of the first image in the image list (the shuffled list if images are shuffled) whose
+        annotations are not complete, None if every image's annotations are.
+        """
+        return self.get_next_incomplete_index(-1)
+
+    def get_next_incomplete_index(self, idx: int) -> Optional[int]:
+        """
+        Return the index of the first image after idx whose annotations are not complete, None if there is none.
+
+        Parameters
+        ----------
+        idx: int
+            The index to search after
+        """
+        after: np.ndarray = self.get_completion_bitmap()[idx + 1 :]
+        if after.all():
+            return None
+        # argmin finds the first False
+        return idx + 1 + int(np.argmin(after))
+
+    def get_previous_incomplete_index(self, idx: int) -> Optional[int]:
+        """
+        Return the index of the last image before idx whose annotations are not complete, None if there is none.
+
+        Parameters
+        ----------
+        idx: int
+            The index to search before
+        """
+        before: np.ndarray = self.get_completion_bitmap()[: max(idx, 0)]
+        if before.all():
+            return None
+        return len(before) - 1 - int(np.argmin(before[::-1]))
 
-    def set_annotations(self, annotations: dict[Path, list[Any]]) -> None:
-        self._created_annotations = annotations
+    def get_dirty_annotations(self) -> dict[Path, list[Any]]:
+        """Return the annotations of the images whose annotations changed since they were last saved."""
+        return self._annotation_state.get_dirty_annotations()
+
+    def clear_dirty_annotations(self, saved: Optional[dict[Path, list[Any]]] = None) -> None:
+        """
+        Mark images' annotations as saved.
+
+        Parameters
+        ----------
+        saved: Optional[dict[Path, list[Any]]]
+            The annotations that were saved, as returned by get_dirty_annotations. Images whose annotations have
+            changed again since are still marked as changed. If None, every image's annotations are marked as saved.
+        """
+        self._annotation_state.clear_dirty_annotations(saved)
 
     def set_previous_image_index(self, idx: int) -> None:
         self._previous_img_index = idx
@@ -162,6 +400,13 @@ class AnnotatorModel(QObject):
         self._annotation_started = started
         self.annotation_started_changed.emit()
 
+    def is_image_displayed(self) -> bool:
+        return self._image_displayed
+
+    def set_image_displayed(self, displayed: bool) -> None:
+        self._image_displayed = displayed
+        self.image_displayed_changed.emit(displayed)
+
     def get_all_curr_img_points_layers(self) -> dict[str, Points]:
         return self._curr_img_points_layer
 
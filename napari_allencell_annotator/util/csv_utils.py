@@ -0,0 +1,414 @@
+import csv
+import io
+import itertools
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import numpy as np
+
+from napari_allencell_annotator.constants.constants import IMPORT_BATCH_SIZE
+from napari_allencell_annotator.model.key import Key
+from napari_allencell_annotator.util.file_utils import FileUtils
+from napari_allencell_annotator.util.json_utils import JSONUtils
+from napari_allencell_annotator.util.points_store import PointsReference, PointsStore
+from napari_allencell_annotator.util.points_utils import PointsUtils
+
+
+class CSVUtils:
+    """
+    Handles reading and writing annotation csv files and their journals.
+
+    A csv file holds the shuffle flag, the annotation template, a header row and one row per image. Its journal is an
+    append-only file next to it holding rows in the same layout, one for each image whose annotations changed since
+    the csv was last written. Later journal rows supersede earlier ones and the rows of the csv.
+
+    A csv file is written to a temporary file that then replaces it, so an interrupted write leaves the previous csv
+    file in place, and its journal is only removed once the new csv file is in place. Together they always hold the
+    last saved state. Files that were cut short anyway (by an older version, another program or a full disk) are read
+    up to their last complete row.
+    """
+
+    @staticmethod
+    def get_journal_path(csv_path: Path) -> Path:
+        """
+        Return the path to the journal of a csv file.
+
+        Parameters
+        ----------
+        csv_path: Path
+            The path to the csv file
+        """
+        return csv_path.with_name(csv_path.name + ".journal")
+
+    @staticmethod
+    def make_row(
+        path: Path,
+        annotations: list[Any],
+        points_dir: Optional[Path] = None,
+        referenced: Optional[set[str]] = None,
+    ) -> list[Any]:
+        """
+        Return the csv row of an image.
+
+        Parameters
+        ----------
+        path: Path
+            The path to the image
+        annotations: list[Any]
+            The annotation values of the image. Point annotations are written as "[(z, y, x, ...), ...]", or saved to
+            the points store and written as a reference if points_dir is given
+        points_dir: Optional[Path]
+            The points store to save point annotations to, None to write them in the row
+        referenced: Optional[set[str]]
+            If given, the names of the points store files the row references are added to it
+        """
+        row: list[Any] = [FileUtils.get_file_name(path), str(path)]
+        for column, value in enumerate(annotations):
+            if isinstance(value, PointsReference) and value.points_dir != points_dir:
+                value = value.load()
+            if isinstance(value, PointsReference):
+                row.append(value.to_cell())
+            elif points_dir is not None and PointsUtils.is_points(value) and len(value) > 0:
+                value = PointsStore.write_points(points_dir, path, column, np.asarray(value))
+                row.append(value.to_cell())
+            elif PointsUtils.is_points(value):
+                row.append(PointsUtils.format_points(value))
+            else:
+                row.append(value)
+            if referenced is not None and isinstance(value, PointsReference):
+                referenced.add(value.file_name)
+        return row
+
+    @staticmethod
+    def write_csv(
+        csv_path: Path,
+        shuffled: bool,
+        annotation_keys: dict[str, Key],
+        annots_order: list[str],
+        annotations: dict[Path, list[Any]],
+        points_dir: Optional[Path] = None,
+    ) -> set[str]:
+        """
+        Write the shuffle flag, the annotation template, the header and every image's annotations to a csv file.
+
+        Parameters
+        ----------
+        csv_path: Path
+            The path to the csv file
+        shuffled: bool
+            Whether the images are shuffled
+        annotation_keys: dict[str, Key]
+            The annotation template
+        annots_order: list[str]
+            The names of the annotations, in the order of the annotation values
+        annotations: dict[Path, list[Any]]
+            The annotation values of each image
+        points_dir: Optional[Path]
+            The points store to save point annotations to, None to write them in the csv file
+
+        Returns
+        -------
+        set[str]
+            The names of the points store files the csv file references
+        """
+        referenced: set[str] = set()
+        # the temporary file is in the same directory so that it can replace the csv file with a rename
+        fd, temp_path = tempfile.mkstemp(prefix=csv_path.name + ".", suffix=".tmp", dir=csv_path.parent)
+        try:
+            with os.fdopen(fd, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["Shuffled:", shuffled])
+                writer.writerow(["Annotations:", JSONUtils.dict_to_json_dump(annotation_keys)])
+                writer.writerow(["File Name", "File Path"] + annots_order)
+                for path, image_annotations in annotations.items():
+                    writer.writerow(CSVUtils.make_row(path, image_annotations, points_dir, referenced))
+                file.flush()
+                os.fsync(file.fileno())
+            # mkstemp creates files only the owner can read
+            os.chmod(temp_path, csv_path.stat().st_mode if csv_path.exists() else 0o644)
+            os.replace(temp_path, csv_path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+        CSVUtils._fsync_dir(csv_path.parent)
+        return referenced
+
+    @staticmethod
+    def append_journal(
+        journal_path: Path, annotations: dict[Path, list[Any]], points_dir: Optional[Path] = None
+    ) -> None:
+        """
+        Append the annotations of some images to a journal.
+
+        Parameters
+        ----------
+        journal_path: Path
+            The path to the journal
+        annotations: dict[Path, list[Any]]
+            The annotation values of the images that changed
+        points_dir: Optional[Path]
+            The points store to save point annotations to, None to write them in the journal
+        """
+        with open(journal_path, "a", newline="") as file:
+            writer = csv.writer(file)
+            for path, image_annotations in annotations.items():
+                writer.writerow(CSVUtils.make_row(path, image_annotations, points_dir))
+            file.flush()
+            os.fsync(file.fileno())
+
+    @staticmethod
+    def read_csv(csv_path: Path) -> tuple[bool, str, list[str], list[tuple[Path, list[str]]], int]:
+        """
+        Read a csv file written by write_csv.
+
+        Rows that are not complete are skipped: the last row if the file was cut short in the middle of it, and rows
+        with a number of values that matches neither an image without annotations nor an annotated image.
+
+        Parameters
+        ----------
+        csv_path: Path
+            The path to the csv file
+
+        Returns
+        -------
+        tuple[bool, str, list[str], list[tuple[Path, list[str]]], int]
+            Whether the images are shuffled, the annotation template as json, the header row, the path and annotation
+            values of each image and the number of rows skipped
+
+        Raises
+        ------
+        ValueError
+            If the shuffle flag, the annotation template or the header cannot be read
+        """
+        shuffled: bool
+        annotations_json: str
+        header: list[str]
+        shuffled, annotations_json, header = CSVUtils.read_csv_header(csv_path)
+
+        images: list[tuple[Path, list[str]]] = []
+        num_skipped: int = 0
+        for batch, batch_num_skipped in CSVUtils.iter_csv_rows(csv_path, len(header)):
+            images.extend(batch)
+            num_skipped += batch_num_skipped
+        return shuffled, annotations_json, header, images, num_skipped
+
+    @staticmethod
+    def read_csv_header(csv_path: Path) -> tuple[bool, str, list[str]]:
+        """
+        Read the shuffle flag, the annotation template and the header of a csv file written by write_csv, without
+        reading its image rows.
+
+        Parameters
+        ----------
+        csv_path: Path
+            The path to the csv file
+
+        Returns
+        -------
+        tuple[bool, str, list[str]]
+            Whether the images are shuffled, the annotation template as json and the header row
+
+        Raises
+        ------
+        ValueError
+            If the shuffle flag, the annotation template or the header cannot be read
+        """
+        ends_with_line_break: bool = CSVUtils._ends_with_line_break(csv_path)
+        with open(csv_path, newline="") as file:
+            # a fourth row tells whether the header is the end of the file
+            rows: list[list[str]] = list(itertools.islice(csv.reader(file), 4))
+        if len(rows) <= 3 and not ends_with_line_break:
+            # the file was cut short in the middle of its last header row
+            rows = rows[:-1]
+
+        if len(rows) < 3:
+            raise ValueError(f"{csv_path.name} is missing its header rows")
+        shuffled_row, annotations_row, header = rows[0], rows[1], rows[2]
+        if len(shuffled_row) < 2 or shuffled_row[0] != "Shuffled:" or shuffled_row[1] not in ("True", "False"):
+            raise ValueError(f"{csv_path.name} does not start with a shuffle flag")
+        if len(annotations_row) < 2 or annotations_row[0] != "Annotations:":
+            raise ValueError(f"{csv_path.name} is missing its annotation template")
+        try:
+            json.loads(annotations_row[1])
+        except json.JSONDecodeError:
+            raise ValueError(f"The annotation template of {csv_path.name} is damaged")
+        if header[:2] != ["File Name", "File Path"]:
+            raise ValueError(f"{csv_path.name} is missing its column header")
+        return shuffled_row[1] == "True", annotations_row[1], header
+
+    @staticmethod
+    def iter_csv_rows(
+        csv_path: Path, num_columns: int, batch_size: int = IMPORT_BATCH_SIZE
+    ) -> Iterator[tuple[list[tuple[Path, list[str]]], int]]:
+        """
+        Read the image rows of a csv file written by write_csv in batches, holding only one batch in memory at a time.
+
+        Rows that are not complete are skipped, as in read_csv.
+
+        Parameters
+        ----------
+        csv_path: Path
+            The path to the csv file
+        num_columns: int
+            The number of columns of the csv file, the length of its header row
+        batch_size: int
+            The number of rows read for each batch
+
+        Returns
+        -------
+        Iterator[tuple[list[tuple[Path, list[str]]], int]]
+            For each batch, the path and annotation values of each image and the number of rows skipped
+        """
+        ends_with_line_break: bool = CSVUtils._ends_with_line_break(csv_path)
+        with open(csv_path, newline="") as file:
+            reader = csv.reader(file)
+            for _ in range(3):
+                next(reader, None)
+
+            images: list[tuple[Path, list[str]]] = []
+            num_skipped: int = 0
+            # each row is held back until the next one is read, the last row is skipped if it was cut short
+            previous: Optional[list[str]] = None
+            for row in reader:
+                if previous is not None:
+                    if CSVUtils._is_complete_row(previous, num_columns):
+                        images.append((Path(previous[1]), previous[2:]))
+                    else:
+                        num_skipped += 1
+                    if len(images) + num_skipped >= batch_size:
+                        yield images, num_skipped
+                        images, num_skipped = [], 0
+                previous = row
+
+            if previous is not None:
+                if ends_with_line_break and CSVUtils._is_complete_row(previous, num_columns):
+                    images.append((Path(previous[1]), previous[2:]))
+                else:
+                    num_skipped += 1
+            if len(images) + num_skipped > 0:
+                yield images, num_skipped
+
+    @staticmethod
+    def read_journal(journal_path: Path, num_columns: Optional[int] = None) -> tuple[dict[Path, list[str]], int]:
+        """
+        Return the latest annotation values of each image in a journal, in the order the images first appear in it.
+        Returns an empty dictionary if there is no journal.
+
+        Rows that are not complete are skipped, as in read_csv.
+
+        Parameters
+        ----------
+        journal_path: Path
+            The path to the journal
+        num_columns: Optional[int]
+            The number of columns of the csv file the journal belongs to. If given, rows of annotated images must
+            have that many values
+
+        Returns
+        -------
+        tuple[dict[Path, list[str]], int]
+            The annotation values of each image and the number of rows skipped
+        """
+        annotations: dict[Path, list[str]] = {}
+        if not journal_path.exists():
+            return annotations, 0
+
+        rows: list[list[str]]
+        num_skipped: int
+        rows, num_skipped = CSVUtils._read_complete_rows(journal_path)
+        for row in rows:
+            if CSVUtils._is_complete_row(row, num_columns):
+                annotations[Path(row[1])] = row[2:]
+            else:
+                num_skipped += 1
+        return annotations, num_skipped
+
+    @staticmethod
+    def _read_complete_rows(path: Path) -> tuple[list[list[str]], int]:
+        """
+        Return the rows of a csv file, without the last row if the file ends in the middle of it, and the number of
+        rows dropped.
+
+        Parameters
+        ----------
+        path: Path
+            The path to the csv file
+        """
+        with open(path, newline="") as file:
+            contents: str = file.read()
+        rows: list[list[str]] = list(csv.reader(io.StringIO(contents)))
+        # every row written ends with a line break, a file that does not was cut short
+        if len(rows) > 0 and not contents.endswith(("\n", "\r")):
+            return rows[:-1], 1
+        return rows, 0
+
+    @staticmethod
+    def _ends_with_line_break(path: Path) -> bool:
+        """
+        Return whether a file is empty or ends with a line break. Every row written ends with one, a file that does
+        not was cut short.
+
+        Parameters
+        ----------
+        path: Path
+            The path to the file
+        """
+        with open(path, "rb") as file:
+            file.seek(0, os.SEEK_END)
+            if file.tell() == 0:
+                return True
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) in (b"\n", b"\r")
+
+    @staticmethod
+    def _is_complete_row(row: list[str], num_columns: Optional[int]) -> bool:
+        """
+        Return whether a row holds an image path and either no annotation values or one for every column.
+
+        Parameters
+        ----------
+        row: list[str]
+            The row
+        num_columns: Optional[int]
+            The number of columns, including the file name and path. Any number of values is accepted if None
+        """
+        if len(row) < 2 or row[1] == "":
+            return False
+        return num_columns is None or len(row) in (2, num_columns)
+
+    @staticmethod
+    def _fsync_dir(dir_path: Path) -> None:
+        """
+        Flush a directory entry to disk so that a rename in it survives a crash. Not supported on Windows, where this
+        does nothing.
+
+        Parameters
+        ----------
+        dir_path: Path
+            The path to the directory
+        """
+        try:
+            fd: int = os.open(dir_path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def remove_journal(journal_path: Path) -> None:
+        """
+        Delete a journal if it exists.
+
+        Parameters
+        ----------
+        journal_path: Path
+            The path to the journal
+        """
+        journal_path.unlink(missing_ok=True)
@@ -1,6 +1,9 @@
+import os
 import random
 from pathlib import Path
-from napari_allencell_annotator.constants.constants import SUPPORTED_FILE_TYPES
+from typing import Generator, Optional
+
+from napari_allencell_annotator.constants.constants import IMPORT_BATCH_SIZE, SUPPORTED_FILE_TYPES
 
 
 class FileUtils:
@@ -25,12 +28,118 @@ class FileUtils:
                 # all supported files including raw zarr
                 if FileUtils.is_supported(file):
                     valid_files.append(file)
-                # if zarr outer folder was selected instead
-                elif FileUtils._is_outer_zarr(file):
-                    valid_files.append(FileUtils._get_raw_zarr_from_outer_dir(file))
+                else:
+                    # if zarr outer folder was selected instead
+                    raw_zarr: Optional[Path] = FileUtils._get_raw_zarr_from_outer_dir(file)
+                    if raw_zarr is not None:
+                        valid_files.append(raw_zarr)
 
         return sorted(valid_files, key=FileUtils.get_file_name)
 
+    @staticmethod
+    def get_valid_images_sorted_in_dir(dir_path: Path) -> tuple[list[Path], int]:
+        """
+        Return a sorted list of paths to the valid images in a directory and the number of entries in it that are not
+        hidden and not valid images.
+
+        The directory is listed once with os.scandir. Entries are classified by their names and the file type cached
+        on their DirEntry, so only folders that do not have a supported extension are listed again to look for a raw
+        zarr inside them.
+
+        Parameters
+        ----------
+        dir_path: Path
+            The path to a directory
+        """
+        valid_files: list[Path] = []
+        num_unsupported: int = 0
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    # is not hidden
+                    if entry.name.startswith("."):
+                        continue
+                    path: Path = dir_path / entry.name
+                    # all supported files including raw zarr
+                    if FileUtils.is_supported(path):
+                        valid_files.append(path)
+                        continue
+                    # if zarr outer folder was selected instead
+                    raw_zarr: Optional[Path] = None
+                    if entry.is_dir():
+                        raw_zarr = FileUtils._get_raw_zarr_from_outer_dir(path)
+                    if raw_zarr is not None:
+                        valid_files.append(raw_zarr)
+                    else:
+                        num_unsupported += 1
+        except FileNotFoundError:
+            # a folder that does not exist holds no images, as with Path.glob
+            pass
+
+        return sorted(valid_files, key=FileUtils.get_file_name), num_unsupported
+
+    @staticmethod
+    def iter_valid_images_in_tree(
+        dir_path: Path, batch_size: int = IMPORT_BATCH_SIZE
+    ) -> Generator[tuple[list[Path], int], None, None]:
+        """
+        Walk a directory and all of its subfolders, yielding batches of the valid images found in them together with
+        the number of files in the batch that are not hidden and not valid images.
+
+        Folders are walked depth first in name order and the images of each folder are sorted, so the images come out
+        grouped by folder rather than sorted across the whole tree. Folders with a supported extension (raw zarrs) are
+        images and are not walked into. Hidden entries and folders that cannot be listed are skipped, as are folders
+        already walked, which a symbolic link back to a parent folder would otherwise walk into forever. A batch is
+        yielded every batch_size entries, even if it holds no images, so that a consumer can stop the walk between
+        batches.
+
+        Parameters
+        ----------
+        dir_path: Path
+            The path to the top directory
+        batch_size: int
+            The number of entries examined between batches
+        """
+        batch: list[Path] = []
+        num_unsupported: int = 0
+        num_examined: int = 0
+        # folders still to walk, the next one last
+        to_walk: list[Path] = [dir_path]
+        # (device, inode) of the folders walked, the folders symbolic links point to included
+        walked: set[tuple[int, int]] = set()
+        while len(to_walk) > 0:
+            curr_dir: Path = to_walk.pop()
+            images: list[Path] = []
+            subdirs: list[Path] = []
+            try:
+                stat: os.stat_result = os.stat(curr_dir)
+                if (stat.st_dev, stat.st_ino) in walked:
+                    continue
+                walked.add((stat.st_dev, stat.st_ino))
+                with os.scandir(curr_dir) as entries:
+                    for entry in entries:
+                        if entry.name.startswith("."):
+                            continue
+                        num_examined += 1
+                        path: Path = curr_dir / entry.name
+                        if FileUtils.is_supported(path):
+                            images.append(path)
+                        elif entry.is_dir():
+                            subdirs.append(path)
+                        else:
+                            num_unsupported += 1
+            except OSError:
+                continue
+
+            batch.extend(sorted(images, key=FileUtils.get_file_name))
+            to_walk.extend(sorted(subdirs, reverse=True))
+            if num_examined >= batch_size:
+                yield batch, num_unsupported
+                batch, num_unsupported, num_examined = [], 0, 0
+
+        if len(batch) > 0 or num_unsupported > 0:
+            yield batch, num_unsupported
+
     @staticmethod
     def is_supported(file_path: Path) -> bool:
         """
@@ -87,28 +196,22 @@ class FileUtils:
             return path.name
 
     @staticmethod
-    def _is_outer_zarr(path: Path) -> bool:
-        """
-        Return whether a given path is the outer directory of a raw zarr.
-
-        Parameters
-        ----------
-        path: Path
-            The path to a directory
+    def _get_raw_zarr_from_outer_dir(path: Path) -> Optional[Path]:
         """
-        if list(path.glob("*.zarr")):
-            return True
-        else:
-            return False
+        Returns the path to the raw zarr in a given directory, None if path is not the outer directory of a raw zarr.
 
-    @staticmethod
-    def _get_raw_zarr_from_outer_dir(path: Path) -> Path:
-        """
-        Returns the path to the raw zarr in a given directory
+        The directory is listed only until the first raw zarr is found.
 
         Parameters
         ----------
         path: Path
             The path to an outer zarr directory
         """
-        return path.glob("*.zarr").__next__()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".zarr"):
+                        return path / entry.name
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+        return None
@@ -0,0 +1,123 @@
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from napari_allencell_annotator.constants.constants import IMAGE_CACHE_MAX_BYTES, IMAGE_CACHE_MAX_ENTRIES
+from napari_allencell_annotator.util.image_utils import ImageUtils
+
+
+class ImageCache:
+    """
+    A least recently used cache of opened images keyed by path and modification time.
+
+    Opening an image parses its metadata (OME-XML, czi subblock directories), so reopening one that was recently
+    displayed is served from this cache instead. Entries are evicted once there are more than max_entries of them or
+    their estimated memory exceeds max_bytes. A changed modification time invalidates the entry for that path.
+
+    Attributes
+    ----------
+    max_entries: int
+        The maximum number of opened images kept
+    max_bytes: int
+        The maximum estimated memory held by the opened images
+
+    Methods
+    -------
+    get_instance() -> ImageCache
+        Returns the cache shared by the whole process.
+    get(path: Path) -> ImageUtils
+        Returns the opened image at path, opening it if it is not cached.
+    clear() -> None
+        Drops every cached image.
+    """
+
+    _instance: Optional["ImageCache"] = None
+    _instance_lock: Lock = Lock()
+
+    def __init__(self, max_entries: int = IMAGE_CACHE_MAX_ENTRIES, max_bytes: int = IMAGE_CACHE_MAX_BYTES):
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+
+        # path -> (modification time, opened image, estimated bytes), least recently used first
+        self._entries: OrderedDict[Path, tuple[int, ImageUtils, int]] = OrderedDict()
+        self._nbytes: int = 0
+        self._lock: Lock = Lock()
+
+    @classmethod
+    def get_instance(cls) -> "ImageCache":
+        """Return the cache shared by the whole process."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = ImageCache()
+            return cls._instance
+
+    def get(self, path: Path) -> ImageUtils:
+        """
+        Return the opened image at path, opening it if it is not cached or has been modified since it was cached.
+
+        Parameters
+        ----------
+        path: Path
+            The path to the image
+        """
+        mtime: int = path.stat().st_mtime_ns
+        with self._lock:
+            entry: Optional[tuple[int, ImageUtils, int]] = self._entries.get(path)
+            if entry is not None and entry[0] == mtime:
+                self._entries.move_to_end(path)
+                return entry[1]
+
+        # open outside the lock so images can be opened on several threads at once
+        image: ImageUtils = ImageUtils(path)
+        nbytes: int = image.get_estimated_nbytes()
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == mtime:
+                # another thread opened the same image in the meantime, keep the one that is already shared
+                self._entries.move_to_end(path)
+                return entry[1]
+            self._remove(path)
+            self._entries[path] = (mtime, image, nbytes)
+            self._nbytes += nbytes
+            self._evict()
+        return image
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: Path) -> bool:
+        return path in self._entries
+
+    def get_nbytes(self) -> int:
+        """Return the estimated memory held by the cached images."""
+        return self._nbytes
+
+    def clear(self) -> None:
+        """Drop every cached image."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def _remove(self, path: Path) -> None:
+        """
+        Drop the image at path if it is cached. The caller must hold the lock.
+
+        Parameters
+        ----------
+        path: Path
+            The path to the image
+        """
+        entry: Optional[tuple[int, ImageUtils, int]] = self._entries.pop(path, None)
+        if entry is not None:
+            self._nbytes -= entry[2]
+
+    def _evict(self) -> None:
+        """
+        Drop least recently used images until the cache is within its limits. The most recently used image is always
+        kept, even if it alone is over the memory limit. The caller must hold the lock.
+        """
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._nbytes > self.max_bytes):
+            _, (_, _, nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= nbytes
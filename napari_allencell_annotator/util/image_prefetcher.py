@@ -0,0 +1,117 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+
+from napari_allencell_annotator.constants.constants import PREFETCH_DEPTH, PREFETCH_WORKERS
+from napari_allencell_annotator.model.annotation_model import AnnotatorModel
+from napari_allencell_annotator.util.image_cache import ImageCache
+from napari_allencell_annotator.util.image_utils import ImageUtils
+
+
+class ImagePrefetcher:
+    """
+    Opens the images around the current image in a thread pool so that moving to them does not wait on file opening
+    and metadata parsing. Images are opened through the process-wide ImageCache.
+
+    Attributes
+    ----------
+    depth: int
+        The number of images on each side of the current image to open ahead of time
+    num_workers: int
+        The number of threads used to open images
+
+    Methods
+    -------
+    prefetch_neighbors() -> None
+        Starts opening the images within depth of the current image and drops the ones outside of that window.
+    get_image(path: Path) -> ImageUtils
+        Returns the opened image, waiting on a prefetch that is in progress or getting it from the cache if it was
+        never prefetched.
+    clear() -> None
+        Drops every prefetched image.
+    shutdown() -> None
+        Stops the thread pool.
+    """
+
+    def __init__(
+        self, annotator_model: AnnotatorModel, depth: int = PREFETCH_DEPTH, num_workers: int = PREFETCH_WORKERS
+    ):
+        self._annotator_model: AnnotatorModel = annotator_model
+        self.depth: int = depth
+        self.num_workers: int = num_workers
+
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=num_workers, thread_name_prefix="annotator-prefetch"
+        )
+        # path -> future resolving to the opened image. Only holds images within depth of the current image.
+        self._prefetched: dict[Path, Future] = {}
+        self._lock: Lock = Lock()
+
+    @staticmethod
+    def _open(path: Path) -> ImageUtils:
+        """
+        Open an image through the image cache and read its first plane. Runs on a prefetch thread.
+
+        Parameters
+        ----------
+        path: Path
+            The path to the image
+        """
+        image: ImageUtils = ImageCache.get_instance().get(path)
+        image.warm_first_plane()
+        return image
+
+    def prefetch_neighbors(self) -> None:
+        """
+        Start opening the images within depth of the current image, nearest first, and drop prefetched images that
+        are no longer within that window.
+        """
+        curr_idx: int = self._annotator_model.get_curr_img_index()
+        num_images: int = self._annotator_model.get_num_images()
+        if curr_idx == -1 or num_images == 0:
+            return
+
+        window: list[Path] = [self._annotator_model.get_image_at(curr_idx)]
+        for offset in range(1, self.depth + 1):
+            for idx in (curr_idx + offset, curr_idx - offset):
+                if 0 <= idx < num_images:
+                    window.append(self._annotator_model.get_image_at(idx))
+
+        with self._lock:
+            for path in list(self._prefetched.keys()):
+                if path not in window:
+                    # cancel() is a no-op for images that are already being opened, those are simply dropped
+                    self._prefetched.pop(path).cancel()
+            for path in window:
+                if path not in self._prefetched:
+                    self._prefetched[path] = self._executor.submit(ImagePrefetcher._open, path)
+
+    def get_image(self, path: Path) -> ImageUtils:
+        """
+        Return the opened image at path.
+
+        Waits for the prefetch of the image to finish if it is in progress, and gets it from the image cache on the
+        calling thread if it was never prefetched.
+
+        Parameters
+        ----------
+        path: Path
+            The path to the image
+        """
+        with self._lock:
+            future: Future = self._prefetched.get(path)
+        if future is not None and not future.cancelled():
+            return future.result()
+        return ImageCache.get_instance().get(path)
+
+    def clear(self) -> None:
+        """Drop every prefetched image."""
+        with self._lock:
+            for future in self._prefetched.values():
+                future.cancel()
+            self._prefetched.clear()
+
+    def shutdown(self) -> None:
+        """Drop every prefetched image and stop the thread pool, without waiting on the images being opened."""
+        self.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
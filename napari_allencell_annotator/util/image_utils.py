@@ -1,4 +1,7 @@
 from pathlib import Path
+from threading import Lock
+from typing import Optional
+from uuid import uuid4
 
 import numpy as np
 import dask.array as da
@@ -8,6 +11,11 @@ import bioio_czi
 import bioio_imageio
 import bioio_ome_zarr
 
+from napari_allencell_annotator.constants.constants import LAZY_SCENE_LOADING
+
+# estimated memory, in bytes, of one task of a dask graph kept for an open image
+_DASK_TASK_NBYTES: int = 1024
+
 
 class ImageUtils:
     """
@@ -22,9 +30,17 @@ class ImageUtils:
     -------
     get_dask_data(self) -> da.Array
         Returns the dask array of the image
+    get_image_multiscale_dask_data(self) -> list[da.Array]
+        Returns the dask arrays of every resolution level of the image, highest resolution first
+    is_multiscale(self) -> bool
+        Returns whether the image has more than one resolution level
+    warm_first_plane(self) -> None
+        Reads the first plane of the image so later reads of it are served from warm caches
+    get_estimated_nbytes(self) -> int
+        Returns an estimate of the memory held while the image is open
     """
 
-    def __init__(self, filepath: Path):
+    def __init__(self, filepath: Path, lazy_scenes: bool = LAZY_SCENE_LOADING):
 
         extension: str = filepath.suffix
 
@@ -38,8 +54,147 @@ class ImageUtils:
         else:
             self._image = BioImage(filepath, reader=bioio_imageio.Reader)
 
+        # when True, only the first scene is opened up front and the other scenes are opened the first time one of
+        # their planes is read. Otherwise, every scene is opened up front with BioImage.get_dask_stack().
+        self._lazy_scenes: bool = lazy_scenes
+        # (scene index, resolution level) -> dask array of that scene, for scenes opened lazily
+        self._scene_dask_data: dict[tuple[int, int], da.Array] = {}
+
+        # stacking every scene walks the metadata of all of them, so only do it once per image
+        self._dask_data: Optional[da.Array] = None
+        self._multiscale_dask_data: Optional[list[da.Array]] = None
+        # images can be shared between the display and prefetch threads, and reading resolution levels or scenes
+        # switches the level or scene the BioImage operates on
+        self._lock: Lock = Lock()
+
     def get_image_dask_data(self) -> da.Array:
         """
         Returns image data as a dask array
         """
-        return self._image.get_dask_stack()
+        with self._lock:
+            if self._dask_data is None:
+                self._dask_data = self._stack_scenes()
+            return self._dask_data
+
+    def get_image_multiscale_dask_data(self) -> list[da.Array]:
+        """
+        Returns image data of every resolution level as dask arrays, highest resolution first.
+
+        Readers that do not provide resolution levels (everything but OME-Zarr at the moment) return a list holding
+        only the full resolution data.
+        """
+        full_resolution: da.Array = self.get_image_dask_data()
+        with self._lock:
+            if self._multiscale_dask_data is None:
+                levels: tuple[int, ...] = self._image.resolution_levels
+                self._multiscale_dask_data = [full_resolution]
+                for level in levels[1:]:
+                    self._image.set_resolution_level(level)
+                    self._multiscale_dask_data.append(self._stack_scenes())
+                self._image.set_resolution_level(levels[0])
+            return self._multiscale_dask_data
+
+    def is_multiscale(self) -> bool:
+        """
+        Returns whether the image has more than one resolution level.
+        """
+        return len(self.get_image_multiscale_dask_data()) > 1
+
+    def _stack_scenes(self) -> da.Array:
+        """
+        Returns the scenes of the current resolution level stacked along a new leading dimension. The caller must hold
+        the lock.
+
+        In lazy mode, only the first scene is opened. The other scenes are backed by one dask chunk per plane whose
+        task opens the scene the first time any of its planes is read, so moving the scene slider in napari opens
+        scenes one at a time. Like BioImage.get_dask_stack(), every scene is expected to have the shape and dtype of
+        the first scene.
+        """
+        if not self._lazy_scenes:
+            return self._image.get_dask_stack()
+
+        self._image.set_scene(0)
+        first_scene: da.Array = self._image.dask_data
+        num_scenes: int = len(self._image.scenes)
+        if num_scenes == 1:
+            return first_scene[np.newaxis]
+
+        # one chunk per plane, keeping the chunking of the first scene along the two spatial dimensions
+        chunks: tuple[tuple[int, ...], ...] = (
+            (1,) * (num_scenes - 1),
+            *[(1,) * size for size in first_scene.shape[:-2]],
+            *first_scene.chunks[-2:],
+        )
+        other_scenes: da.Array = da.empty(
+            (num_scenes - 1, *first_scene.shape), chunks=chunks, dtype=first_scene.dtype
+        ).map_blocks(
+            self._read_scene_block,
+            dtype=first_scene.dtype,
+            # skip hashing this ImageUtils to name the array
+            name=f"lazy-scenes-{uuid4().hex}",
+            level=self._image.current_resolution_level,
+        )
+        return da.concatenate([first_scene[np.newaxis], other_scenes])
+
+    def _read_scene_block(self, block: np.ndarray, level: int, block_info: Optional[dict] = None) -> np.ndarray:
+        """
+        Read one block of a lazily opened scene, opening the scene first if this is the first read from it. Runs as a
+        dask task.
+
+        Parameters
+        ----------
+        block: np.ndarray
+            The empty placeholder block being replaced
+        level: int
+            The resolution level the block belongs to
+        block_info: Optional[dict]
+            Provided by dask, holds the location of the block in the stack of the other scenes
+        """
+        location: list[tuple[int, int]] = block_info[0]["array-location"]
+        # the first scene is not part of the lazily read stack
+        scene: int = location[0][0] + 1
+        with self._lock:
+            scene_data: Optional[da.Array] = self._scene_dask_data.get((scene, level))
+            if scene_data is None:
+                previous_level: int = self._image.current_resolution_level
+                self._image.set_scene(scene)
+                self._image.set_resolution_level(level)
+                scene_data = self._image.dask_data
+                self._image.set_scene(0)
+                self._image.set_resolution_level(previous_level)
+                self._scene_dask_data[(scene, level)] = scene_data
+
+        if scene_data.shape != block_info[None]["shape"][1:] or scene_data.dtype != block.dtype:
+            raise ValueError(
+                f"Scene {scene} has shape {scene_data.shape} and dtype {scene_data.dtype}, all scenes must have the "
+                f"shape {block_info[None]['shape'][1:]} and dtype {block.dtype} of the first scene"
+            )
+        return np.asarray(scene_data[tuple(slice(start, stop) for start, stop in location[1:])].compute())[np.newaxis]
+
+    def warm_first_plane(self) -> None:
+        """
+        Read the first 2D plane of the lowest resolution level of the image, which is what is displayed first.
+
+        The data is discarded, but the file handles, chunk indexes, and OS caches it touches stay warm so that
+        displaying the image afterwards does not wait on them.
+        """
+        data: da.Array = self.get_image_multiscale_dask_data()[-1]
+        data[(0,) * (data.ndim - 2)].compute()
+
+    def get_estimated_nbytes(self) -> int:
+        """
+        Return an estimate of the memory held while the image is open.
+
+        Displaying the image decodes planes of the full resolution level, and readers keep roughly one decoded chunk
+        (tiff pages, czi subblocks, zarr chunks) around after a read, so the larger of a full resolution 2D plane and
+        a full resolution chunk is counted. The dask graphs kept for every resolution level are counted as well, at an
+        estimated cost per chunk.
+        """
+        levels: list[da.Array] = self.get_image_multiscale_dask_data()
+        full_resolution: da.Array = levels[0]
+        plane_size: int = int(np.prod(full_resolution.shape[-2:]))
+        chunk_size: int = int(np.prod([max(chunks, default=0) for chunks in full_resolution.chunks]))
+        with self._lock:
+            scene_levels: list[da.Array] = list(self._scene_dask_data.values())
+        num_tasks: int = sum(level.npartitions for level in levels + scene_levels)
+        return max(plane_size, chunk_size) * full_resolution.dtype.itemsize + num_tasks * _DASK_TASK_NBYTES
@@ -0,0 +1,314 @@
+import importlib.util
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from napari_allencell_annotator.model.key import Key
+from napari_allencell_annotator.util.file_utils import FileUtils
+from napari_allencell_annotator.util.json_utils import JSONUtils
+from napari_allencell_annotator.util.points_store import PointsReference
+
+# pyarrow is an optional dependency, installed with the "parquet" extra. It is imported when a parquet file is first
+# read or written rather than with this module, as it takes longer to import than the rest of the annotator's core.
+pa = None
+pq = None
+
+PARQUET_EXTENSION = ".parquet"
+
+# keys of the parquet file metadata holding the shuffle flag and the annotation template
+_SHUFFLED_METADATA_KEY: bytes = b"annotator.shuffled"
+_ANNOTATIONS_METADATA_KEY: bytes = b"annotator.annotations"
+# key of a point annotation column's metadata holding the number of dimensions of the annotations without points,
+# which a list of no coordinate lists does not keep
+_EMPTY_POINTS_NDIM_METADATA_KEY: bytes = b"annotator.empty_points_ndim"
+
+
+class ParquetUtils:
+    """
+    Handles saving annotations to, and reading them from, parquet files: one row per image, a "File Name" and a
+    "File Path" column, and one typed column per annotation. Text and dropdown annotations are strings, numbers are
+    int64, checkboxes are booleans and point annotations are lists of float32 coordinate lists. Annotations that
+    have not been made are null. The shuffle flag and the annotation template are saved in the file metadata.
+    """
+
+    @staticmethod
+    def is_available() -> bool:
+        """Return whether pyarrow is installed, which parquet files need."""
+        return pa is not None or importlib.util.find_spec("pyarrow") is not None
+
+    @staticmethod
+    def is_parquet(file_path: Path) -> bool:
+        """
+        Return whether a file is a parquet file, going by its extension.
+
+        Parameters
+        ----------
+        file_path: Path
+            The path to the file
+        """
+        return file_path.suffix == PARQUET_EXTENSION
+
+    @staticmethod
+    def write_parquet(
+        parquet_path: Path,
+        shuffled: bool,
+        annotation_keys: dict[str, Key],
+        annots_order: list[str],
+        annotations: dict[Path, list[Any]],
+    ) -> None:
+        """
+        Write the shuffle flag, the annotation template and every image's annotations to a parquet file.
+
+        Parameters
+        ----------
+        parquet_path: Path
+            The path to the parquet file
+        shuffled: bool
+            Whether the images are shuffled
+        annotation_keys: dict[str, Key]
+            The annotation template
+        annots_order: list[str]
+            The names of the annotations, in the order of the annotation values
+        annotations: dict[Path, list[Any]]
+            The annotation values of each image
+
+        Raises
+        ------
+        ImportError
+            If pyarrow is not installed
+        """
+        ParquetUtils._check_available()
+        paths: list[Path] = list(annotations.keys())
+        columns: list[pa.Array] = [
+            pa.array([FileUtils.get_file_name(path) for path in paths], type=pa.string()),
+            pa.array([str(path) for path in paths], type=pa.string()),
+        ]
+        fields: list[pa.Field] = [pa.field("File Name", pa.string()), pa.field("File Path", pa.string())]
+        for idx, name in enumerate(annots_order):
+            values: list[Any] = [
+                image_annotations[idx] if idx < len(image_annotations) else None
+                for image_annotations in annotations.values()
+            ]
+            column, column_metadata = ParquetUtils._make_column(annotation_keys[name].get_type(), values)
+            columns.append(column)
+            fields.append(pa.field(name, column.type, metadata=column_metadata))
+
+        metadata: dict[bytes, bytes] = {
+            _SHUFFLED_METADATA_KEY: str(shuffled).encode(),
+            _ANNOTATIONS_METADATA_KEY: JSONUtils.dict_to_json_dump(annotation_keys).encode(),
+        }
+        table: pa.Table = pa.Table.from_arrays(columns, schema=pa.schema(fields, metadata=metadata))
+
+        # the temporary file is in the same directory so that it can replace the parquet file with a rename
+        fd, temp_path = tempfile.mkstemp(prefix=parquet_path.name + ".", suffix=".tmp", dir=parquet_path.parent)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pq.write_table(table, file)
+                file.flush()
+                os.fsync(file.fileno())
+            # mkstemp creates files only the owner can read
+            os.chmod(temp_path, parquet_path.stat().st_mode if parquet_path.exists() else 0o644)
+            os.replace(temp_path, parquet_path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def read_parquet(parquet_path: Path) -> tuple[bool, str, list[tuple[Path, list[Any]]]]:
+        """
+        Read a parquet file written by write_parquet.
+
+        Parameters
+        ----------
+        parquet_path: Path
+            The path to the parquet file
+
+        Returns
+        -------
+        tuple[bool, str, list[tuple[Path, list[Any]]]]
+            Whether the images are shuffled, the annotation template as json and the path and annotation values of
+            each image. Images without any annotation have an empty list of values, point annotations are (n, ndim)
+            float32 arrays
+
+        Raises
+        ------
+        ImportError
+            If pyarrow is not installed
+        ValueError
+            If the file is not a parquet file written by write_parquet
+        """
+        ParquetUtils._check_available()
+        try:
+            table: pa.Table = pq.read_table(parquet_path)
+        except pa.ArrowException as error:
+            raise ValueError(f"{parquet_path.name} is not a parquet file: {error}") from error
+
+        metadata: dict[bytes, bytes] = table.schema.metadata or {}
+        if (
+            _SHUFFLED_METADATA_KEY not in metadata
+            or _ANNOTATIONS_METADATA_KEY not in metadata
+            or table.column_names[:2] != ["File Name", "File Path"]
+        ):
+            raise ValueError(f"{parquet_path.name} was not saved by the annotator")
+        shuffled: bool = metadata[_SHUFFLED_METADATA_KEY] == b"True"
+        annotations_json: str = metadata[_ANNOTATIONS_METADATA_KEY].decode()
+
+        paths: list[Path] = [Path(path) for path in table.column("File Path").to_pylist()]
+        columns: list[list[Any]] = [
+            ParquetUtils._read_column(table.column(idx), table.schema.field(idx).metadata or {})
+            for idx in range(2, table.num_columns)
+        ]
+        images: list[tuple[Path, list[Any]]] = []
+        for row, path in enumerate(paths):
+            values: list[Any] = [column[row] for column in columns]
+            if all(value is None for value in values):
+                # the image has not been annotated
+                values = []
+            images.append((path, values))
+        return shuffled, annotations_json, images
+
+    @staticmethod
+    def _check_available() -> None:
+        """Import pyarrow if it has not been imported yet."""
+        global pa, pq
+        if pa is not None:
+            return
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ImportError(
+                "Parquet files need pyarrow, install it with: pip install napari-allencell-annotator[parquet]"
+            ) from error
+        pa = pyarrow
+        pq = pyarrow.parquet
+
+    @staticmethod
+    def _make_column(key_type: str, values: list[Any]) -> tuple["pa.Array", dict[bytes, bytes]]:
+        """
+        Build the column of an annotation from its values, converting values read from a csv file from their text,
+        and the metadata of the column.
+
+        Parameters
+        ----------
+        key_type: str
+            The type of the annotation, as in Key
+        values: list[Any]
+            The value of the annotation for each image, None or "" if it has not been made
+        """
+        if key_type == "point":
+            return ParquetUtils._make_points_column(values)
+
+        def is_missing(value: Any) -> bool:
+            return value is None or (isinstance(value, str) and value == "")
+
+        def to_bool(value: Any) -> bool:
+            # values read from a csv file are "True" or "False"
+            return value == "True" if isinstance(value, str) else bool(value)
+
+        if key_type == "number":
+            column: pa.Array = pa.array(
+                [None if is_missing(value) else int(float(value)) for value in values], type=pa.int64()
+            )
+        elif key_type == "bool":
+            column = pa.array([None if is_missing(value) else to_bool(value) for value in values], type=pa.bool_())
+        else:
+            column = pa.array([None if value is None else str(value) for value in values], type=pa.string())
+        return column, {}
+
+    @staticmethod
+    def _make_points_column(values: list[Any]) -> tuple["pa.Array", dict[bytes, bytes]]:
+        """
+        Build the column of a point annotation, a list of points per image with each point a list of coordinates,
+        and its metadata: the number of dimensions of each annotation without points, by row.
+
+        The coordinates of all images are gathered into one float32 array, so the column is built without a python
+        object per coordinate.
+
+        Parameters
+        ----------
+        values: list[Any]
+            The point coordinates of each image, None or "" if it has not been annotated
+        """
+        arrays: list[Optional[np.ndarray]] = []
+        for value in values:
+            if value is None or (isinstance(value, str) and value == ""):
+                arrays.append(None)
+                continue
+            if isinstance(value, PointsReference):
+                value = value.load()
+            points: np.ndarray = np.asarray(value, dtype=np.float32)
+            if len(points) > 0:
+                arrays.append(points.reshape(len(points), -1))
+            else:
+                # an empty list has no shape to keep, napari gives a points layer created without data two dimensions
+                arrays.append(points.reshape(0, points.shape[1] if points.ndim == 2 else 2))
+
+        # offsets of each image's points among all points, and of each point's coordinates among all coordinates
+        point_offsets: np.ndarray = np.zeros(len(arrays) + 1, dtype=np.int32)
+        point_offsets[1:] = np.cumsum([0 if points is None else len(points) for points in arrays])
+        point_ndims: list[np.ndarray] = [
+            np.full(len(points), points.shape[1], dtype=np.int32) for points in arrays if points is not None
+        ]
+        coordinate_offsets: np.ndarray = np.zeros(point_offsets[-1] + 1, dtype=np.int32)
+        if len(point_ndims) > 0:
+            coordinate_offsets[1:] = np.cumsum(np.concatenate(point_ndims))
+        coordinates: np.ndarray = np.concatenate(
+            [points.ravel() for points in arrays if points is not None] + [np.empty(0, dtype=np.float32)]
+        )
+
+        point_lists: pa.ListArray = pa.ListArray.from_arrays(
+            pa.array(coordinate_offsets), pa.array(coordinates, type=pa.float32())
+        )
+        mask: pa.Array = pa.array([points is None for points in arrays], type=pa.bool_())
+        empty_ndims: dict[int, int] = {
+            row: points.shape[1] for row, points in enumerate(arrays) if points is not None and len(points) == 0
+        }
+        metadata: dict[bytes, bytes] = {_EMPTY_POINTS_NDIM_METADATA_KEY: json.dumps(empty_ndims).encode()}
+        return pa.ListArray.from_arrays(pa.array(point_offsets), point_lists, mask=mask), metadata
+
+    @staticmethod
+    def _read_column(column: "pa.ChunkedArray", metadata: dict[bytes, bytes]) -> list[Any]:
+        """
+        Read the values of an annotation column, None where the annotation has not been made.
+
+        Parameters
+        ----------
+        column: pa.ChunkedArray
+            The column
+        metadata: dict[bytes, bytes]
+            The metadata of the column
+        """
+        if not pa.types.is_list(column.type):
+            return column.to_pylist()
+
+        # point annotations: slice each image's points out of the column's coordinates instead of building python lists
+        if _EMPTY_POINTS_NDIM_METADATA_KEY not in metadata:
+            raise ValueError("The point annotation column was not saved by the annotator")
+        empty_ndims: dict[str, int] = json.loads(metadata[_EMPTY_POINTS_NDIM_METADATA_KEY])
+        points: list[Optional[np.ndarray]] = []
+        for chunk in column.chunks:
+            point_offsets: np.ndarray = chunk.offsets.to_numpy()
+            point_lists: pa.ListArray = chunk.values
+            coordinate_offsets: np.ndarray = point_lists.offsets.to_numpy()
+            coordinates: np.ndarray = point_lists.values.to_numpy(zero_copy_only=False).astype(np.float32, copy=False)
+            valid: np.ndarray = chunk.is_valid().to_numpy(zero_copy_only=False)
+            for row in range(len(chunk)):
+                if not valid[row]:
+                    points.append(None)
+                    continue
+                start: int = point_offsets[row]
+                end: int = point_offsets[row + 1]
+                if start == end:
+                    # rows are numbered across chunks, which is the length of the values read so far
+                    points.append(np.empty((0, empty_ndims[str(len(points))]), dtype=np.float32))
+                    continue
+                ndim: int = coordinate_offsets[start + 1] - coordinate_offsets[start]
+                points.append(
+                    coordinates[coordinate_offsets[start] : coordinate_offsets[end]].reshape(end - start, ndim).copy()
+                )
+        return points
@@ -0,0 +1,199 @@
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+# csv cell referencing a file of the points store, "<file name>.npy (<number of points> points)"
+_REFERENCE_PATTERN: re.Pattern = re.compile(r"^([0-9a-f]+\.npy) \((\d+) points\)$")
+
+
+class PointsReference:
+    """
+    A point annotation saved to a file of a points store, loaded only when it is needed.
+
+    Attributes
+    ----------
+    points_dir: Path
+        The folder of the points store
+    file_name: str
+        The name of the file holding the points, in points_dir
+    count: int
+        The number of points
+    """
+
+    def __init__(self, points_dir: Path, file_name: str, count: int):
+        self.points_dir: Path = points_dir
+        self.file_name: str = file_name
+        self.count: int = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PointsReference):
+            return NotImplemented
+        return self.points_dir == other.points_dir and self.file_name == other.file_name
+
+    def __hash__(self) -> int:
+        return hash((self.points_dir, self.file_name))
+
+    def __repr__(self) -> str:
+        return f"PointsReference({self.points_dir / self.file_name}, {self.count})"
+
+    def load(self) -> np.ndarray:
+        """
+        Load the points.
+
+        Returns
+        -------
+        np.ndarray
+            An (n, ndim) float32 array of the point coordinates
+
+        Raises
+        ------
+        OSError
+            If the file cannot be read
+        ValueError
+            If the file does not hold the number of points the reference expects
+        """
+        points: np.ndarray = np.load(self.points_dir / self.file_name, allow_pickle=False)
+        if points.ndim != 2 or points.shape[0] != self.count:
+            raise ValueError(f"{self.file_name} does not hold {self.count} points")
+        return points.astype(np.float32, copy=False)
+
+    def to_cell(self) -> str:
+        """Return the csv cell referencing the points."""
+        return f"{self.file_name} ({self.count} points)"
+
+
+class PointsStore:
+    """
+    Handles the points store of a csv file: a folder next to it holding point annotations as .npy files, one array per
+    image and annotation, with the csv file holding a reference to the file and the number of points.
+
+    Files are named after a hash of the image, the annotation column and the points, so a file is never rewritten with
+    different points: saving an unchanged annotation writes nothing, and a csv file or journal cut short by a crash
+    still references the points it was written with. Files no longer referenced are removed when the csv file is
+    written in full.
+    """
+
+    @staticmethod
+    def get_points_dir(csv_path: Path) -> Path:
+        """
+        Return the path to the points store of a csv file.
+
+        Parameters
+        ----------
+        csv_path: Path
+            The path to the csv file
+        """
+        return csv_path.with_name(csv_path.name + ".points")
+
+    @staticmethod
+    def is_reference(cell: str) -> bool:
+        """
+        Return whether a csv cell references a file of a points store.
+
+        Parameters
+        ----------
+        cell: str
+            The csv cell
+        """
+        return _REFERENCE_PATTERN.match(cell) is not None
+
+    @staticmethod
+    def parse_reference(points_dir: Path, cell: str) -> PointsReference:
+        """
+        Return the points referenced by a csv cell, without loading them.
+
+        Parameters
+        ----------
+        points_dir: Path
+            The points store of the csv file
+        cell: str
+            The csv cell
+
+        Raises
+        ------
+        ValueError
+            If the cell does not reference a file of a points store
+        """
+        match: Optional[re.Match] = _REFERENCE_PATTERN.match(cell)
+        if match is None:
+            raise ValueError(f"Not a reference to saved points: {cell[:50]}")
+        return PointsReference(points_dir, match.group(1), int(match.group(2)))
+
+    @staticmethod
+    def write_points(points_dir: Path, image_path: Path, column: int, points: np.ndarray) -> PointsReference:
+        """
+        Save the points of an annotation to the points store, if they are not saved already.
+
+        Parameters
+        ----------
+        points_dir: Path
+            The points store
+        image_path: Path
+            The path to the annotated image
+        column: int
+            The index of the annotation among the image's annotation values
+        points: np.ndarray
+            The (n, ndim) point coordinates
+
+        Returns
+        -------
+        PointsReference
+            The saved points
+        """
+        points = np.ascontiguousarray(points, dtype=np.float32)
+        digest = hashlib.sha1(str(image_path).encode())
+        digest.update(column.to_bytes(4, "little"))
+        digest.update(np.array(points.shape, dtype=np.int64).tobytes())
+        digest.update(points.tobytes())
+        reference: PointsReference = PointsReference(points_dir, digest.hexdigest()[:20] + ".npy", len(points))
+
+        file_path: Path = points_dir / reference.file_name
+        if file_path.exists():
+            return reference
+
+        points_dir.mkdir(exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=reference.file_name + ".", suffix=".tmp", dir=points_dir)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                np.save(file, points, allow_pickle=False)
+                file.flush()
+                os.fsync(file.fileno())
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+        return reference
+
+    @staticmethod
+    def remove_unreferenced(points_dir: Path, referenced: set[str]) -> None:
+        """
+        Delete the files of a points store that are not referenced, and the store if it is left empty.
+
+        Parameters
+        ----------
+        points_dir: Path
+            The points store
+        referenced: set[str]
+            The names of the files still referenced
+        """
+        try:
+            entries: list[os.DirEntry] = list(os.scandir(points_dir))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if entry.name not in referenced and entry.is_file():
+                Path(entry.path).unlink(missing_ok=True)
+        if len(referenced) == 0:
+            try:
+                points_dir.rmdir()
+            except OSError:
+                pass
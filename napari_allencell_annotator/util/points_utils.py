@@ -0,0 +1,141 @@
+import re
+from typing import Any, Union
+
+import numpy as np
+
+from napari_allencell_annotator.util.points_store import PointsReference
+
+# numpy scalar reprs such as "np.float64(1.5)", which numpy 2 writes for the coordinates of points stored as tuples
+_NUMPY_SCALAR_PATTERN: re.Pattern = re.compile(r"np\.\w+\(([^()]*)\)")
+
+
+class PointsUtils:
+    """
+    Handles converting point annotations to and from the text stored in csv files, "[(z, y, x, ...), ...]".
+    """
+
+    @staticmethod
+    def parse_points(text: str) -> np.ndarray:
+        """
+        Parse the text of a point annotation into an (n, ndim) float array of point coordinates.
+
+        Parameters
+        ----------
+        text: str
+            The point annotation, "[(z, y, x, ...), ...]". Coordinates may be written as numpy scalars, as in
+            "(np.float64(1.0), ...)"
+
+        Returns
+        -------
+        np.ndarray
+            The float32 point coordinates, one row per point. An annotation without points is parsed into a (0, 2)
+            array, the shape napari gives a points layer created without data
+
+        Raises
+        ------
+        ValueError
+            If the text is not a list of points that all have the same number of coordinates
+        """
+        if "np." in text:
+            text = _NUMPY_SCALAR_PATTERN.sub(r"\1", text)
+        body: str = text.strip()
+        if len(body) < 2 or body[0] != "[" or body[-1] != "]":
+            raise ValueError(f"Not a list of points: {text[:50]}")
+        body = body[1:-1].strip()
+        if body == "":
+            return np.empty((0, 2), dtype=np.float32)
+
+        # each point is "(a, b, ...)", split on the closing parentheses and drop the separators and opening ones
+        points: list[str] = body.split(")")
+        if points[-1].strip() != "":
+            raise ValueError(f"Not a list of points: {text[:50]}")
+        points.pop()
+
+        coordinates: list[str] = []
+        ndim: int = -1
+        for point in points:
+            point = point.lstrip(", \t\r\n")
+            if not point.startswith("("):
+                raise ValueError(f"Not a list of points: {text[:50]}")
+            point_coordinates: list[str] = point[1:].split(",")
+            if point_coordinates[-1].strip() == "":
+                # trailing comma of a one dimensional tuple
+                point_coordinates.pop()
+            if ndim == -1:
+                ndim = len(point_coordinates)
+            elif len(point_coordinates) != ndim:
+                raise ValueError(f"Points with different numbers of coordinates: {text[:50]}")
+            coordinates.extend(point_coordinates)
+
+        return np.array(coordinates, dtype=np.float32).reshape(len(points), ndim)
+
+    @staticmethod
+    def format_points(points: Union[np.ndarray, list[tuple]]) -> str:
+        """
+        Format point coordinates as the text of a point annotation, "[(z, y, x, ...), ...]".
+
+        Parameters
+        ----------
+        points: Union[np.ndarray, list[tuple]]
+            The point coordinates, an (n, ndim) array or a list of tuples
+        """
+        # numpy writes each coordinate as the shortest text that reads back as the same value in the array's dtype,
+        # "0.1" rather than the "0.10000000149011612" of the float32 converted to a python float
+        if not isinstance(points, np.ndarray):
+            points = np.array(points, dtype=float)
+        rows: list[list[str]] = points.astype(str).tolist()
+        return "[" + ", ".join("(" + ", ".join(row) + ")" for row in rows) + "]"
+
+    @staticmethod
+    def is_points(value: Any) -> bool:
+        """
+        Return whether an annotation value holds point coordinates, or references saved ones.
+
+        Parameters
+        ----------
+        value: Any
+            The annotation value
+        """
+        return isinstance(value, (np.ndarray, list, PointsReference))
+
+    @staticmethod
+    def annotations_equal(annotations: list[Any], other: list[Any]) -> bool:
+        """
+        Return whether two lists of annotation values are equal, comparing point coordinates by value.
+
+        Parameters
+        ----------
+        annotations: list[Any]
+            The annotation values
+        other: list[Any]
+            The annotation values to compare to
+        """
+        if len(annotations) != len(other):
+            return False
+        for value, other_value in zip(annotations, other):
+            if isinstance(value, PointsReference) and isinstance(other_value, PointsReference):
+                if value != other_value:
+                    return False
+                continue
+            try:
+                value = PointsUtils._load_reference(value)
+                other_value = PointsUtils._load_reference(other_value)
+            except (OSError, ValueError):
+                return False
+            if isinstance(value, np.ndarray) or isinstance(other_value, np.ndarray):
+                if not PointsUtils.is_points(value) or not PointsUtils.is_points(other_value):
+                    return False
+                if len(value) == 0 and len(other_value) == 0:
+                    continue
+                if not np.array_equal(np.asarray(value, dtype=float), np.asarray(other_value, dtype=float)):
+                    return False
+            elif value != other_value:
+                return False
+        return True
+
+    @staticmethod
+    def _load_reference(value: Any) -> Any:
+        """Return the points a value references if it is a PointsReference, the value otherwise."""
+        if isinstance(value, PointsReference):
+            return value.load()
+        return value
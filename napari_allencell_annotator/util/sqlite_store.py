@@ -0,0 +1,264 @@
+import json
+import sqlite3
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import numpy as np
+
+from napari_allencell_annotator.model.key import Key
+from napari_allencell_annotator.util.json_utils import JSONUtils
+from napari_allencell_annotator.util.points_store import PointsReference
+
+SQLITE_EXTENSION = ".db"
+
+# kinds of annotation values, saved with each value so it is read back as the type it was recorded as
+_NONE: int = 0
+_STRING: int = 1
+_INT: int = 2
+_FLOAT: int = 3
+_BOOL: int = 4
+_POINTS: int = 5
+
+_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS session (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS images (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    num_values INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS annotation_values (
+    image_id INTEGER NOT NULL REFERENCES images(id) ON DELETE CASCADE,
+    key_index INTEGER NOT NULL,
+    kind INTEGER NOT NULL,
+    value,
+    ndim INTEGER,
+    PRIMARY KEY (image_id, key_index)
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteAnnotationStore(MutableMapping):
+    """
+    The annotation values of each image, kept in a SQLite database instead of in memory: image path -> list of
+    annotation values, with the same interface as the dict the model otherwise holds.
+
+    Images are kept in a table indexed by path, in the order they were first added, and each annotation value is a
+    row of a table keyed by image and annotation index. Point annotations are saved as float32 coordinates. Changes
+    are written as they are made and committed together by commit(), so that recording the annotations of an image
+    costs the same however many images the session has. The database is opened in WAL mode, so a commit appends to
+    the write-ahead log rather than rewriting the database.
+
+    Attributes
+    ----------
+    path: Path
+        The path to the database
+    """
+
+    def __init__(self, path: Path):
+        self.path: Path = path
+        self._connection: sqlite3.Connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # in WAL mode a commit is still atomic and durable against a crash of the application with NORMAL
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA foreign_keys=ON")
+        self._connection.executescript(_SCHEMA)
+        self._connection.commit()
+
+    @staticmethod
+    def is_sqlite(file_path: Path) -> bool:
+        """
+        Return whether a file is an annotation database, going by its extension.
+
+        Parameters
+        ----------
+        file_path: Path
+            The path to the file
+        """
+        return file_path.suffix == SQLITE_EXTENSION
+
+    @staticmethod
+    def write_session(
+        db_path: Path,
+        shuffled: bool,
+        annotation_keys: dict[str, Key],
+        annots_order: list[str],
+        annotations: MutableMapping,
+    ) -> None:
+        """
+        Save the shuffle flag, the annotation template and every image's annotations to a database.
+
+        If the annotations are already kept in that database, only the session information is written and the
+        changes made since the last commit are committed.
+
+        Parameters
+        ----------
+        db_path: Path
+            The path to the database
+        shuffled: bool
+            Whether the images are shuffled
+        annotation_keys: dict[str, Key]
+            The annotation template
+        annots_order: list[str]
+            The names of the annotations, in the order of the annotation values
+        annotations: MutableMapping
+            The annotation values of each image
+        """
+        if isinstance(annotations, SQLiteAnnotationStore) and annotations.path == db_path:
+            annotations.set_session(shuffled, annotation_keys, annots_order)
+            annotations.commit()
+            return
+
+        store: SQLiteAnnotationStore = SQLiteAnnotationStore(db_path)
+        try:
+            store.clear()
+            store.update(annotations)
+            store.set_session(shuffled, annotation_keys, annots_order)
+            store.commit()
+        finally:
+            store.close()
+
+    def set_session(self, shuffled: bool, annotation_keys: dict[str, Key], annots_order: list[str]) -> None:
+        """
+        Record the shuffle flag, the annotation template and the order of the annotation values.
+
+        Parameters
+        ----------
+        shuffled: bool
+            Whether the images are shuffled
+        annotation_keys: dict[str, Key]
+            The annotation template
+        annots_order: list[str]
+            The names of the annotations, in the order of the annotation values
+        """
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO session (name, value) VALUES (?, ?)",
+            [
+                ("shuffled", str(shuffled)),
+                ("annotations", JSONUtils.dict_to_json_dump(annotation_keys)),
+                ("annots_order", json.dumps(annots_order)),
+            ],
+        )
+
+    def get_session(self) -> tuple[bool, str]:
+        """
+        Return whether the images are shuffled and the annotation template as json.
+
+        Raises
+        ------
+        ValueError
+            If the database has no annotating session saved to it
+        """
+        session: dict[str, str] = dict(self._connection.execute("SELECT name, value FROM session"))
+        if "shuffled" not in session or "annotations" not in session:
+            raise ValueError(f"{self.path.name} has no annotating session saved to it")
+        return session["shuffled"] == "True", session["annotations"]
+
+    def get_num_complete(self, num_keys: int) -> int:
+        """
+        Return the number of images with a value for every annotation, none of them None or an empty string, counted
+        by the database without reading the values.
+
+        Parameters
+        ----------
+        num_keys: int
+            The number of annotations in the template
+        """
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM images WHERE num_values = ? AND NOT EXISTS ("
+            "SELECT 1 FROM annotation_values WHERE image_id = images.id "
+            "AND (kind = ? OR (kind = ? AND value = '')))",
+            (num_keys, _NONE, _STRING),
+        ).fetchone()[0]
+
+    def commit(self) -> None:
+        """Commit the changes made since the last commit."""
+        self._connection.commit()
+
+    def close(self) -> None:
+        """Close the database, discarding changes that were not committed."""
+        self._connection.close()
+
+    def __getitem__(self, path: Path) -> list[Any]:
+        row: Optional[tuple[int, int]] = self._connection.execute(
+            "SELECT id, num_values FROM images WHERE path = ?", (str(path),)
+        ).fetchone()
+        if row is None:
+            raise KeyError(path)
+        image_id, num_values = row
+        values: list[Any] = [None] * num_values
+        for key_index, kind, value, ndim in self._connection.execute(
+            "SELECT key_index, kind, value, ndim FROM annotation_values WHERE image_id = ?", (image_id,)
+        ):
+            values[key_index] = SQLiteAnnotationStore._decode(kind, value, ndim)
+        return values
+
+    def __setitem__(self, path: Path, annotations: list[Any]) -> None:
+        # an upsert keeps the id of an image already in the table, and so its place in the order of the images
+        self._connection.execute(
+            "INSERT INTO images (path, num_values) VALUES (?, ?) "
+            "ON CONFLICT (path) DO UPDATE SET num_values = excluded.num_values",
+            (str(path), len(annotations)),
+        )
+        image_id: int = self._connection.execute("SELECT id FROM images WHERE path = ?", (str(path),)).fetchone()[0]
+        self._connection.execute("DELETE FROM annotation_values WHERE image_id = ?", (image_id,))
+        self._connection.executemany(
+            "INSERT INTO annotation_values (image_id, key_index, kind, value, ndim) VALUES (?, ?, ?, ?, ?)",
+            [
+                (image_id, key_index, *SQLiteAnnotationStore._encode(value))
+                for key_index, value in enumerate(annotations)
+            ],
+        )
+
+    def __delitem__(self, path: Path) -> None:
+        if self._connection.execute("DELETE FROM images WHERE path = ?", (str(path),)).rowcount == 0:
+            raise KeyError(path)
+
+    def __contains__(self, path: object) -> bool:
+        return self._connection.execute("SELECT 1 FROM images WHERE path = ?", (str(path),)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[Path]:
+        for (path,) in self._connection.execute("SELECT path FROM images ORDER BY id"):
+            yield Path(path)
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+
+    def clear(self) -> None:
+        # one statement instead of deleting the images one by one
+        self._connection.execute("DELETE FROM images")
+
+    @staticmethod
+    def _encode(value: Any) -> tuple[int, Any, Optional[int]]:
+        """Return the kind, the database value and the number of point dimensions of an annotation value."""
+        if value is None:
+            return _NONE, None, None
+        if isinstance(value, PointsReference):
+            value = value.load()
+        if isinstance(value, (np.ndarray, list)):
+            points: np.ndarray = np.asarray(value, dtype=np.float32)
+            if len(points) > 0:
+                points = points.reshape(len(points), -1)
+            else:
+                # an empty list has no shape to keep, napari gives a points layer created without data two dimensions
+                points = points.reshape(0, points.shape[1] if points.ndim == 2 else 2)
+            return _POINTS, points.tobytes(), points.shape[1]
+        if isinstance(value, (bool, np.bool_)):
+            return _BOOL, int(value), None
+        if isinstance(value, (int, np.integer)):
+            return _INT, int(value), None
+        if isinstance(value, (float, np.floating)):
+            return _FLOAT, float(value), None
+        return _STRING, str(value), None
+
+    @staticmethod
+    def _decode(kind: int, value: Any, ndim: Optional[int]) -> Any:
+        """Return the annotation value saved as a database value of a kind."""
+        if kind == _POINTS:
+            return np.frombuffer(value, dtype=np.float32).reshape(-1, ndim).copy()
+        if kind == _BOOL:
+            return bool(value)
+        return value
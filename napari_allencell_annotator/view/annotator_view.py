@@ -1,6 +1,7 @@
 from enum import Enum
 from typing import Dict, List, Any
 
+import numpy as np
 from napari.layers import Points
 
 from napari_allencell_annotator.view.i_viewer import IViewer
@@ -18,6 +19,7 @@ from qtpy.QtWidgets import (
 
 from napari_allencell_annotator.model.annotation_model import AnnotatorModel
 from napari_allencell_annotator.model.key import Key
+from napari_allencell_annotator.util.points_store import PointsReference
 from napari_allencell_annotator.view.viewer import PointsLayerMode
 from napari_allencell_annotator.widgets.file_input import (
     FileInput,
@@ -238,15 +240,26 @@ class AnnotatorView(QFrame):
             the values for the annotations.
         """
         for item, annotation in zip(self.annot_list.items, vals):
+            # point annotations saved to the points store of the csv file are loaded when their image is displayed
+            if isinstance(annotation, PointsReference):
+                try:
+                    annotation = annotation.load()
+                except (OSError, ValueError) as error:
+                    self.viewer.alert(f"Could not load the saved points of {item.name.text()}: {error}")
+                    annotation = None
+
             # if the item hasn't been annotated, render the default value.
-            if annotation is None or annotation == "":
+            if annotation is None or (isinstance(annotation, str) and annotation == ""):
                 item.set_default_value()
 
             # if the item has been annotated and is a point annotation, creates and add the points layer to the viewer.
             elif item.type == ItemType.POINT:
                 annot_name: str = item.name.text()
+                # napari moves points by writing into the layer data, so the layer gets its own copy of the saved
+                # coordinates. It is a single copy of a float32 array, no per-point conversion.
                 self._annotator_model.add_points_layer(
-                    annot_name, self.viewer.create_points_layer(annot_name, True, annotation)
+                    annot_name,
+                    self.viewer.create_points_layer(annot_name, True, np.array(annotation, dtype=np.float32)),
                 )
 
             # if the item has been annotated but is not a point annotation, render the annotation value.
@@ -265,7 +278,7 @@ class AnnotatorView(QFrame):
             a list of annotation values.
         """
         annots = []
-        point_annots: dict[str, list[tuple[int]]] = self.viewer.get_all_point_annotations()
+        point_annots: dict[str, np.ndarray] = self.viewer.get_all_point_annotations()
 
         for item in self.annot_list.items:
             annot_name: str = item.name.text()
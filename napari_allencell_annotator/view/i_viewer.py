@@ -3,7 +3,7 @@ from enum import Enum
 
 import numpy as np
 from napari.layers import Layer, Points
-from typing import List, Tuple
+from typing import List, Union
 
 
 class PointsLayerMode(Enum):
@@ -26,13 +26,25 @@ class IViewer(ABC):
         super().__init__()
 
     @abstractmethod
-    def add_image(self, image: np.ndarray) -> None:
+    def add_image(self, image: Union[np.ndarray, List[np.ndarray]]) -> None:
+        pass
+
+    @abstractmethod
+    def set_image(self, image: Union[np.ndarray, List[np.ndarray]]) -> None:
         pass
 
     @abstractmethod
     def clear_layers(self) -> None:
         pass
 
+    @abstractmethod
+    def reset_points_layers(self) -> None:
+        pass
+
+    @abstractmethod
+    def hide_points_layers(self) -> None:
+        pass
+
     @abstractmethod
     def alert(self, alert_msg: str) -> None:
         pass
@@ -58,11 +70,11 @@ class IViewer(ABC):
         pass
 
     @abstractmethod
-    def get_selected_points(self, point_layer: Points) -> List[Tuple]:
+    def get_selected_points(self, point_layer: Points) -> np.ndarray:
         pass
 
     @abstractmethod
-    def get_all_point_annotations(self) -> dict[str, list[tuple]]:
+    def get_all_point_annotations(self) -> dict[str, np.ndarray]:
         pass
 
     @abstractmethod
@@ -1,7 +1,8 @@
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
-from PyQt5.QtWidgets import QListWidgetItem
+import dask.array as da
+from napari.qt.threading import FunctionWorker, GeneratorWorker, create_worker
 
 from napari_allencell_annotator.model.annotation_model import AnnotatorModel
 from napari_allencell_annotator.view.i_viewer import IViewer
@@ -11,6 +12,7 @@ from qtpy.QtWidgets import QFrame
 from qtpy.QtCore import Qt
 
 from qtpy.QtWidgets import (
+    QCheckBox,
     QLabel,
     QScrollArea,
     QGridLayout,
@@ -22,10 +24,11 @@ from napari_allencell_annotator.widgets.file_input import (
     FileInput,
     FileInputMode,
 )
-from napari_allencell_annotator.widgets.files_widget import FilesWidget, FileItem
+from napari_allencell_annotator.widgets.files_widget import FilesWidget
 from napari_allencell_annotator.util.file_utils import FileUtils
 from napari_allencell_annotator._style import Style
 
+from napari_allencell_annotator.util.image_prefetcher import ImagePrefetcher
 from napari_allencell_annotator.util.image_utils import ImageUtils
 
 
@@ -84,8 +87,17 @@ class ImagesView(QFrame):
         self.scroll.horizontalScrollBar().setEnabled(False)
         self.layout.addWidget(self.scroll, 2, 0, 10, 4)
 
+        self.include_subfolders: QCheckBox = QCheckBox("Include subfolders")
+        self.include_subfolders.setToolTip("Also add the images in the subfolders of a selected folder")
+        self.layout.addWidget(self.include_subfolders, 12, 0, 1, 4)
+
         self.num_files_label: QLabel = QLabel("Image files:")
-        self.layout.addWidget(self.num_files_label, 13, 0, 1, 4)
+        self.layout.addWidget(self.num_files_label, 13, 0, 1, 3)
+
+        self.cancel_import: QPushButton = QPushButton("Stop")
+        self.cancel_import.setToolTip("Stop adding images from the selected folder")
+        self.cancel_import.hide()
+        self.layout.addWidget(self.cancel_import, 13, 3, 1, 1)
 
         self.shuffle: QPushButton = QPushButton("Shuffle and Hide")
         self.shuffle.setCheckable(True)
@@ -101,6 +113,19 @@ class ImagesView(QFrame):
         self.setLayout(self.layout)
 
         self.viewer: IViewer = viewer
+        # opens the images next to the current one in the background while annotating
+        self._prefetcher: ImagePrefetcher = ImagePrefetcher(self._annotator_model)
+        # incremented on every display request so that images opened for earlier requests can be discarded
+        self._display_generation: int = 0
+        # worker opening an image for display, None if no image is being opened
+        self._display_worker: Optional[FunctionWorker] = None
+        # True if the current image changed while the worker was opening an earlier one
+        self._display_pending: bool = False
+        # worker walking a folder and its subfolders for images, None if no folder is being imported
+        self._import_worker: Optional[GeneratorWorker] = None
+        # number of images found and of unsupported files seen by the folder import in progress
+        self._import_num_found: int = 0
+        self._import_num_unsupported: int = 0
         self._connect_slots()
 
     def _connect_slots(self) -> None:
@@ -109,19 +134,31 @@ class ImagesView(QFrame):
         self.input_file.files_selected.connect(self._add_sorted_valid_images_in_files)
         self.shuffle.clicked.connect(self._handle_shuffle_clicked)
         self.delete.clicked.connect(self._handle_delete_clicked)
+        self.cancel_import.clicked.connect(self._stop_import)
         self.file_widget.files_selected.connect(self._toggle_delete_button_text)
 
         self._annotator_model.annotation_recorded.connect(self._display_img)
         self._annotator_model.annotation_started_changed.connect(self._handle_annotation_started)
         self._annotator_model.image_count_changed.connect(self._handle_image_count_changed)
         self._annotator_model.images_shuffled.connect(self._handle_shuffle_ui)
-        self._annotator_model.images_shuffled.connect(self.viewer.clear_layers)
+        # images found after shuffling could not be placed in the shuffled list
+        self._annotator_model.images_shuffled.connect(self._stop_import)
+        self._annotator_model.images_shuffled.connect(self._clear_display)
+        # prefetched images are tied to the indices of the image list, which these change
+        self._annotator_model.images_shuffled.connect(self._prefetcher.clear)
+        self._annotator_model.image_set_added.connect(self._prefetcher.clear)
+        # the prefetch threads would otherwise outlive the widget
+        self.destroyed.connect(self._prefetcher.shutdown)
+        # an imported session replaces the image list, which the images the folder import finds are not part of
+        self._annotator_model.image_set_added.connect(self._stop_import)
 
     def _handle_annotation_started(self) -> None:
         """
-        Display the current image when annotation starts.
+        Display the current image when annotation starts, and stop the folder import in progress, if any, since the
+        images cannot change while annotating.
         """
         if self._annotator_model.is_annotation_started():
+            self._stop_import()
             self._display_img()
 
     def _handle_shuffle_ui(self, checked: bool) -> None:
@@ -198,18 +235,114 @@ class ImagesView(QFrame):
         """
         Display the current image in napari.
 
+        Images are opened on a worker thread while the previous image, if any, stays on the canvas with its points
+        layers hidden, so that they cannot be edited in the meantime. Once the image is displayed, the points layers
+        are emptied for its annotations, which are rendered then. Only one image is opened at a time: requests made
+        while one is being opened are coalesced into the latest one, and a result that is no longer the current image
+        when it arrives is discarded.
+        """
+        current: Path = self._annotator_model.get_curr_img()
+        if current is None:
+            self._clear_display()
+            return
+
+        # any image being opened for an earlier request is now stale
+        self._display_generation += 1
+        self._annotator_model.set_image_displayed(False)
+
+        # the points layers are reused for the new image, once it is displayed
+        self.viewer.hide_points_layers()
+        self._prefetcher.prefetch_neighbors()
+        if self._display_worker is None:
+            self._start_display_worker()
+        else:
+            # picked up once the image being opened is done
+            self._display_pending = True
+
+    def _clear_display(self) -> None:
+        """Clear all layers and discard any image being opened for display."""
+        self._display_generation += 1
+        self._display_pending = False
+        self.viewer.clear_layers()
+        self._annotator_model.set_image_displayed(False)
+
+    def _open_image_data(self, path: Path) -> Union[da.Array, list[da.Array]]:
+        """
+        Open an image and return the data to display for it.
+
         Parameters
         ----------
-        current: FileItem
-            Current file
-        previous: FileItem
-            Previous file
+        path: Path
+            The path to the image
+
+        Returns
+        -------
+        Union[da.Array, list[da.Array]]
+            The resolution levels of the image if it is multiscale, otherwise its full resolution data
+        """
+        image: ImageUtils = self._prefetcher.get_image(path)
+        if image.is_multiscale():
+            # let napari only fetch the resolution level and tiles that are in view
+            return image.get_image_multiscale_dask_data()
+        else:
+            return image.get_image_dask_data()
+
+    def _start_display_worker(self) -> None:
+        """Start opening the current image on a worker thread."""
+        generation: int = self._display_generation
+        path: Path = self._annotator_model.get_curr_img()
+
+        # errors are reported by _handle_image_open_failed, connecting it up front keeps them from being re-raised
+        self._display_worker = create_worker(
+            self._open_image_data,
+            path,
+            _connect={"errored": lambda error: self._handle_image_open_failed(error, path, generation)},
+            _start_thread=False,
+        )
+        self._display_worker.returned.connect(lambda data: self._handle_image_opened(data, generation))
+        self._display_worker.finished.connect(self._handle_display_worker_finished)
+        self._display_worker.start()
+
+    def _handle_image_opened(self, data: Union[da.Array, list[da.Array]], generation: int) -> None:
         """
-        self.viewer.clear_layers()
+        Display an opened image if it is still the current image, and empty the points layers for its annotations.
 
-        current: Path = self._annotator_model.get_curr_img()
-        if current is not None:
-            self.viewer.add_image(ImageUtils(current).get_image_dask_data())
+        Parameters
+        ----------
+        data: Union[da.Array, list[da.Array]]
+            The data to display
+        generation: int
+            The display request the image was opened for
+        """
+        if generation == self._display_generation:
+            self.viewer.set_image(data)
+            self.viewer.reset_points_layers()
+            self._annotator_model.set_image_displayed(True)
+
+    def _handle_image_open_failed(self, error: Exception, path: Path, generation: int) -> None:
+        """
+        Alert the user that the current image could not be opened, and clear the canvas so that the previous image is
+        not left on it in place of this one.
+
+        Parameters
+        ----------
+        error: Exception
+            The error raised while opening the image
+        path: Path
+            The path to the image
+        generation: int
+            The display request the image was opened for
+        """
+        if generation == self._display_generation:
+            self.viewer.alert(f"Could not open {FileUtils.get_file_name(path)}: {error}")
+            self.viewer.clear_layers()
+
+    def _handle_display_worker_finished(self) -> None:
+        """Start opening the current image if it changed while the finished worker was opening an earlier one."""
+        self._display_worker = None
+        if self._display_pending:
+            self._display_pending = False
+            self._start_display_worker()
 
     def update_num_files_label(self, num_files: int) -> None:
         """
@@ -220,7 +353,10 @@ class ImagesView(QFrame):
         num_files: int
             The number of image files
         """
-        self.num_files_label.setText(f"Image files: {num_files}")
+        if self._import_worker is not None:
+            self.num_files_label.setText(f"Image files: {num_files} (scanning...)")
+        else:
+            self.num_files_label.setText(f"Image files: {num_files}")
 
     def _add_sorted_valid_images_in_files(self, file_list: list[Path]) -> None:
         all_sorted_valid_files: list[Path] = FileUtils.get_valid_images_sorted(file_list)
@@ -233,53 +369,122 @@ class ImagesView(QFrame):
         """
         Adds all files in a directory to the GUI.
 
+        If include_subfolders is checked, the directory and its subfolders are walked on a worker thread and the
+        images are added as they are found.
+
         Parameters
         ----------
         dir_path : Path
             The directory path
         """
-        # get both files and folders
-        dir_files = list(dir_path.glob("*"))
-        all_sorted_valid_files_in_dir: list[Path] = FileUtils.get_valid_images_sorted(dir_files)
+        if self.include_subfolders.isChecked():
+            self._start_import(dir_path)
+            return
+
+        all_sorted_valid_files_in_dir: list[Path]
+        num_unsupported: int
+        all_sorted_valid_files_in_dir, num_unsupported = FileUtils.get_valid_images_sorted_in_dir(dir_path)
 
         if len(all_sorted_valid_files_in_dir) < 1:
             self.viewer.alert("Folder is empty")
         else:
             self._add_selected_files(all_sorted_valid_files_in_dir)
 
-        if len(all_sorted_valid_files_in_dir) != len([file for file in dir_files if not file.name.startswith(".")]):
+        if num_unsupported > 0:
             self.viewer.alert("Unsupported file type(s)")
 
-    def add_new_item(self, file: Path, hidden: Optional[bool] = False) -> None:
+    def _start_import(self, dir_path: Path) -> None:
         """
-        Add a new image to the model and the file widget.
+        Start walking a directory and its subfolders for images on a worker thread.
 
-        Optional hidden parameter toggles file name visibility. This function emits a files_added signal when this is
-        the first file added and updates num_files_label.
+        Parameters
+        ----------
+        dir_path : Path
+            The directory path
+        """
+        if self._import_worker is not None:
+            return
+
+        self._import_num_found = 0
+        self._import_num_unsupported = 0
+        self._import_worker = create_worker(
+            FileUtils.iter_valid_images_in_tree,
+            dir_path,
+            _connect={"errored": lambda error: self.viewer.alert(f"Could not read {dir_path}: {error}")},
+            _start_thread=False,
+        )
+        self._import_worker.yielded.connect(self._handle_import_batch)
+        self._import_worker.finished.connect(self._handle_import_finished)
+
+        self.disable_add_buttons()
+        self.include_subfolders.setEnabled(False)
+        self.cancel_import.show()
+        self.update_num_files_label(self._annotator_model.get_num_images())
+        self._import_worker.start()
+
+    def _handle_import_batch(self, batch: tuple[list[Path], int]) -> None:
+        """
+        Add a batch of images found by the folder import.
+
+        Parameters
+        ----------
+        batch : tuple[list[Path], int]
+            The images found and the number of unsupported files seen since the previous batch
+        """
+        if self._import_worker is None or self._import_worker.abort_requested:
+            # batches queued before the import was stopped
+            return
+        images, num_unsupported = batch
+        self._import_num_found += len(images)
+        self._import_num_unsupported += num_unsupported
+        self._add_selected_files(images)
+
+    def _handle_import_finished(self) -> None:
+        """Restore the buttons once the folder import is done or stopped and report what it found."""
+        aborted: bool = self._import_worker.abort_requested
+        self._import_worker = None
+
+        self.cancel_import.hide()
+        self.include_subfolders.setEnabled(True)
+        if not self._annotator_model.is_images_shuffled():
+            self.enable_add_buttons()
+        self.update_num_files_label(self._annotator_model.get_num_images())
+
+        if not aborted:
+            if self._import_num_found < 1:
+                self.viewer.alert("Folder is empty")
+            if self._import_num_unsupported > 0:
+                self.viewer.alert("Unsupported file type(s)")
+
+    def _stop_import(self) -> None:
+        """Stop the folder import in progress, if any. Images it has already added are kept."""
+        if self._import_worker is not None:
+            self._import_worker.quit()
+
+    def add_new_item(self, file: Path) -> None:
+        """
+        Add a new image to the model, which adds it to the file widget.
 
         Parameters
         ----------
         file: Path
             The file path of a new image to be added
-        hidden : Optional[bool]
-            File name visibility
         """
-        # TODO update model, which dispatches event, and have filewidget react to it.
-        self.file_widget.add_item(file, hidden)
-        self._annotator_model.add_image(file)  # update model
+        self._annotator_model.add_image(file)
 
     def _add_selected_files(self, file_list: list[Path]) -> None:
         """
         Adds all selected files to the GUI and update state
 
+        Images that have already been added are skipped. The model is updated once for the whole list, so the file
+        widget and the file count label are updated once as well.
+
         Parameters
         ----------
         file_list : List[Path]
             The list of files
         """
-        for file_path in file_list:
-            if file_path not in self._annotator_model.get_all_images():
-                self.add_new_item(file_path)
+        self._annotator_model.add_images(file_list)
 
     def _handle_shuffle_clicked(self) -> None:
         """
@@ -329,48 +534,47 @@ class ImagesView(QFrame):
 
     def delete_checked(self) -> None:
         """
-        Delete the checked items from the model and the file widget.
+        Delete the checked items from the model, which removes them from the file widget.
         """
-        for item in self.file_widget.checked:
-            self.remove_image(item)
-
+        self._remove_images(list(self.file_widget.checked))
         self.file_widget.checked.clear()
 
-    def remove_image(self, item: FileItem) -> None:
+    def remove_image(self, file: Path) -> None:
         """
-        Remove an image file from the model and the file widget.
-
-        This function emits a files_added signal when the item to remove is the only item and updates num_files_label.
+        Remove an image file from the model, which removes it from the file widget.
 
         Parameters
         ----------
-        item: FileItem
-            An item to be removed.
+        file: Path
+            The file to be removed.
         """
-        # TODO when we delete from the model, connect file widget so that it deletes that entry itself without
-        # us explicitly calling remove_item on it
-        if item.file_path in self._annotator_model.get_all_images():
-            if self.file_widget.currentItem() == item:
-                self.viewer.clear_layers()
+        self._remove_images([file])
 
-            self.file_widget.remove_item(item)
-            self._annotator_model.remove_image(item.file_path)
-            self.update_num_files_label(self._annotator_model.get_num_images())
+    def _remove_images(self, files: list[Path]) -> None:
+        """
+        Remove image files from the model, clearing the display if the current image is one of them.
+
+        Parameters
+        ----------
+        files: list[Path]
+            The files to be removed.
+        """
+        if self._annotator_model.get_curr_img() in files:
+            self._clear_display()
+        self._annotator_model.remove_images(files)
 
     def clear_all(self) -> None:
         """
-        Clear all image data from the model and the file widget.
+        Clear all image data from the model and the file widget, and stop the folder import in progress, if any.
         """
+        self._stop_import()
         self._annotator_model.clear_all_images()  # clear model
         # self._annotator_model.set_shuffled_images(None)  # clear shuffled images, if any
 
     def start_annotating(self) -> None:
         """Set current item to the one at row."""
-        count: int = self.file_widget.count()
-        for x in range(count):
-            file_item: Optional[QListWidgetItem] = self.file_widget.item(x)
-            file_item.hide_check()
-        else:
+        self.file_widget.hide_checks()
+        if self.file_widget.count() == 0:
             self.viewer.alert("No files to annotate")
 
     def hide_image_paths(self) -> None:
@@ -388,7 +592,8 @@ class ImagesView(QFrame):
             self._enable_delete_button()
             self._enable_shuffle_button()
         else:
-            self.viewer.clear_layers()
+            self._clear_display()
+            self._prefetcher.clear()
             self.reset_buttons()
 
     def stop_annotating(self):
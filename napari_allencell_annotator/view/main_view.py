@@ -1,8 +1,11 @@
-import csv
 from pathlib import Path
 
+from napari_allencell_annotator.core.session import Session
 from napari_allencell_annotator.model.annotation_model import AnnotatorModel
+from napari_allencell_annotator.util.csv_utils import CSVUtils
 from napari_allencell_annotator.util.file_utils import FileUtils
+from napari_allencell_annotator.util.parquet_utils import ParquetUtils
+from napari_allencell_annotator.util.sqlite_store import SQLiteAnnotationStore
 from napari_allencell_annotator.view.images_view import ImagesView
 from qtpy import QtCore
 from qtpy.QtWidgets import QFrame, QShortcut
@@ -17,7 +20,12 @@ from napari_allencell_annotator.view.viewer import Viewer
 from napari_allencell_annotator.view.i_viewer import IViewer
 
 import napari
-from typing import List, Union
+import sqlite3
+from collections.abc import MutableMapping
+from functools import partial
+from typing import Any, List, Optional, Union
+
+from napari.qt.threading import GeneratorWorker, create_worker
 
 
 class MainView(QFrame):
@@ -48,6 +56,16 @@ class MainView(QFrame):
 
         self.annots = AnnotatorController(self._annotator_model, self._viewer)
 
+        # worker reading a csv file being imported, None if no csv file is being imported
+        self._csv_import_worker: Optional[GeneratorWorker] = None
+        self._csv_import_path: Optional[Path] = None
+        self._csv_import_shuffled: bool = False
+        self._csv_import_use_annots: bool = False
+        # images read from a shuffled csv file, added once the whole file is read
+        self._csv_import_images: list[Path] = []
+        self._csv_import_num_skipped: int = 0
+        self._csv_import_num_unreadable: int = 0
+
         # set layout and add sub views
         self.setLayout(QVBoxLayout())
         self.layout().addWidget(self._images_view, stretch=1)
@@ -56,6 +74,8 @@ class MainView(QFrame):
         # key shortcuts
         self._shortcut_key_next = QShortcut(QKeySequence(QtCore.Qt.CTRL + QtCore.Qt.Key_Greater), self)
         self._shortcut_key_prev = QShortcut(QKeySequence(QtCore.Qt.CTRL + QtCore.Qt.Key_Less), self)
+        self._shortcut_key_next_incomplete = QShortcut(QKeySequence(QtCore.Qt.CTRL + QtCore.Qt.Key_BracketRight), self)
+        self._shortcut_key_prev_incomplete = QShortcut(QKeySequence(QtCore.Qt.CTRL + QtCore.Qt.Key_BracketLeft), self)
         self._shortcut_key_down = QShortcut(QKeySequence(QtCore.Qt.CTRL + QtCore.Qt.Key_Return), self)
         self._shortcut_key_up = QShortcut(QKeySequence(QtCore.Qt.CTRL + QtCore.Qt.SHIFT + QtCore.Qt.Key_Return), self)
         self._shortcut_key_check = QShortcut(QKeySequence(QtCore.Qt.CTRL + QtCore.Qt.SHIFT + QtCore.Qt.Key_Space), self)
@@ -77,6 +97,7 @@ class MainView(QFrame):
         self.annots.view.create_btn.clicked.connect(self._create_clicked)
         self.annots.view.save_json_btn.file_selected.connect(self._json_write_selected_evt)
         self.annots.view.edit_btn.clicked.connect(self._create_clicked)
+        self.annots.view.cancel_btn.clicked.connect(self._stop_csv_import)
 
         # handle events
         self._annotator_model.image_changed.connect(self._image_selected)
@@ -124,67 +145,193 @@ class MainView(QFrame):
                 self.annots.read_json(file_path)
 
             elif file_path.suffix == ".csv":
+                try:
+                    shuffled: bool
+                    annts: str
+                    header: list[str]
+                    shuffled, annts, header = CSVUtils.read_csv_header(file_path)
+                except (OSError, ValueError) as error:
+                    self._viewer.alert(f"Could not import annotations: {error}")
+                    return
+
                 use_annots = Popup.make_popup(
                     "Would you like to use the images and annotation values from "
                     "this csv in addition to the annotation template?\n\n "
                     "\n Note: any currently listed images will be cleared."
                 )
-                file = open(file_path)
-                reader = csv.reader(file)
-                shuffled: bool = self.str_to_bool(next(reader)[1])
-                # annotation data header
-                annts = next(reader)[1]
                 # set annotation Key dict in model with json header info
                 self.annots.get_annotations_csv(annts)
-                # skip actual header
-                next(reader)
-                image_list: list[Path] = []
-                if use_annots:
-                    # init annotations dict and fill with data from csv
-                    self._annotator_model.set_annotations({})
-
-                for row in reader:
-                    # for each line, add data to already annotated and check if there are null values
-                    # if null, starting row for annotations is set
-                    path: Path = Path(row[1])
-                    image_list.append(path)
-                    if use_annots:
-                        self._annotator_model.add_annotation(path, self._process_points_annotations(row[2:]))
-                    # self._images_view.add_new_item(path)
-                # start at row 0 if annotation data was not used from csv
-                file.close()
-                self._annotator_model.set_all_images(image_list)
-                if shuffled:
-                    self._annotator_model.set_shuffled_images(
-                        FileUtils.shuffle_file_list(self._annotator_model.get_all_images())
-                    )
-                else:
-                    self._annotator_model.set_shuffled_images(None)
+                self._start_csv_import(file_path, len(header), shuffled, use_annots)
+
+            elif ParquetUtils.is_parquet(file_path) or SQLiteAnnotationStore.is_sqlite(file_path):
+                try:
+                    session: Session = Session.load(file_path)
+                except (ImportError, OSError, ValueError) as error:
+                    self._viewer.alert(f"Could not import annotations: {error}")
+                    return
+
+                use_annots = Popup.make_popup(
+                    "Would you like to use the images and annotation values from "
+                    "this file in addition to the annotation template?\n\n "
+                    "\n Note: any currently listed images will be cleared."
+                )
+                self._annotator_model.set_annotation_keys(session.annotation_keys)
+                self._import_session(session, use_annots)
 
             self.annots.start_viewing(use_annots)
 
-    def _process_points_annotations(self, annotations: list[any]) -> list[any]:
+    def _import_session(self, session: Session, use_annots: bool) -> None:
         """
-        Convert string representations of point annotations to lists of tuples
+        Replace the listed images with those of a session loaded from a parquet file or a database. The annotations
+        of a database are kept in it, not read into memory.
 
         Parameters
         ----------
-        annotations: list[any]
-            The list of annotations read from the CSV
+        session: Session
+            The session
+        use_annots: bool
+            Whether to import the annotation values as well as the images
+        """
+        self._stop_csv_import()
+        if use_annots:
+            self._annotator_model.set_annotations(session.annotations)
+        if self._annotator_model.is_images_shuffled():
+            self._annotator_model.set_shuffled_images(None)
+        self._annotator_model.set_all_images(list(session.annotations))
+        if session.shuffled:
+            self._annotator_model.set_shuffled_images(
+                FileUtils.shuffle_file_list(self._annotator_model.get_all_images())
+            )
 
-        Returns
-        -------
-        list[any]:
-            The same list of annotations with points annotations as lists of tuples
+    def _start_csv_import(self, file_path: Path, num_columns: int, shuffled: bool, use_annots: bool) -> None:
         """
-        # if that image has been annotated
-        if len(annotations) > 0:
-            for annotation_index, key in enumerate(self._annotator_model.get_annotation_keys().values()):
-                # if the annotation is point annotation and has been annotated, convert string to list of tuples.
-                if key.get_type() == "point" and annotations[annotation_index] != "":
-                    annotations[annotation_index] = eval(annotations[annotation_index])
+        Replace the listed images with those of a csv file, read on a worker thread and added in batches so the first
+        images can be displayed while the rest of the file is read. Images of a shuffled csv file are added once the
+        whole file is read, since listing them unshuffled in the meantime would show their names.
 
-        return annotations
+        Parameters
+        ----------
+        file_path: Path
+            The path to the csv file
+        num_columns: int
+            The number of columns of the csv file
+        shuffled: bool
+            Whether the images in the csv file are shuffled
+        use_annots: bool
+            Whether to import the annotation values as well as the images
+        """
+        self._stop_csv_import()
+        self._csv_import_path = file_path
+        self._csv_import_shuffled = shuffled
+        self._csv_import_use_annots = use_annots
+        self._csv_import_images = []
+        self._csv_import_num_skipped = 0
+        self._csv_import_num_unreadable = 0
+
+        if use_annots:
+            # init annotations dict and fill with data from csv
+            self._annotator_model.set_annotations({})
+        if self._annotator_model.is_images_shuffled():
+            self._annotator_model.set_shuffled_images(None)
+        self._annotator_model.set_all_images([])
+
+        worker: GeneratorWorker = create_worker(
+            Session.iter_csv_images,
+            file_path,
+            num_columns,
+            Session.get_point_columns(self._annotator_model.get_annotation_keys()),
+            use_annots,
+            _connect={"errored": self._handle_csv_import_failed},
+            _start_thread=False,
+        )
+        worker.yielded.connect(partial(self._handle_csv_import_batch, worker))
+        worker.finished.connect(partial(self._handle_csv_import_finished, worker))
+        self._csv_import_worker = worker
+        # the images are reordered when annotating starts, which needs all of them
+        self.annots.view.start_btn.setEnabled(False)
+        worker.start()
+
+    def _handle_csv_import_batch(
+        self, worker: GeneratorWorker, batch: tuple[list[tuple[Path, Optional[list[Any]]]], int, int]
+    ) -> None:
+        """
+        Add a batch of images and annotation values read from a csv file.
+
+        Parameters
+        ----------
+        worker: GeneratorWorker
+            The worker that read the batch
+        batch: tuple[list[tuple[Path, Optional[list[Any]]]], int, int]
+            The images with their annotation values, the number of incomplete rows skipped and the number of images
+            whose point annotations could not be read
+        """
+        if worker is not self._csv_import_worker or worker.abort_requested:
+            # batches queued before the import was stopped or replaced
+            return
+        images: list[tuple[Path, Optional[list[Any]]]]
+        num_skipped: int
+        num_unreadable: int
+        images, num_skipped, num_unreadable = batch
+        self._csv_import_num_skipped += num_skipped
+        self._csv_import_num_unreadable += num_unreadable
+
+        if self._csv_import_use_annots:
+            for path, annotations in images:
+                if annotations is not None:
+                    self._annotator_model.add_annotation(path, annotations)
+        if self._csv_import_shuffled:
+            self._csv_import_images.extend(path for path, _ in images)
+        else:
+            self._annotator_model.add_images([path for path, _ in images])
+
+    def _handle_csv_import_failed(self, error: Exception) -> None:
+        self._viewer.alert(f"Could not finish importing {self._csv_import_path.name}: {error}")
+
+    def _handle_csv_import_finished(self, worker: GeneratorWorker) -> None:
+        """
+        Shuffle the imported images if the csv file was shuffled, and report rows that could not be imported.
+
+        Parameters
+        ----------
+        worker: GeneratorWorker
+            The worker that finished
+        """
+        if worker is not self._csv_import_worker:
+            return
+        self._csv_import_worker = None
+        self.annots.view.start_btn.setEnabled(True)
+        if worker.abort_requested:
+            return
+
+        if self._csv_import_use_annots:
+            # everything imported is already saved in the csv or its journal
+            self._annotator_model.clear_dirty_annotations()
+        if self._csv_import_shuffled:
+            self._annotator_model.set_all_images(self._csv_import_images)
+            self._annotator_model.set_shuffled_images(
+                FileUtils.shuffle_file_list(self._annotator_model.get_all_images())
+            )
+            self._csv_import_images = []
+
+        if self._csv_import_num_skipped > 0:
+            self._viewer.alert(
+                f"{self._csv_import_path.name} was not completely saved, "
+                f"{self._csv_import_num_skipped} incomplete row(s) were skipped"
+            )
+        if self._csv_import_num_unreadable > 0:
+            self._viewer.alert(
+                f"The point annotations of {self._csv_import_num_unreadable} image(s) in "
+                f"{self._csv_import_path.name} could not be read, those images were imported without annotations"
+            )
+
+    def _stop_csv_import(self) -> None:
+        """Stop reading a csv file. The images and annotations already added are kept."""
+        if self._csv_import_worker is not None:
+            self._csv_import_worker.quit()
+            self._csv_import_worker = None
+            self.annots.view.start_btn.setEnabled(True)
+            if self._csv_import_use_annots:
+                self._annotator_model.clear_dirty_annotations()
 
     def _shuffle_toggled(self, checked: bool):
         """
@@ -240,11 +387,43 @@ class MainView(QFrame):
             The list containing one file name.
         """
         extension = file_path.suffix
-        if extension != ".csv":
+        if ParquetUtils.is_parquet(file_path):
+            if not ParquetUtils.is_available():
+                self._viewer.alert(
+                    "Saving to parquet files needs pyarrow: pip install napari-allencell-annotator[parquet]"
+                )
+                return
+        elif SQLiteAnnotationStore.is_sqlite(file_path):
+            try:
+                self._use_annotation_store(file_path)
+            except sqlite3.Error as error:
+                self._viewer.alert(f"Could not open {file_path.name}: {error}")
+                return
+        elif extension != ".csv":
             file_path = file_path.with_suffix(".csv")
         self._annotator_model.set_csv_save_path(file_path)
         self._setup_annotating()
 
+    def _use_annotation_store(self, db_path: Path) -> None:
+        """
+        Keep the annotations in a database from now on, moving any annotations already made or imported into it.
+
+        Parameters
+        ----------
+        db_path: Path
+            The path to the database
+        """
+        annotations: Optional[MutableMapping] = self._annotator_model.get_annotations()
+        if isinstance(annotations, SQLiteAnnotationStore) and annotations.path == db_path:
+            return
+        store: SQLiteAnnotationStore = SQLiteAnnotationStore(db_path)
+        # like a csv file, a database chosen to save to is overwritten
+        store.clear()
+        if annotations is not None:
+            store.update(annotations)
+        store.commit()
+        self._annotator_model.set_annotations(store)
+
     def _start_annotating_clicked(self):
         """
         Verify that images are added and user wants to proceed, then
@@ -293,33 +472,36 @@ class MainView(QFrame):
             self._annotator_model.set_annotations({})
 
         else:
-            # we have preloaded annotations from a csv, reorder so already annotated images are at the front
-
-            old_images_list: list[Path] = self._annotator_model.get_all_images()
-            new_images_list: list[Path] = []
-            self._annotator_model.empty_image_list()  # reset images list
-            for annot_path, annot_list in self._annotator_model.get_annotations().items():
+            # we have preloaded annotations from a csv, reorder so already annotated images are at the front.
+            # stable partition in one pass over each: images with complete annotations, then partially annotated
+            # images, both in the order of the annotations, then the images without annotations in list order.
+            annotations: dict[Path, list[Any]] = self._annotator_model.get_annotations()
+            complete_images: list[Path] = []
+            partial_images: list[Path] = []
+            for annot_path, annot_list in annotations.items():
                 # if the image with the existing annotations exists
-                if annot_path in old_images_list:
-                    # if the annotation is complete move to front
-                    if annot_list and len(annot_list) == len(self._annotator_model.get_annotation_keys()):
-                        new_images_list.insert(starting_idx, annot_path)
-                        old_images_list.remove(annot_path)
-                        starting_idx = starting_idx + 1
+                if self._annotator_model.contains_image(annot_path):
+                    if self._annotator_model.is_annotation_complete(annot_list):
+                        complete_images.append(annot_path)
                     else:
-                        # otherwise add to back
-                        new_images_list.append(annot_path)
-                        old_images_list.remove(annot_path)
+                        partial_images.append(annot_path)
+            untouched_images: list[Path] = [
+                image for image in self._annotator_model.get_all_images() if image not in annotations
+            ]
+            self._annotator_model.empty_image_list()  # reset images list
 
             # use all images if not shuffled, shuffled image list if it is shuffled
             if not self._annotator_model.is_images_shuffled():
-                self._annotator_model.set_all_images(new_images_list + old_images_list)
+                self._annotator_model.set_all_images(complete_images + partial_images + untouched_images)
             else:
-                self._annotator_model.set_shuffled_images(new_images_list + old_images_list)
+                self._annotator_model.set_shuffled_images(complete_images + partial_images + untouched_images)
 
-            # if all images annotated, start at 1 minus index
-            if starting_idx >= self._annotator_model.get_num_images():
-                starting_idx = starting_idx - 1
+            # start at the first image that is not completely annotated, the last image if all of them are
+            first_incomplete_idx: Optional[int] = self._annotator_model.get_first_incomplete_index()
+            if first_incomplete_idx is not None:
+                starting_idx = first_incomplete_idx
+            else:
+                starting_idx = max(self._annotator_model.get_num_images() - 1, 0)
 
         self.annotating_shortcuts_on()
         if self._annotator_model.is_images_shuffled():
@@ -350,6 +532,8 @@ class MainView(QFrame):
 
         self._shortcut_key_next.activated.connect(self._next_image_clicked)
         self._shortcut_key_prev.activated.connect(self._prev_image_clicked)
+        self._shortcut_key_next_incomplete.activated.connect(self._next_incomplete_image_clicked)
+        self._shortcut_key_prev_incomplete.activated.connect(self._prev_incomplete_image_clicked)
         self._shortcut_key_down.activated.connect(self.annots.view.annot_list.next_item)
         self._shortcut_key_up.activated.connect(self.annots.view.annot_list.prev_item)
         self._shortcut_key_check.activated.connect(self._toggle_check)
@@ -358,6 +542,8 @@ class MainView(QFrame):
         """Disconnect signals and slots for annotation shortcuts"""
         self._shortcut_key_next.activated.disconnect(self._next_image_clicked)
         self._shortcut_key_prev.activated.disconnect(self._prev_image_clicked)
+        self._shortcut_key_next_incomplete.activated.disconnect(self._next_incomplete_image_clicked)
+        self._shortcut_key_prev_incomplete.activated.disconnect(self._prev_incomplete_image_clicked)
         self._shortcut_key_down.activated.disconnect(self.annots.view.annot_list.next_item)
         self._shortcut_key_up.activated.disconnect(self.annots.view.annot_list.prev_item)
         self._shortcut_key_check.activated.disconnect(self._toggle_check)
@@ -542,6 +728,28 @@ class MainView(QFrame):
         self._annotator_model.set_curr_img_index(self._annotator_model.get_curr_img_index() - 1)
         self.annots.view.save_btn.setEnabled(True)
 
+    def _next_incomplete_image_clicked(self):
+        """Move to the next image whose annotations are not complete."""
+        idx: Optional[int] = self._annotator_model.get_next_incomplete_index(self._annotator_model.get_curr_img_index())
+        if idx is None:
+            self._viewer.alert("All images after this one are annotated")
+            return
+        self._annotator_model.set_previous_image_index(self._annotator_model.get_curr_img_index())
+        self._annotator_model.set_curr_img_index(idx)
+        self.annots.view.save_btn.setEnabled(True)
+
+    def _prev_incomplete_image_clicked(self):
+        """Move to the previous image whose annotations are not complete."""
+        idx: Optional[int] = self._annotator_model.get_previous_incomplete_index(
+            self._annotator_model.get_curr_img_index()
+        )
+        if idx is None:
+            self._viewer.alert("All images before this one are annotated")
+            return
+        self._annotator_model.set_previous_image_index(self._annotator_model.get_curr_img_index())
+        self._annotator_model.set_curr_img_index(idx)
+        self.annots.view.save_btn.setEnabled(True)
+
     def _image_selected(self):
         """
         Record the annotations for the previously selected image and set current image.
@@ -572,11 +780,4 @@ class MainView(QFrame):
         bool
             True if null values are in the list.
         """
-
-        if len(lst) < len(self._annotator_model.get_annotation_keys().keys()):
-            return True
-        else:
-            for item in lst:
-                if item is None or item == "":
-                    return True
-        return False
+        return not self._annotator_model.is_annotation_complete(lst)
@@ -1,8 +1,8 @@
-from typing import List, Tuple
+from typing import List, Union
 from enum import Enum
 
 import numpy as np
-from napari.layers import Layer, Points
+from napari.layers import Image, Layer, Points
 from napari_allencell_annotator.view.i_viewer import IViewer
 from napari.utils.notifications import show_info
 import napari
@@ -41,23 +41,98 @@ class Viewer(IViewer):
             "blue",
             "purple",
         ]
+        # names of points layers that were emptied by reset_points_layers() and have not been reused yet
+        self._recycled_points_layers: set[str] = set()
 
-    def add_image(self, image: np.ndarray) -> None:
+    def add_image(self, image: Union[np.ndarray, List[np.ndarray]]) -> None:
         """
         Add an image to the napari viewer
 
         Parameters
         ----------
-        image: np.ndarray
-            An image to be added
+        image: Union[np.ndarray, List[np.ndarray]]
+            An image to be added, or a list of its resolution levels (highest resolution first) to add it as a
+            multiscale image
         """
-        self.viewer.add_image(image)
+        self.viewer.add_image(image, multiscale=isinstance(image, list))
+
+    def set_image(self, image: Union[np.ndarray, List[np.ndarray]]) -> None:
+        """
+        Display an image in the napari viewer, replacing the image that is currently displayed.
+
+        If the current image layer has the same dimensionality, dtype, and multiscale-ness as the new image, its data is
+        swapped in place, which keeps its vispy nodes and colormap, and its contrast limits are reset to the range of
+        the new image. Otherwise, the image layer is replaced by a new one under the points layers, which are kept with
+        the annotations they hold.
+
+        Parameters
+        ----------
+        image: Union[np.ndarray, List[np.ndarray]]
+            An image to be displayed, or a list of its resolution levels (highest resolution first) to display it as a
+            multiscale image
+        """
+        image_layers: List[Image] = [layer for layer in self.get_layers() if isinstance(layer, Image)]
+        if len(image_layers) == 1 and self._is_compatible(image_layers[0], image):
+            image_layers[0].data = image
+            # the new image may have a different intensity range, give it the auto contrast a new layer would get
+            image_layers[0].reset_contrast_limits()
+            if not image_layers[0].multiscale:
+                # as for a new layer, the slider spans the intensities of the image rather than those of every image
+                image_layers[0].contrast_limits_range = image_layers[0].contrast_limits
+        else:
+            for image_layer in image_layers:
+                self.viewer.layers.remove(image_layer)
+            self.add_image(image)
+            # keep the image under the points layers
+            self.viewer.layers.move(len(self.viewer.layers) - 1, 0)
+
+    @staticmethod
+    def _is_compatible(image_layer: Image, image: Union[np.ndarray, List[np.ndarray]]) -> bool:
+        """
+        Returns whether an image can be swapped into an image layer in place.
+
+        Parameters
+        ----------
+        image_layer: Image
+            The image layer currently displayed
+        image: Union[np.ndarray, List[np.ndarray]]
+            The image to be displayed
+        """
+        multiscale: bool = isinstance(image, list)
+        full_resolution: np.ndarray = image[0] if multiscale else image
+        return (
+            image_layer.multiscale == multiscale
+            and image_layer.ndim == full_resolution.ndim
+            and image_layer.dtype == full_resolution.dtype
+        )
 
     def clear_layers(self) -> None:
         """
         Clear all images from the napari viewer
         """
         self.viewer.layers.clear()
+        self._recycled_points_layers.clear()
+
+    def reset_points_layers(self) -> None:
+        """
+        Empty and hide all points layers so they can be reused by create_points_layer() for the next image instead of
+        being removed and rebuilt. Points layers that are not reused are left out of get_all_point_annotations().
+        """
+        for points_layer in self.get_all_points_layers():
+            points_layer.selected_data = []
+            self.set_points_layer_mode(points_layer, PointsLayerMode.PAN_ZOOM)
+            points_layer.data = np.empty((0, points_layer.ndim))
+            points_layer.visible = False
+            self._recycled_points_layers.add(points_layer.name)
+
+    def hide_points_layers(self) -> None:
+        """
+        Hide all points layers and stop editing them, keeping their points, while the image they annotate is replaced.
+        """
+        for points_layer in self.get_all_points_layers():
+            points_layer.selected_data = []
+            self.set_points_layer_mode(points_layer, PointsLayerMode.PAN_ZOOM)
+            points_layer.visible = False
 
     def alert(self, alert_msg: str) -> None:
         """
@@ -86,6 +161,8 @@ class Viewer(IViewer):
         """
         Creates a new point layer and sets to ADD mode to allow users to select points.
 
+        If a points layer with the same name was emptied by reset_points_layers(), that layer is reused.
+
         Parameters
         ----------
         name: str
@@ -100,7 +177,17 @@ class Viewer(IViewer):
         Points
             A new point layer
         """
-        color: str = self.colors[len(self.get_all_points_layers())]
+        if name in self._recycled_points_layers:
+            self._recycled_points_layers.remove(name)
+            for recycled_layer in self.get_all_points_layers():
+                if recycled_layer.name == name:
+                    if data is not None:
+                        recycled_layer.data = data
+                    recycled_layer.visible = visible
+                    return recycled_layer
+
+        # the points layers include those waiting to be reused, so there can be more of them than colors
+        color: str = self.colors[len(self.get_all_points_layers()) % len(self.colors)]
         points_layer: Points = self.viewer.add_points(
             data=data, name=name, face_color=color, visible=visible, ndim=self.viewer.dims.ndim
         )
@@ -122,9 +209,9 @@ class Viewer(IViewer):
     def get_points_layer_mode(self, points_layer: Points) -> str:
         return points_layer.mode
 
-    def get_selected_points(self, point_layer: Points) -> list[tuple]:
+    def get_selected_points(self, point_layer: Points) -> np.ndarray:
         """
-        Returns a list of points in the point layer.
+        Returns the points in the point layer.
 
         Parameters
         ----------
@@ -133,22 +220,24 @@ class Viewer(IViewer):
 
         Returns
         -------
-        List[Tuple[float]]
-            A list of tuples representing points in the point layer
+        np.ndarray
+            An (n, ndim) float32 array of the point coordinates. It is a copy, since napari moves points by writing
+            into the layer data
         """
-        # return ex. [(0, 0, 0, 0, 0, 0), (1, 1, 1, 1, 1, 1)]
-        selected_points: List[tuple] = list(map(tuple, point_layer.data))
-        return selected_points
+        # return ex. array([[0, 0, 0, 0, 0, 0], [1, 1, 1, 1, 1, 1]], dtype=float32)
+        return np.array(point_layer.data, dtype=np.float32)
 
-    def get_all_point_annotations(self) -> dict[str, list[tuple]]:
+    def get_all_point_annotations(self) -> dict[str, np.ndarray]:
         """
-        Returns a dictionary of point layer names mapping to a list of selected coordinates.
+        Returns a dictionary of point layer names mapping to an array of selected coordinates.
         """
-        all_point_annotations: dict[str, list[tuple]] = {}
+        all_point_annotations: dict[str, np.ndarray] = {}
 
         all_points_layers: list[Points] = self.get_all_points_layers()
         for points_layer in all_points_layers:
-            all_point_annotations[points_layer.name] = self.get_selected_points(points_layer)
+            # layers waiting to be reused hold no annotation for the current image
+            if points_layer.name not in self._recycled_points_layers:
+                all_point_annotations[points_layer.name] = self.get_selected_points(points_layer)
 
         return all_point_annotations
 
@@ -108,7 +108,7 @@ class FileInput(QWidget):
         file_path_str, _ = QFileDialog.getSaveFileName(
             self,
             "Select or create a csv file",
-            filter="CSV Files (*.csv)",
+            filter="CSV Files (*.csv) ;; Parquet Files (*.parquet) ;; SQLite Databases (*.db)",
             options=QFileDialog.Option.DontUseNativeDialog | QFileDialog.Option.DontUseCustomDirectoryIcons,
         )
         self.file_selected.emit(Path(file_path_str))
@@ -118,8 +118,8 @@ class FileInput(QWidget):
         file_path_str: str
         file_path_str, _ = QFileDialog.getOpenFileName(
             self,
-            "Select a .csv or .json file with annotations",
-            filter="CSV Files (*.csv) ;; JSON (*.json)",
+            "Select a .csv, .parquet, .db or .json file with annotations",
+            filter="CSV Files (*.csv) ;; Parquet Files (*.parquet) ;; SQLite Databases (*.db) ;; JSON (*.json)",
             options=QFileDialog.Option.DontUseNativeDialog | QFileDialog.Option.DontUseCustomDirectoryIcons,
         )
         self.file_selected.emit(Path(file_path_str))
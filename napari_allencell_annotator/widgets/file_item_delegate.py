@@ -0,0 +1,122 @@
+from qtpy.QtCore import QAbstractItemModel, QEvent, QModelIndex, QRect, QSize, Qt
+from qtpy.QtGui import QFontMetrics, QMouseEvent, QPainter
+from qtpy.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton, QStyleOptionViewItem
+
+
+class FileItemDelegate(QStyledItemDelegate):
+    """
+    A class used to paint the rows of the FilesWidget: the file name (or hidden "Image N" label) on the left and a
+    check box on the right.
+
+    Rows are painted from the FilesListModel data when they are visible instead of each row owning its own widgets.
+
+    Methods
+    -------
+    paint(painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex)
+        Paints a row.
+    sizeHint(option: QStyleOptionViewItem, index: QModelIndex) -> QSize
+        Returns the size of a row.
+    editorEvent(event: QEvent, model: QAbstractItemModel, option: QStyleOptionViewItem, index: QModelIndex) -> bool
+        Toggles the check state of a row when its check box is clicked.
+    """
+
+    # margins around the row contents, matching the layout margins of the former per-row widgets
+    MARGIN_LEFT: int = 2
+    MARGIN_TOP: int = 2
+    MARGIN_RIGHT: int = 4
+    MARGIN_BOTTOM: int = 5
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        opt: QStyleOptionViewItem = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        style: QStyle = opt.widget.style() if opt.widget is not None else QApplication.style()
+
+        # draw the selection and hover background without the default text and check indicator
+        opt.text = ""
+        opt.features &= ~QStyleOptionViewItem.HasCheckIndicator
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+
+        check_rect: QRect = self._check_rect(option)
+        text_rect: QRect = option.rect.adjusted(
+            FileItemDelegate.MARGIN_LEFT, FileItemDelegate.MARGIN_TOP, 0, -FileItemDelegate.MARGIN_BOTTOM
+        )
+        text_rect.setRight(check_rect.left() - FileItemDelegate.MARGIN_RIGHT)
+
+        painter.save()
+        painter.setFont(opt.font)
+        if opt.state & QStyle.State_Selected:
+            painter.setPen(opt.palette.highlightedText().color())
+        else:
+            painter.setPen(opt.palette.text().color())
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, index.data(Qt.DisplayRole) or "")
+        painter.restore()
+
+        check_state = index.data(Qt.CheckStateRole)
+        if check_state is not None:
+            check_opt: QStyleOptionButton = QStyleOptionButton()
+            check_opt.rect = check_rect
+            check_opt.state = QStyle.State_Enabled
+            check_opt.state |= QStyle.State_On if check_state == Qt.Checked else QStyle.State_Off
+            style.drawPrimitive(QStyle.PE_IndicatorCheckBox, check_opt, painter, opt.widget)
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        font_metrics: QFontMetrics = QFontMetrics(index.data(Qt.FontRole) or option.font)
+        indicator_height: int = self._indicator_size(option).height()
+        height: int = max(font_metrics.height(), indicator_height)
+        width: int = font_metrics.horizontalAdvance(index.data(Qt.DisplayRole) or "")
+        return QSize(
+            FileItemDelegate.MARGIN_LEFT + width + 2 * FileItemDelegate.MARGIN_RIGHT + indicator_height,
+            FileItemDelegate.MARGIN_TOP + height + FileItemDelegate.MARGIN_BOTTOM,
+        )
+
+    def editorEvent(
+        self, event: QEvent, model: QAbstractItemModel, option: QStyleOptionViewItem, index: QModelIndex
+    ) -> bool:
+        if not (model.flags(index) & Qt.ItemIsUserCheckable):
+            return False
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease, QEvent.MouseButtonDblClick):
+            return False
+
+        mouse_event: QMouseEvent = event
+        if mouse_event.button() != Qt.LeftButton or not self._check_rect(option).contains(mouse_event.pos()):
+            return False
+
+        # clicks on the check box only toggle it, they do not change the current row
+        if event.type() == QEvent.MouseButtonRelease:
+            checked: bool = index.data(Qt.CheckStateRole) == Qt.Checked
+            model.setData(index, Qt.Unchecked if checked else Qt.Checked, Qt.CheckStateRole)
+        return True
+
+    def _check_rect(self, option: QStyleOptionViewItem) -> QRect:
+        """
+        Return the rectangle of the check box of a row, aligned to the right of the row.
+
+        Parameters
+        ----------
+        option: QStyleOptionViewItem
+            the style option of the row.
+        """
+        size: QSize = self._indicator_size(option)
+        rect: QRect = option.rect
+        return QRect(
+            rect.right() - FileItemDelegate.MARGIN_RIGHT - size.width(),
+            rect.top() + (rect.height() - size.height()) // 2,
+            size.width(),
+            size.height(),
+        )
+
+    @staticmethod
+    def _indicator_size(option: QStyleOptionViewItem) -> QSize:
+        """
+        Return the size of a check box indicator in the current style.
+
+        Parameters
+        ----------
+        option: QStyleOptionViewItem
+            the style option of the row.
+        """
+        style: QStyle = option.widget.style() if option.widget is not None else QApplication.style()
+        return QSize(
+            style.pixelMetric(QStyle.PM_IndicatorWidth, option, option.widget),
+            style.pixelMetric(QStyle.PM_IndicatorHeight, option, option.widget),
+        )
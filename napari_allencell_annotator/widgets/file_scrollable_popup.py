@@ -1,13 +1,13 @@
+from pathlib import Path
 from typing import Set
 from PyQt5.QtWidgets import QDialog
 
-from napari_allencell_annotator.widgets.file_item import FileItem
 from napari_allencell_annotator.widgets.scrollable_popup import ScrollablePopup
 
 
 class FileScrollablePopup:
     @classmethod
-    def make_popup(cls, msg: str, checked_files: Set[FileItem]) -> bool:
+    def make_popup(cls, msg: str, checked_files: Set[Path]) -> bool:
         """
         Pop up dialog showing currently checked image files to ask the user yes or no.
 
@@ -15,7 +15,7 @@ class FileScrollablePopup:
         ----------
         msg: str
             Question for the message box.
-        checked_files: Set[FileItem]
+        checked_files: Set[Path]
             The list of currently checked files.
 
         Returns
@@ -24,8 +24,8 @@ class FileScrollablePopup:
             user input, true if 'OK' false if 'Cancel'
         """
         names: Set[str] = set()
-        for item in checked_files:
-            names.add(item.file_path.name)
+        for file in checked_files:
+            names.add(file.name)
         msg_box: ScrollablePopup = ScrollablePopup(msg, names)
         return_value: int = msg_box.exec()
         if return_value == QDialog.Accepted:
@@ -0,0 +1,252 @@
+from pathlib import Path
+from typing import Any, Optional, Set
+
+from qtpy.QtCore import QAbstractListModel, QModelIndex, Qt, Signal
+from qtpy.QtGui import QFont
+
+from napari_allencell_annotator.util.file_utils import FileUtils
+
+
+class FilesListModel(QAbstractListModel):
+    """
+    A list model holding the image files shown in the FilesWidget.
+
+    Rows are plain paths. Names, hidden "Image N" labels, the highlight and check states are computed when a view asks
+    for them, so only the rows that are visible cost anything beyond their path.
+
+    Attributes
+    ----------
+    checked : Set[Path]
+        the files that are currently checked
+    check_state_changed : Signal(Path, bool)
+        emitted when a file is checked or unchecked
+
+    Methods
+    -------
+    set_files(files: list[Path], hidden: bool)
+        Replaces the files in the list.
+    add_files(files: list[Path])
+        Adds files to the end of the list.
+    remove_files(files: list[Path])
+        Removes files from the list.
+    clear()
+        Removes every file from the list.
+    get_file_at(row: int) -> Path
+        Returns the file at row.
+    set_hidden(hidden: bool)
+        Sets whether file names are replaced by "Image N" labels.
+    set_checkable(checkable: bool)
+        Sets whether the rows show a check box.
+    set_highlighted_row(row: int)
+        Sets the row displayed in bold and underlined.
+    """
+
+    check_state_changed: Signal = Signal(object, bool)
+
+    def __init__(self):
+        super().__init__()
+        self._files: list[Path] = []
+        self.checked: Set[Path] = set()
+        self._hidden: bool = False
+        self._checkable: bool = True
+        self._highlighted_row: int = -1
+
+        self._font: QFont = QFont("Arial", 18)
+        self._highlighted_font: QFont = QFont(self._font)
+        self._highlighted_font.setBold(True)
+        self._highlighted_font.setUnderline(True)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._files)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._files):
+            return None
+
+        row: int = index.row()
+        if role == Qt.DisplayRole:
+            if self._hidden:
+                return "Image " + str(row + 1)
+            return FilesListModel._make_display_name(self._files[row])
+        elif role == Qt.ToolTipRole:
+            return None if self._hidden else str(self._files[row])
+        elif role == Qt.FontRole:
+            return self._highlighted_font if row == self._highlighted_row else self._font
+        elif role == Qt.CheckStateRole:
+            if not self._is_checkable():
+                return None
+            return Qt.Checked if self._files[row] in self.checked else Qt.Unchecked
+        return None
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.EditRole) -> bool:
+        if role != Qt.CheckStateRole or not index.isValid() or not self._is_checkable():
+            return False
+
+        file: Path = self._files[index.row()]
+        checked: bool = Qt.CheckState(value) == Qt.Checked
+        if checked == (file in self.checked):
+            return False
+        if checked:
+            self.checked.add(file)
+        else:
+            self.checked.discard(file)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.check_state_changed.emit(file, checked)
+        return True
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags: Qt.ItemFlags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if self._is_checkable():
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def set_files(self, files: list[Path], hidden: bool = False) -> None:
+        """
+        Replace the files in the list.
+
+        Parameters
+        ----------
+        files: list[Path]
+            the file paths.
+        hidden: bool
+            whether file names are replaced by "Image N" labels.
+        """
+        self.beginResetModel()
+        self._files = list(files)
+        self._hidden = hidden
+        self.checked = set()
+        self._highlighted_row = -1
+        self.endResetModel()
+
+    def add_files(self, files: list[Path]) -> None:
+        """
+        Add files to the end of the list.
+
+        Parameters
+        ----------
+        files: list[Path]
+            the file paths.
+        """
+        if len(files) == 0:
+            return
+        self.beginInsertRows(QModelIndex(), len(self._files), len(self._files) + len(files) - 1)
+        self._files.extend(files)
+        self.endInsertRows()
+
+    def remove_files(self, files: list[Path]) -> None:
+        """
+        Remove files from the list. Files that are not in the list are ignored.
+
+        Parameters
+        ----------
+        files: list[Path]
+            the file paths.
+        """
+        to_remove: Set[Path] = set(files)
+        rows: list[int] = [row for row, file in enumerate(self._files) if file in to_remove]
+        self.checked -= to_remove
+
+        # remove runs of consecutive rows from the end so the rows still to remove do not shift
+        end: int = len(rows) - 1
+        while end >= 0:
+            start: int = end
+            while start > 0 and rows[start - 1] == rows[start] - 1:
+                start -= 1
+            self.beginRemoveRows(QModelIndex(), rows[start], rows[end])
+            del self._files[rows[start] : rows[end] + 1]
+            self.endRemoveRows()
+            end = start - 1
+
+        if self._highlighted_row >= len(self._files):
+            self._highlighted_row = -1
+
+    def clear(self) -> None:
+        """Remove every file from the list."""
+        self.set_files([])
+
+    def get_file_at(self, row: int) -> Optional[Path]:
+        """
+        Return the file at row, None if there is no such row.
+
+        Parameters
+        ----------
+        row: int
+            the row.
+        """
+        if 0 <= row < len(self._files):
+            return self._files[row]
+        return None
+
+    def is_hidden(self) -> bool:
+        return self._hidden
+
+    def set_hidden(self, hidden: bool) -> None:
+        """
+        Set whether file names are replaced by "Image N" labels. Check boxes are not shown while names are hidden.
+
+        Parameters
+        ----------
+        hidden: bool
+            whether file names are hidden.
+        """
+        self._hidden = hidden
+        self._all_rows_changed()
+
+    def is_checkable(self) -> bool:
+        return self._is_checkable()
+
+    def set_checkable(self, checkable: bool) -> None:
+        """
+        Set whether the rows show a check box.
+
+        Parameters
+        ----------
+        checkable: bool
+            whether the rows can be checked.
+        """
+        self._checkable = checkable
+        self._all_rows_changed()
+
+    def set_highlighted_row(self, row: int) -> None:
+        """
+        Set the row displayed in bold and underlined, -1 for none.
+
+        Parameters
+        ----------
+        row: int
+            the row to highlight.
+        """
+        previous: int = self._highlighted_row
+        self._highlighted_row = row
+        for changed in (previous, row):
+            if 0 <= changed < len(self._files):
+                self.dataChanged.emit(self.index(changed), self.index(changed), [Qt.FontRole])
+
+    def get_highlighted_row(self) -> int:
+        return self._highlighted_row
+
+    def _is_checkable(self) -> bool:
+        return self._checkable and not self._hidden
+
+    def _all_rows_changed(self) -> None:
+        if len(self._files) > 0:
+            self.dataChanged.emit(self.index(0), self.index(len(self._files) - 1))
+
+    @staticmethod
+    def _make_display_name(file_path: Path) -> str:
+        """
+        Truncate long file names
+
+        Returns
+        -------
+        str
+            truncated file name
+        """
+        path: str = FileUtils.get_file_name(file_path)
+        if len(path) > 35:
+            path = path[0:15] + "..." + path[-17:]
+        return path
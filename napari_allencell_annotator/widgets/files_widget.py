@@ -1,92 +1,132 @@
-from typing import Set
+from typing import Optional, Set
 
-from PyQt5.QtCore import QSignalBlocker
-from qtpy.QtWidgets import QListWidget
-from qtpy.QtCore import Signal
+from qtpy.QtWidgets import QListView
+from qtpy.QtCore import QModelIndex, Signal
 from pathlib import Path
 
 from napari_allencell_annotator.model.annotation_model import AnnotatorModel
-from napari_allencell_annotator.widgets.file_item import FileItem
+from napari_allencell_annotator.widgets.file_item_delegate import FileItemDelegate
+from napari_allencell_annotator.widgets.files_list_model import FilesListModel
 
 
-class FilesWidget(QListWidget):
+class FilesWidget(QListView):
     """
-    A class used to create a QListWidget for files.
+    A class used to create a QListView for files.
+
+    The files are held by a FilesListModel and painted by a FileItemDelegate, so only the visible rows are drawn.
 
     Attributes
     ----------
-    shuffled : bool
-        a boolean, True if list is currently shuffled
-    checked : Set[FileItem]
-        a set of items that are currently checked
+    checked : Set[Path]
+        a set of files that are currently checked
 
     Methods
     -------
-    set_shuffled(shuffled : bool)
-        Sets the list shuffled property.
+    count() -> int
+        Returns the number of files in the list.
+    get_file_at(row: int) -> Optional[Path]
+        Returns the file at row.
     unhide_all()
         Displays the file names on all files in the list.
-    clear_all()
-        Clears all image data in the file widget.
-    clear_for_shuff()
-        Clears the list display.
+    hide_checks()
+        Hides the check boxes on all files in the list.
     get_curr_row() -> int
         Returns current image row.
     add_item(file: Path, hidden: bool)
         Adds a file to the file widget.
-    remove_item(item: ListItem)
-        Removes the item from the file widget.
+    add_items(files: list[Path], hidden: bool)
+        Adds files to the file widget.
+    remove_item(file: Path)
+        Removes the file from the file widget.
+    remove_items(files: list[Path])
+        Removes the files from the file widget.
     """
 
     files_selected: Signal = Signal(bool)
     files_added: Signal = Signal(bool)
 
     def __init__(self, annotator_model: AnnotatorModel):
-        QListWidget.__init__(self)
-        self.checked: Set[FileItem] = set()
-        # files_dict holds all image info file path -> [file name, FMS]
-        # also holds the original insertion order in .keys()
-        self.setCurrentItem(None)
+        QListView.__init__(self)
         self._annotator_model = annotator_model
 
+        self._files_model: FilesListModel = FilesListModel()
+        self.setModel(self._files_model)
+        self.setItemDelegate(FileItemDelegate(self))
+        # every row has the same height, so the view does not need to measure each row to lay the list out
+        self.setUniformItemSizes(True)
+        # True while the current row is being updated to match the model, so the change is not sent back to it
+        self._updating_current: bool = False
+
         self._annotator_model.image_changed.connect(self._handle_image_changed)
         self._annotator_model.images_shuffled.connect(self._handle_shuffle)
         self._annotator_model.image_set_added.connect(
             lambda: self._handle_shuffle(self._annotator_model.is_images_shuffled())
         )
         self._annotator_model.image_count_changed.connect(self._handle_image_count_change)
-        self.currentItemChanged.connect(self._handle_file_item_changed)
+        self._annotator_model.images_added.connect(self._handle_images_added)
+        self._annotator_model.images_removed.connect(self._handle_images_removed)
+        self.selectionModel().currentChanged.connect(self._handle_file_item_changed)
+        self._files_model.check_state_changed.connect(self._check_evt)
 
-    def _handle_image_changed(self):
-        with QSignalBlocker(self):
-            self.setCurrentItem(self.item(self._annotator_model.get_curr_img_index()))
+    @property
+    def checked(self) -> Set[Path]:
+        return self._files_model.checked
+
+    @checked.setter
+    def checked(self, checked: Set[Path]) -> None:
+        self._files_model.checked = checked
+
+    def count(self) -> int:
+        """Return the number of files in the list."""
+        return self._files_model.rowCount()
 
-            previous = self.item(self._annotator_model.get_previous_image_index())
-            if previous is not None:
-                previous.unhighlight()
+    def get_file_at(self, row: int) -> Optional[Path]:
+        """
+        Return the file at row, None if there is no such row.
+
+        Params
+        -------
+        row: int
+            the row.
+        """
+        return self._files_model.get_file_at(row)
 
-            current = self.item(self._annotator_model.get_curr_img_index())
-            if current is not None:
-                current.highlight()
+    def get_files_model(self) -> FilesListModel:
+        return self._files_model
 
-    def _handle_file_item_changed(self, curr_item: FileItem, prev_item: FileItem) -> None:
+    def _handle_image_changed(self):
+        curr_row: int = self._annotator_model.get_curr_img_index()
+        self._updating_current = True
+        try:
+            self.setCurrentIndex(self._files_model.index(curr_row))
+        finally:
+            self._updating_current = False
+        self._files_model.set_highlighted_row(curr_row)
+
+    def _handle_file_item_changed(self, curr_index: QModelIndex, prev_index: QModelIndex) -> None:
         """
         Update the model when the current item in the file widget is changed if it has not been updated.
 
         Parameters
         ----------
-        curr_item:
-            the current file item
-        prev_item:
-            the previous file item
+        curr_index:
+            the index of the current file, invalid if there is none
+        prev_index:
+            the index of the previous file, invalid if there was none
         """
-        self._annotator_model.set_previous_image_index(self.row(prev_item))
-        self._annotator_model.set_curr_img_index(self.row(curr_item))
+        if self._updating_current:
+            return
+        self._annotator_model.set_previous_image_index(prev_index.row())
+        self._annotator_model.set_curr_img_index(curr_index.row())
 
     def unhide_all(self) -> None:
         """Display the file names on all files in the list."""
-        for i in range(self.count()):
-            self.item(i).unhide()
+        self._files_model.set_checkable(True)
+        self._files_model.set_hidden(False)
+
+    def hide_checks(self) -> None:
+        """Hide the delete check boxes on all files in the list."""
+        self._files_model.set_checkable(False)
 
     def get_curr_row(self) -> int:
         """
@@ -97,34 +137,38 @@ class FilesWidget(QListWidget):
         int
             the current row.
         """
-        if self.currentItem() is not None:
-            return self.row(self.currentItem())
-        else:
-            return -1
+        return self.currentIndex().row()
 
     def _handle_shuffle(self, shuffled: bool) -> None:
         self._reset_list()
         if shuffled:
-            # readd shuffled images to list
-            for shuffled_img in self._annotator_model.get_shuffled_images():
-                self.add_item(shuffled_img, hidden=True)  # add hidden when items shuffled.
+            # readd shuffled images to list, hidden when items shuffled.
+            self._files_model.set_files(self._annotator_model.get_shuffled_images(), hidden=True)
         else:
             # readd unshuffled images to list
-            for img in self._annotator_model.get_all_images():
-                self.add_item(img)
+            self._files_model.set_files(self._annotator_model.get_all_images())
 
     def _reset_list(self) -> None:
         """
         Reset the list of files
         """
-        self.setCurrentItem(None)
-        self.checked = set()
-        self.clear()  # clear list
+        self.setCurrentIndex(QModelIndex())
+        self._files_model.clear()
 
     def _handle_image_count_change(self, count: int) -> None:
         if count == 0:
             self._reset_list()
 
+    def _handle_images_added(self, files: list[Path]) -> None:
+        if self._annotator_model.get_image_index(files[0]) == self.count():
+            self.add_items(files, hidden=self._annotator_model.is_images_shuffled())
+        else:
+            # images were inserted before the end of the list, rebuild it in the model's order
+            self._handle_shuffle(self._annotator_model.is_images_shuffled())
+
+    def _handle_images_removed(self, files: list[Path]) -> None:
+        self.remove_items(files)
+
     def add_item(self, file: Path, hidden: bool = False) -> None:
         """
         Add a file to the file widget.
@@ -138,39 +182,65 @@ class FilesWidget(QListWidget):
         hidden: bool
             file name visibility.
         """
-        item: FileItem = FileItem(file, self, hidden)
-        item.check.stateChanged.connect(lambda: self._check_evt(item))
+        self.add_items([file], hidden)
 
-    def remove_item(self, item: FileItem) -> None:
+    def add_items(self, files: list[Path], hidden: bool = False) -> None:
         """
-        Remove the item from the file widget.
+        Add files to the end of the file widget.
 
         Params
         -------
-        item: FileItem
-            an item to remove.
+        files: list[Path]
+            the file paths.
+        hidden: bool
+            file name visibility.
         """
-        if item == self.currentItem():
-            self.setCurrentItem(None)
-        self.takeItem(self.row(item))
+        if self.count() == 0:
+            self._files_model.set_files(files, hidden)
+        else:
+            self._files_model.add_files(files)
 
-    def _check_evt(self, item: FileItem) -> None:
+    def remove_item(self, file: Path) -> None:
         """
-        Update checked set and emit files_selected signal.
+        Remove the file from the file widget.
 
         Params
         -------
-        item: FileItem
-            the item that has been checked or unchecked.
-        """
-        if item.check.isChecked() and item not in self.checked:
-            self.checked.add(item)
-            if len(self.checked) == 1:
-                self.files_selected.emit(True)
-        elif not item.check.isChecked() and item in self.checked:
-            self.checked.remove(item)
-            if len(self.checked) == 0:
-                self.files_selected.emit(False)
-
-    def unhide_item_at(self, idx: int) -> None:
-        self.unhide_item_at(idx)
+        file: Path
+            a file to remove.
+        """
+        self.remove_items([file])
+
+    def remove_items(self, files: list[Path]) -> None:
+        """
+        Remove the files from the file widget.
+
+        Params
+        -------
+        files: list[Path]
+            the files to remove.
+        """
+        to_remove: Set[Path] = set(files)
+        if self.get_file_at(self.get_curr_row()) in to_remove:
+            self.setCurrentIndex(QModelIndex())
+
+        had_checked: bool = len(self.checked) > 0
+        self._files_model.remove_files(files)
+        if had_checked and len(self.checked) == 0:
+            self.files_selected.emit(False)
+
+    def _check_evt(self, file: Path, checked: bool) -> None:
+        """
+        Emit files_selected signal when the first file is checked or the last file is unchecked.
+
+        Params
+        -------
+        file: Path
+            the file that has been checked or unchecked.
+        checked: bool
+            whether the file is now checked.
+        """
+        if checked and len(self.checked) == 1:
+            self.files_selected.emit(True)
+        elif not checked and len(self.checked) == 0:
+            self.files_selected.emit(False)
@@ -92,7 +92,7 @@ class TemplateItem(QListWidgetItem):
         elif self._type == ItemType.BOOL:
             if isinstance(val, str):
                 # val is a str from previous annotation
-                self.editable_widget.setChecked(eval(val))
+                self.editable_widget.setChecked(val == "True")
             else:
                 # val is bool from default vals
                 self.editable_widget.setChecked(val)
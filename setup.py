@@ -42,6 +42,7 @@ test_requirements = [
     "pytest-qt>=3.3.0",
     "quilt3>=3.1.12",
     "pyqt5",
+    "pyarrow>=10.0.0",
 ]
 
 dev_requirements = [
@@ -69,12 +70,19 @@ setup_requirements = [
     "pytest-runner",
 ]
 
+# saving annotations to, and importing them from, parquet files
+parquet_requirements = [
+    "pyarrow>=10.0.0",
+]
+
 extra_requirements = {
     "test": test_requirements,
     "dev": dev_requirements,
     "setup": setup_requirements,
+    "parquet": parquet_requirements,
     "all": [
         *requirements,
+        *parquet_requirements,
         *test_requirements,
         *setup_requirements,
         *dev_requirements,
@@ -99,6 +107,10 @@ setup(
     test_suite="napari_allencell_annotator/_tests",
     tests_require=test_requirements,
     extras_require=extra_requirements,
+    entry_points={
+        "napari.plugin": ["napari-allencell-annotator = napari_allencell_annotator._dock_widget"],
+        "console_scripts": ["allencell-annotator = napari_allencell_annotator.cli:main"],
+    },
     include_package_data=True,
     classifiers=[
         "Intended Audience :: Science/Research",